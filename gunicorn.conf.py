@@ -0,0 +1,46 @@
+"""
+Gunicorn settings for serving resume_analyzer.
+
+Run with ``gunicorn -c gunicorn.conf.py resume_analyzer.asgi``.
+
+Workers are uvicorn's ASGI workers, so the async views run on an event loop
+and the bounded CPU pool in resume_app.executor can turn away excess requests
+with a 429. Sync WSGI workers would handle one request per worker and never
+fill that pool.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '127.0.0.1:8000')
+# One event loop per core is enough: each worker serves many requests at once
+# and runs parsing on its own thread pool
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+worker_class = 'uvicorn.workers.UvicornWorker'
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+
+# Import the application in the master before forking. Together with
+# RESUME_PRELOAD_MODELS, which is off by default and turned on here, this loads
+# the NLP models once and lets every worker share them copy-on-write instead
+# of loading its own copy.
+preload_app = True
+raw_env = ['RESUME_PRELOAD_MODELS=' + os.environ.get('RESUME_PRELOAD_MODELS', '1')]
+
+
+def _log_memory(log, label, pid='self'):
+    from resume_app.utils import process_memory
+
+    usage = process_memory(pid)
+    if usage is None:
+        return
+    log.info('%s memory: rss %d kB, pss %d kB, shared %d kB, private %d kB',
+             label, usage.get('rss', 0), usage.get('pss', 0), usage['shared'],
+             usage.get('private_clean', 0) + usage.get('private_dirty', 0))
+
+
+def when_ready(server):
+    _log_memory(server.log, f'Master {os.getpid()}')
+
+
+def post_worker_init(worker):
+    _log_memory(worker.log, f'Worker {worker.pid}')
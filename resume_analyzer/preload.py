@@ -0,0 +1,30 @@
+"""
+Warm-up shared by the WSGI and ASGI entry points.
+
+Under gunicorn's preload_app (see gunicorn.conf.py) the entry point is
+imported once in the master process, so whatever is loaded here is shared
+copy-on-write by every forked worker.
+"""
+
+import gc
+
+from django.conf import settings
+
+
+def preload_models():
+    """Load everything the request handlers read but never modify, if RESUME_PRELOAD_MODELS is set"""
+    if not getattr(settings, 'RESUME_PRELOAD_MODELS', False):
+        return
+
+    from resume_app import matcher_store, nlp
+    from resume_app.taxonomy import get_taxonomy
+
+    nlp.warm_up()
+    get_taxonomy()
+    matcher_store.load_vectorizer()
+
+    # Hide the objects created so far from the garbage collector. Collections in
+    # forked workers would otherwise write to every shared object's header and
+    # turn the copy-on-write pages into private copies.
+    gc.collect()
+    gc.freeze()
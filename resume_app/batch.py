@@ -0,0 +1,31 @@
+"""
+Process-pool helpers for bulk resume parsing.
+
+This module deliberately avoids importing Django models so that worker
+processes started with the ``spawn`` method can unpickle ``parse_file``
+without configuring Django first.
+"""
+
+from . import nlp
+from .resume_analyzer import ResumeParser
+from .utils import hash_file
+
+_worker_parser = None
+
+
+def init_worker(max_pages=None, extraction_timeout=None):
+    """Pool initializer: build one parser (and its models) per worker process"""
+    global _worker_parser
+    _worker_parser = ResumeParser(max_pages=max_pages, extraction_timeout=extraction_timeout)
+    nlp.warm_up()
+
+
+def parse_file(path):
+    """Parse a single resume, returning (path, content_hash, results, error)"""
+    global _worker_parser
+    if _worker_parser is None:
+        init_worker()
+    try:
+        return path, hash_file(path), _worker_parser.parse_resume(path), None
+    except Exception as e:
+        return path, None, None, str(e)
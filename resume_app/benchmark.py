@@ -0,0 +1,432 @@
+"""
+Benchmark of the resume parsing pipeline over a synthetic corpus.
+
+``generate_corpus`` writes deterministic resumes (PDF, DOCX and TXT at several
+sizes) and job descriptions from a seeded random generator, so every run and
+every commit sees byte-identical input. ``run_benchmark`` times each stage of
+the pipeline on every document and collects its output. ``golden_outputs``
+reduces that output to the fields that must not change when a stage is
+optimized; the NER-derived fields (institutions, organizations, dates) are
+left out because they depend on the installed spaCy model rather than on
+this code. The committed goldens live in ``data/bench_golden.json`` and are
+checked by the test suite and by ``manage.py bench --check``.
+``run_adversarial`` times sentence classification on inputs built to trigger
+worst-case behaviour, at growing lengths, to check that it stays linear, and
+``run_docx_comparison`` compares the streaming DOCX reader with python-docx.
+"""
+
+import hashlib
+import json
+import os
+import random
+import statistics
+import time
+import tracemalloc
+import zipfile
+from xml.sax.saxutils import escape
+
+from .resume_analyzer import PARSER_VERSION, CareerAdvisor, JobMatcher, ResumeParser, get_parser_version
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), 'data', 'bench_golden.json')
+
+# Number of resume lines written for each corpus size
+SIZES = {
+    'small': 40,
+    'medium': 200,
+    'large': 1000,
+}
+FORMATS = ('pdf', 'docx', 'txt')
+STAGES = (
+    'extract_text',
+    'extract_skills',
+    'extract_education',
+    'extract_experience',
+    'match_resume_to_job',
+    'calculate_career_matches',
+)
+DEFAULT_SEED = 0
+
+# Vocabulary for the generator. It is deliberately independent of the skill
+# taxonomy: a taxonomy change must show up as a golden difference, not as a
+# different corpus.
+SKILLS = [
+    'Python', 'Java', 'JavaScript', 'C++', 'C#', 'Go', 'SQL', 'HTML', 'CSS', 'React',
+    'Django', 'Flask', 'Node.js', 'Docker', 'Kubernetes', 'AWS', 'Azure', 'Git',
+    'machine learning', 'deep learning', 'TensorFlow', 'pandas', 'NumPy', 'statistics',
+    'data analysis', 'Tableau', 'Excel', 'Agile', 'Scrum', 'leadership', 'communication',
+    'project management', 'Photoshop', 'Figma', 'UX design', 'penetration testing',
+    'network security', 'Linux', 'REST APIs', 'GraphQL', 'Rust', 'Haskell', 'COBOL',
+]
+TITLES = [
+    'Senior Engineer', 'Junior Developer', 'Lead Architect', 'Principal Consultant',
+    'Data Analyst', 'Project Manager', 'Security Specialist', 'Systems Administrator',
+    'Chief Officer', 'Product Designer',
+]
+COMPANIES = [
+    'Acme Corporation', 'Globex Inc', 'Initech', 'Umbrella Labs', 'Stark Industries',
+    'Wayne Enterprises', 'Hooli', 'Vandelay Industries', 'Cyberdyne Systems', 'Soylent Co',
+]
+SCHOOLS = [
+    'Springfield University', 'Riverdale College', 'Hill Valley Institute of Technology',
+    'Sunnydale School of Business', 'Greendale Community College',
+]
+DEGREES = [
+    'Bachelor of Science in Computer Science', 'Master of Business Administration',
+    'PhD in Statistics', 'BA in Graphic Design', 'MS in Information Security',
+    'Diploma in Software Engineering',
+]
+EDUCATION_LINES = [
+    '{degree}, {school}, graduated {year} with a GPA of {gpa}.',
+    'Completed a {degree} at {school} ({year}).',
+    'Certificate in {skill} from {school}.',
+    'Major in {skill}, minor in {skill2}, {school}.',
+]
+EXPERIENCE_LINES = [
+    '{title} at {company} from {year} to {year2}.',
+    'Led a team of {n} engineers delivering {skill} projects for {company}.',
+    'Developed and implemented {skill} services used by {n}000 customers.',
+    'Managed the migration of legacy systems to {skill} over {n} months.',
+    'Responsibilities included {skill}, {skill2} and mentoring junior staff.',
+    'Designed {skill} pipelines with {skill2}; coordinated releases across {n} teams.',
+    '{n} years of experience with {skill} and {skill2} in an enterprise environment.',
+]
+OTHER_LINES = [
+    'Skills: {skill}, {skill2}, {skill3}.',
+    'Volunteer mentor at a local coding club',
+    'Interests include chess, cycling and open source.',
+    'Speaker at {company} conference on {skill} (e.g. talks, workshops).',
+    'Contact: jane.doe@example.com / +1 555 0100',
+    'Fluent in English and Spanish; conversational French',
+]
+JOB_LINES = [
+    'We are looking for a {title} to join {company}.',
+    'You will work with {skill}, {skill2} and {skill3} every day.',
+    'Experience with {skill} is required; {skill2} is a plus.',
+    'A degree in computer science or equivalent experience.',
+    'Strong {skill} and {skill2} skills.',
+]
+
+
+# Text lengths for the adversarial inputs
+ADVERSARIAL_LENGTHS = (10000, 100000, 1000000)
+
+# Paragraph counts of the DOCX files compared against python-docx
+DOCX_COMPARISON_LINES = (200, 2000, 20000)
+
+# Pathological resume text: long runs without sentence punctuation (as PDF
+# extraction and bullet lists produce), keywords with no sentence end in
+# sight, runs of punctuation and very many tiny sentences
+ADVERSARIAL_INPUTS = {
+    'no_punctuation': lambda length: 'x' * length,
+    'keywords_no_period': lambda length: ('managed university experience ' * (length // 30 + 1))[:length],
+    'dots': lambda length: '.' * (length - 1) + 'x',
+    'bullets': lambda length: ('\u2022 led\n' * (length // 6 + 1))[:length],
+    'tiny_sentences': lambda length: ('a. ' * (length // 3 + 1))[:length],
+}
+
+
+def _fill(rng, template):
+    skills = rng.sample(SKILLS, 3)
+    return template.format(
+        skill=skills[0], skill2=skills[1], skill3=skills[2],
+        title=rng.choice(TITLES), company=rng.choice(COMPANIES),
+        school=rng.choice(SCHOOLS), degree=rng.choice(DEGREES),
+        year=rng.randint(1995, 2015), year2=rng.randint(2016, 2024),
+        gpa=f'{rng.uniform(2.5, 4.0):.2f}', n=rng.randint(2, 12),
+    )
+
+
+def generate_resume_lines(rng, line_count):
+    """Return line_count lines of resume text"""
+    lines = ['Jane Doe', f'{rng.choice(TITLES)} | {rng.choice(COMPANIES)}']
+    groups = (EDUCATION_LINES, EXPERIENCE_LINES, EXPERIENCE_LINES, OTHER_LINES)
+    while len(lines) < line_count:
+        lines.append(_fill(rng, rng.choice(rng.choice(groups))))
+    return lines[:line_count]
+
+
+def generate_job_description(rng, line_count=12):
+    """Return a job description as a single string"""
+    return '\n'.join(_fill(rng, rng.choice(JOB_LINES)) for _ in range(line_count))
+
+
+def _pdf_string(line):
+    # Base-14 fonts use WinAnsi; the generator only emits ASCII
+    return '(' + line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') + ')'
+
+
+def write_pdf(path, lines, lines_per_page=50):
+    """Write lines to a minimal multi-page PDF using the built-in Helvetica font"""
+    pages = [lines[start:start + lines_per_page] for start in range(0, len(lines), lines_per_page)] or [[]]
+    page_ids = [4 + 2 * number for number in range(len(pages))]
+    objects = {
+        1: '<< /Type /Catalog /Pages 2 0 R >>',
+        2: '<< /Type /Pages /Kids [{}] /Count {} >>'.format(
+            ' '.join(f'{page_id} 0 R' for page_id in page_ids), len(pages)),
+        3: '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    }
+    for page_id, page_lines in zip(page_ids, pages):
+        content = 'BT /F1 10 Tf 14 TL 50 760 Td\n' + ''.join(
+            f'{_pdf_string(line)} Tj T*\n' for line in page_lines) + 'ET'
+        objects[page_id] = (
+            '<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            f'/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>')
+        objects[page_id + 1] = f'<< /Length {len(content)} >>\nstream\n{content}\nendstream'
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = len(output)
+        output += f'{object_id} 0 obj\n{objects[object_id]}\nendobj\n'.encode('latin-1')
+    xref = len(output)
+    output += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('latin-1')
+    for object_id in sorted(objects):
+        output += f'{offsets[object_id]:010d} 00000 n \n'.encode('latin-1')
+    output += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode('latin-1')
+    with open(path, 'wb') as file:
+        file.write(output)
+
+
+DOCX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '</Types>'),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/>'
+        '</Relationships>'),
+}
+
+
+def write_docx(path, lines):
+    """Write lines as the paragraphs of a minimal DOCX file"""
+    body = ''.join(f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in lines)
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{body}</w:body></w:document>')
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in list(DOCX_PARTS.items()) + [('word/document.xml', document)]:
+            # Fixed timestamps keep the file byte-identical between runs
+            archive.writestr(zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0)), data,
+                             compress_type=zipfile.ZIP_DEFLATED)
+
+
+def write_txt(path, lines):
+    with open(path, 'w', encoding='utf-8', newline='\n') as file:
+        file.write('\n'.join(lines) + '\n')
+
+
+WRITERS = {
+    'pdf': write_pdf,
+    'docx': write_docx,
+    'txt': write_txt,
+}
+
+
+def generate_corpus(directory, sizes=tuple(SIZES), formats=FORMATS, seed=DEFAULT_SEED):
+    """Write the corpus into directory and return a list of case dicts
+
+    Each case has a ``name`` (e.g. ``medium.pdf``), the resume ``path`` and
+    the ``job_description`` it is matched against. The text of a resume only
+    depends on its size and the seed, so every format holds the same content.
+    """
+    cases = []
+    for size in sizes:
+        rng = random.Random(f'{seed}:{size}')
+        lines = generate_resume_lines(rng, SIZES[size])
+        job_description = generate_job_description(rng)
+        for file_format in formats:
+            path = os.path.join(directory, f'{size}.{file_format}')
+            WRITERS[file_format](path, lines)
+            cases.append({'name': f'{size}.{file_format}', 'path': path, 'job_description': job_description})
+    return cases
+
+
+def run_pipeline(case, parser, matcher, advisor, timings=None):
+    """Run every stage on one case, adding each stage's duration to timings"""
+    def timed(stage, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        if timings is not None:
+            timings.setdefault(stage, []).append(time.perf_counter() - started)
+        return result
+
+    text = timed('extract_text', parser.extract_text, case['path'])
+    skills = timed('extract_skills', parser.extract_skills, text)
+    education = timed('extract_education', parser.extract_education, text)
+    experience = timed('extract_experience', parser.extract_experience, text)
+    match_percentage = timed('match_resume_to_job', matcher.match_resume_to_job, text, case['job_description'])
+    career_matches = timed('calculate_career_matches', advisor.calculate_career_matches, skills)
+    return {
+        'text': text,
+        'skills': skills,
+        'education': education,
+        'experience': experience,
+        'match_percentage': match_percentage,
+        'career_matches': career_matches,
+    }
+
+
+def digest(value):
+    """Short stable fingerprint of a JSON-serializable value"""
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def golden_output(result):
+    """Reduce one pipeline result to the fields compared against the goldens"""
+    education_sentences = result['education']['education_sentences']
+    experience_sentences = result['experience']['experience_sentences']
+    return {
+        'text': {'length': len(result['text']), 'digest': digest(result['text'])},
+        'all_skills': result['skills']['all_skills'],
+        'skill_counts': result['skills']['skill_counts'],
+        'education_sentences': {'count': len(education_sentences), 'digest': digest(education_sentences)},
+        'experience_sentences': {'count': len(experience_sentences), 'digest': digest(experience_sentences)},
+        'possible_job_titles': sorted(result['experience']['possible_job_titles']),
+        'match_percentage': result['match_percentage'],
+        'career_matches': [[career, details['match_percentage']] for career, details in result['career_matches']],
+    }
+
+
+def golden_outputs(cases):
+    """Return {case name: golden output} for the given cases"""
+    parser, matcher, advisor = ResumeParser(), JobMatcher(), CareerAdvisor()
+    return {case['name']: golden_output(run_pipeline(case, parser, matcher, advisor)) for case in cases}
+
+
+def load_goldens(path=GOLDEN_PATH):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_goldens(goldens, path=GOLDEN_PATH):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'parser_version': PARSER_VERSION, 'outputs': goldens}, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+
+def compare_goldens(outputs, goldens):
+    """Return a list of "case: field" strings for every output differing from its golden"""
+    differences = []
+    for name, output in outputs.items():
+        expected = goldens.get(name)
+        if expected is None:
+            differences.append(f'{name}: no golden output')
+            continue
+        for field in sorted(set(output) | set(expected)):
+            if output.get(field) != expected.get(field):
+                differences.append(f'{name}: {field}')
+    return differences
+
+
+def run_benchmark(cases, repeat=5, warmup=1):
+    """Time every stage on every case and return (report, {case name: golden output})
+
+    The report is JSON-serializable: per case and stage the min, median and
+    mean of ``repeat`` timed runs (in milliseconds), plus per-stage totals
+    over the whole corpus using each case's median.
+    """
+    parser, matcher, advisor = ResumeParser(), JobMatcher(), CareerAdvisor()
+    outputs = {}
+    case_reports = {}
+    for case in cases:
+        for run in range(warmup):
+            run_pipeline(case, parser, matcher, advisor)
+        timings = {}
+        for run in range(repeat):
+            result = run_pipeline(case, parser, matcher, advisor, timings)
+        outputs[case['name']] = golden_output(result)
+        case_reports[case['name']] = {
+            'bytes': os.path.getsize(case['path']),
+            'stages': {
+                stage: {
+                    'min_ms': min(durations) * 1000,
+                    'median_ms': statistics.median(durations) * 1000,
+                    'mean_ms': statistics.mean(durations) * 1000,
+                }
+                for stage, durations in timings.items()
+            },
+        }
+
+    totals = {
+        stage: sum(report['stages'][stage]['median_ms'] for report in case_reports.values())
+        for stage in STAGES
+    }
+    report = {
+        'parser_version': get_parser_version(),
+        'repeat': repeat,
+        'cases': case_reports,
+        'total_median_ms': totals,
+    }
+    return report, outputs
+
+
+def run_adversarial(lengths=ADVERSARIAL_LENGTHS, repeat=3):
+    """Time ResumeParser.classify_sentences on each adversarial input and length
+
+    Returns {input name: {length: best milliseconds}}; with linear behaviour
+    the time grows in proportion to the length.
+    """
+    parser = ResumeParser()
+    report = {}
+    for name, build in ADVERSARIAL_INPUTS.items():
+        report[name] = {}
+        for length in lengths:
+            text = build(length)
+            durations = []
+            for run in range(repeat):
+                started = time.perf_counter()
+                parser.classify_sentences(text)
+                durations.append(time.perf_counter() - started)
+            report[name][length] = min(durations) * 1000
+    return report
+
+
+def extract_docx_with_python_docx(path):
+    """The previous DOCX reader: python-docx's object model, body paragraphs only"""
+    import docx
+
+    return '\n'.join(paragraph.text for paragraph in docx.Document(path).paragraphs)
+
+
+def run_docx_comparison(directory, line_counts=DOCX_COMPARISON_LINES, repeat=3, seed=DEFAULT_SEED):
+    """Compare ResumeParser's streaming DOCX reader with python-docx
+
+    Returns {paragraph count: {reader: {'ms': best time, 'peak_kb': peak
+    allocation}}}, timing without tracemalloc and measuring memory in a
+    separate run.
+    """
+    parser = ResumeParser()
+    readers = {
+        'streaming': parser.extract_text_from_docx,
+        'python-docx': extract_docx_with_python_docx,
+    }
+    report = {}
+    for line_count in line_counts:
+        path = os.path.join(directory, f'comparison-{line_count}.docx')
+        write_docx(path, generate_resume_lines(random.Random(f'{seed}:docx:{line_count}'), line_count))
+        report[line_count] = {}
+        for name, read in readers.items():
+            durations = []
+            for run in range(repeat):
+                started = time.perf_counter()
+                read(path)
+                durations.append(time.perf_counter() - started)
+            tracemalloc.start()
+            try:
+                read(path)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            report[line_count][name] = {'ms': min(durations) * 1000, 'peak_kb': peak / 1024}
+    return report
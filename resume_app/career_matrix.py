@@ -0,0 +1,70 @@
+"""
+Career path requirements compiled into a skill-by-career matrix.
+
+Each column of the matrix is a career path and each row a skill, with a 1
+where the career requires the skill. A resume's skills become a 0/1 vector
+over the same rows, so the number of required skills it has for every career
+is a single matrix-vector product, and a batch of resumes is one
+matrix-matrix product. The matrix is built once per taxonomy version and
+rebuilt when the taxonomy file changes.
+"""
+
+import threading
+
+import numpy as np
+
+from .taxonomy import get_taxonomy
+
+_lock = threading.Lock()
+_matrix = None
+
+
+class CareerMatrix:
+    """Binary skill-by-career matrix for one taxonomy's career paths"""
+
+    def __init__(self, career_paths, content_hash=''):
+        self.content_hash = content_hash
+        self.careers = list(career_paths)
+        self.required_skills = [list(skills) for skills in career_paths.values()]
+
+        self.skill_index = {}
+        for skills in self.required_skills:
+            for skill in skills:
+                self.skill_index.setdefault(skill, len(self.skill_index))
+
+        self.matrix = np.zeros((len(self.skill_index), len(self.careers)), dtype=np.float32)
+        for column, skills in enumerate(self.required_skills):
+            # add.at so a skill listed twice counts twice, as in the required list
+            np.add.at(self.matrix[:, column], [self.skill_index[skill] for skill in skills], 1)
+        self.required_counts = np.array([len(skills) for skills in self.required_skills], dtype=np.float64)
+
+    def skill_vectors(self, skill_lists):
+        """Return a (len(skill_lists), skills) 0/1 matrix; unknown skills are ignored"""
+        vectors = np.zeros((len(skill_lists), len(self.skill_index)), dtype=np.float32)
+        for row, skills in enumerate(skill_lists):
+            columns = {self.skill_index.get(skill.lower()) for skill in skills}
+            columns.discard(None)
+            vectors[row, list(columns)] = 1
+        return vectors
+
+    def match_percentages(self, skill_lists):
+        """Return a (len(skill_lists), careers) array of unrounded match percentages"""
+        if not self.careers:
+            return np.zeros((len(skill_lists), 0))
+        counts = self.skill_vectors(skill_lists) @ self.matrix
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return counts.astype(np.float64) / self.required_counts * 100
+
+
+def get_career_matrix():
+    """Return the matrix for the current taxonomy, compiling it if the taxonomy changed"""
+    global _matrix
+    taxonomy = get_taxonomy()
+    matrix = _matrix
+    if matrix is not None and matrix.content_hash == taxonomy.content_hash:
+        return matrix
+
+    with _lock:
+        if _matrix is None or _matrix.content_hash != taxonomy.content_hash:
+            _matrix = CareerMatrix(taxonomy.career_paths, taxonomy.content_hash)
+        return _matrix
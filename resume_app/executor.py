@@ -0,0 +1,85 @@
+"""
+Bounded thread pool for CPU-bound work started from async views.
+
+Async views keep thousands of slow clients waiting cheaply on the event loop,
+but parsing and matching still need a thread each. ``run`` hands such work to
+a pool of ``RESUME_CPU_WORKERS`` threads and admits at most
+``RESUME_CPU_QUEUE_SIZE`` more calls waiting for a free thread; beyond that it
+raises ExecutorBusy straight away, which views turn into a 429 response,
+instead of letting the backlog (and response times) grow without bound.
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+
+class ExecutorBusy(Exception):
+    """Raised when every worker thread is busy and the wait queue is full"""
+
+
+class BoundedExecutor:
+    """ThreadPoolExecutor that rejects work instead of queueing it indefinitely"""
+
+    def __init__(self, max_workers, max_queued):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='resume-cpu')
+        self._slots = threading.BoundedSemaphore(max_workers + max_queued)
+
+    def submit(self, func, *args, **kwargs):
+        """Schedule func, returning a concurrent.futures.Future, or raise ExecutorBusy"""
+        if not self._slots.acquire(blocking=False):
+            raise ExecutorBusy(f'All {self.max_workers} workers busy and {self.max_queued} calls queued')
+        try:
+            # Run in a copy of the caller's context, as asyncio.to_thread does,
+            # so context variables such as the stage timer follow the work
+            context = contextvars.copy_context()
+            future = self._executor.submit(context.run, _call, func, args, kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Free the slot when the work finishes, even if the caller stopped waiting
+        future.add_done_callback(lambda future: self._slots.release())
+        return future
+
+    async def run(self, func, *args, **kwargs):
+        """Await func(*args, **kwargs) on a worker thread"""
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+
+def _call(func, args, kwargs):
+    # Pool threads outlive requests, so apply the same connection cleanup
+    # Django does around each request (honouring CONN_MAX_AGE)
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+_lock = threading.Lock()
+_executor = None
+
+
+def get_executor():
+    """Return the process-wide executor, created from settings on first use"""
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = BoundedExecutor(
+                    max_workers=getattr(settings, 'RESUME_CPU_WORKERS', None) or os.cpu_count() or 1,
+                    max_queued=getattr(settings, 'RESUME_CPU_QUEUE_SIZE', 32),
+                )
+    return _executor
+
+
+async def run(func, *args, **kwargs):
+    """Run func on the shared executor; raises ExecutorBusy when it is saturated"""
+    return await get_executor().run(func, *args, **kwargs)
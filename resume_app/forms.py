@@ -2,6 +2,7 @@ from django import forms
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm
 from .models import Resume, JobMatch
+from .uploads import EXPECTED_TYPES, detect_file_type
 
 
 class ResumeUploadForm(forms.ModelForm):
@@ -18,11 +19,20 @@ class ResumeUploadForm(forms.ModelForm):
         if file:
             # Check file extension
             ext = file.name.split('.')[-1].lower()
-            if ext not in ['pdf', 'docx', 'doc', 'txt']:
-                raise forms.ValidationError("Only PDF, DOCX, DOC, and TXT files are allowed.")
+            if ext not in EXPECTED_TYPES:
+                raise forms.ValidationError("Only PDF, DOCX, and TXT files are allowed.")
             # Check file size (5MB limit)
             if file.size > 5 * 1024 * 1024:
                 raise forms.ValidationError("File size must be under 5MB.")
+            # Check the contents match the extension; ResumeUploadHandler has
+            # usually sniffed them already while the upload streamed in
+            detected_type = getattr(file, 'detected_type', None)
+            if detected_type is None:
+                detected_type = detect_file_type(file)
+            if detected_type == 'ole':
+                raise forms.ValidationError("Legacy Word (.doc) files are not supported. Please save your resume as DOCX or PDF.")
+            if detected_type != EXPECTED_TYPES[ext]:
+                raise forms.ValidationError(f"The file's contents don't match its .{ext} extension.")
         return file
 
 
@@ -35,6 +45,25 @@ class JobSearchForm(forms.Form):
                                      widget=forms.Textarea(attrs={'class': 'form-control', 'placeholder': 'Paste job description here', 'rows': 5}))
 
 
+class JobRankingForm(forms.Form):
+    job_description = forms.CharField(required=True,
+                                     widget=forms.Textarea(attrs={'class': 'form-control', 'placeholder': 'Paste job description here', 'rows': 8}))
+    top_k = forms.IntegerField(min_value=1, max_value=500, initial=20, required=False,
+                               widget=forms.NumberInput(attrs={'class': 'form-control'}))
+
+
+class SkillSearchForm(forms.Form):
+    skills = forms.CharField(max_length=1000, help_text='Comma-separated skill names')
+    mode = forms.ChoiceField(choices=[('all', 'All skills'), ('any', 'Any skill')], required=False)
+    limit = forms.IntegerField(min_value=1, max_value=500, required=False)
+
+    def clean_skills(self):
+        skills = [skill.strip() for skill in self.cleaned_data['skills'].split(',') if skill.strip()]
+        if not skills:
+            raise forms.ValidationError("Enter at least one skill.")
+        return skills
+
+
 class UserRegistrationForm(UserCreationForm):
     email = forms.EmailField(required=True,
                            widget=forms.EmailInput(attrs={'class': 'form-control', 'placeholder': 'Email'}))
@@ -0,0 +1,83 @@
+"""
+Shared, pre-analyzed job descriptions.
+
+Recruiters match the same job description against many resumes. Each
+distinct description is stored once as a JobDescription, keyed by the hash of
+its normalized text (whitespace collapsed, lowercased), together with its
+extracted skills and TF-IDF vector. Matching looks the description up first
+and only extracts skills or vectorizes again when the skill taxonomy or the
+fitted vectorizer has changed since they were stored.
+"""
+
+import hashlib
+
+from scipy import sparse
+
+from . import matcher_store, timing, vectors
+from .models import JobDescription
+from .resume_analyzer import JobMatcher
+from .taxonomy import get_taxonomy
+
+
+def normalize(text):
+    """Collapse whitespace and case, which neither skill extraction nor TF-IDF depends on"""
+    return ' '.join(text.split()).lower()
+
+
+def content_hash(text):
+    return hashlib.sha256(normalize(text).encode('utf-8')).hexdigest()
+
+
+def get_job_description(text, matcher, vector_version=''):
+    """Return the stored JobDescription for text, creating or refreshing its analysis as needed
+
+    The TF-IDF vector is (re)computed only when a vectorizer is fitted, i.e.
+    vector_version is set, and the stored vector is from another version.
+    """
+    description, created = JobDescription.objects.get_or_create(
+        content_hash=content_hash(text),
+        defaults={'text': text},
+    )
+
+    update_fields = []
+    skills_version = get_taxonomy().content_hash
+    if description.skills_version != skills_version:
+        with timing.stage('job_skills'):
+            description.skills = matcher.extract_job_skills(description.text)
+        description.skills_version = skills_version
+        update_fields += ['skills', 'skills_version']
+    if vector_version and description.vector_version != vector_version:
+        with timing.stage('job_vector'):
+            description.tfidf_vector, description.vector_version = vectors.vectorize_text(description.text)
+        update_fields += ['tfidf_vector', 'vector_version']
+    if update_fields:
+        description.save(update_fields=update_fields)
+    return description
+
+
+def decode_job_vector(description, vector_version):
+    """Return the description's TF-IDF vector as a sparse row, or None if it is missing or stale"""
+    if not description.tfidf_vector or description.vector_version != vector_version:
+        return None
+    indices, data, n_features = vectors.decode_vector(description.tfidf_vector)
+    return sparse.csr_matrix((data, indices, [0, len(indices)]), shape=(1, n_features))
+
+
+def match_job(resume_analysis, job_title, company, job_description):
+    """Match a resume against a job, reusing the stored analysis of a repeated job description
+
+    Returns JobMatcher.match_job results with 'job_description' set to the
+    JobDescription instance.
+    """
+    bundle = matcher_store.load_vectorizer()
+    matcher = JobMatcher(vectorizer=bundle['vectorizer'] if bundle else None)
+    vector_version = bundle['version'] if bundle else ''
+    with timing.stage('job_description'):
+        description = get_job_description(job_description, matcher, vector_version)
+    results = matcher.match_job(
+        resume_analysis, job_title, company, description.text,
+        job_skills=description.skills,
+        job_vector=decode_job_vector(description, vector_version) if bundle else None,
+    )
+    results['job_description'] = description
+    return results
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from resume_app import nlp, tasks
+
+
+class Command(BaseCommand):
+    help = 'Process pending resume analysis jobs queued by the upload and analyze views'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the queue once and exit instead of polling forever')
+        parser.add_argument('--sleep', type=float, default=2.0,
+                            help='Seconds to wait between polls when the queue is empty')
+        parser.add_argument('--max-jobs', type=int, default=0,
+                            help='Exit after processing this many jobs (0 means no limit)')
+
+    def handle(self, *args, **options):
+        processed = 0
+        # Load the NLP models before claiming work so the first job isn't slow
+        started = time.monotonic()
+        nlp.warm_up()
+        self.stdout.write(f'Analysis worker started (models loaded in {time.monotonic() - started:.1f}s)')
+
+        while True:
+            job = tasks.claim_next_job()
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+
+            started = time.monotonic()
+            job = tasks.process_job(job)
+            elapsed = time.monotonic() - started
+            if job.status == job.STATUS_DONE:
+                self.stdout.write(f'Analyzed resume {job.resume_id} in {elapsed:.2f}s')
+            else:
+                self.stderr.write(f'Failed to analyze resume {job.resume_id}: {job.error}')
+
+            processed += 1
+            if options['max_jobs'] and processed >= options['max_jobs']:
+                break
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} job(s)'))
@@ -0,0 +1,133 @@
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from resume_app import batch
+from resume_app.models import (ParsedResumeCache, Resume, ResumeAnalysis, ResumeAnalysisPayload,
+                               ResumeSkill, ResumeText)
+from resume_app.resume_analyzer import get_parser_version
+from resume_app.tasks import analysis_fields, payload_fields, skill_rows, stats_fields
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+
+class Command(BaseCommand):
+    help = 'Import and analyze a directory or glob of resumes using a process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='Directory to scan recursively, or a glob pattern')
+        parser.add_argument('--user', required=True,
+                            help='Username that will own the imported resumes')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Number of parser processes (default: CPU count)')
+        parser.add_argument('--chunk-size', type=int, default=100,
+                            help='Number of analyses written per bulk_create')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist")
+
+        paths = self.collect_paths(options['source'])
+        if not paths:
+            raise CommandError(f"No supported resume files found in '{options['source']}'")
+
+        workers = max(1, options['workers'])
+        chunk_size = max(1, options['chunk_size'])
+        # Hand each worker several files per round trip to amortize IPC
+        map_chunksize = max(1, min(16, len(paths) // (workers * 4)))
+
+        self.stdout.write(f'Analyzing {len(paths)} file(s) with {workers} worker(s)')
+        started = time.monotonic()
+        imported = 0
+        failed = 0
+        pending = []
+
+        parser_limits = (
+            getattr(settings, 'RESUME_MAX_PAGES', None),
+            getattr(settings, 'RESUME_EXTRACTION_TIMEOUT', None),
+        )
+        with ProcessPoolExecutor(max_workers=workers, initializer=batch.init_worker,
+                                 initargs=parser_limits) as executor:
+            for path, content_hash, results, error in executor.map(batch.parse_file, paths, chunksize=map_chunksize):
+                if error is not None:
+                    failed += 1
+                    self.stderr.write(f'Failed to analyze {path}: {error}')
+                    continue
+                pending.append((path, content_hash, results))
+                if len(pending) >= chunk_size:
+                    imported += self.store_chunk(user, pending)
+                    pending = []
+                    self.report_progress(imported, failed, started)
+
+        if pending:
+            imported += self.store_chunk(user, pending)
+
+        elapsed = time.monotonic() - started
+        rate = (imported + failed) / elapsed if elapsed else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} resume(s), {failed} failed, in {elapsed:.1f}s ({rate:.1f} files/sec)'
+        ))
+
+    def collect_paths(self, source):
+        """Expand the source argument into a sorted list of resume files"""
+        if os.path.isdir(source):
+            matches = []
+            for root, dirs, files in os.walk(source):
+                matches.extend(os.path.join(root, name) for name in files)
+        else:
+            matches = glob.glob(source, recursive=True)
+        return sorted(path for path in matches
+                      if os.path.isfile(path) and path.lower().endswith(SUPPORTED_EXTENSIONS))
+
+    def store_chunk(self, user, parsed):
+        """Copy a chunk of parsed files into storage and bulk-insert their rows"""
+        resumes = []
+        for path, content_hash, results in parsed:
+            resume = Resume(user=user, title=os.path.splitext(os.path.basename(path))[0],
+                            content_hash=content_hash)
+            with open(path, 'rb') as fh:
+                resume.file.save(os.path.basename(path), File(fh), save=False)
+            resumes.append(resume)
+
+        with transaction.atomic():
+            resumes = Resume.objects.bulk_create(resumes)
+            ResumeAnalysis.objects.bulk_create([
+                ResumeAnalysis(resume=resume, **analysis_fields(results), **stats_fields(results))
+                for resume, (path, content_hash, results) in zip(resumes, parsed)
+            ])
+            ResumeAnalysisPayload.objects.bulk_create([
+                ResumeAnalysisPayload(resume=resume, **payload_fields(results))
+                for resume, (path, content_hash, results) in zip(resumes, parsed)
+            ])
+            ResumeSkill.objects.bulk_create([
+                row
+                for resume, (path, content_hash, results) in zip(resumes, parsed)
+                for row in skill_rows(resume, results)
+            ])
+            ResumeText.objects.bulk_create([
+                ResumeText(resume=resume,
+                           compressed_text=ResumeText.compress(results['full_text']),
+                           text_length=len(results['full_text']))
+                for resume, (path, content_hash, results) in zip(resumes, parsed)
+            ])
+            # Seed the parse cache so later uploads of these files are instant
+            parser_version = get_parser_version()
+            ParsedResumeCache.objects.bulk_create([
+                ParsedResumeCache(content_hash=content_hash, parser_version=parser_version, results=results)
+                for path, content_hash, results in parsed
+            ], ignore_conflicts=True)
+        return len(resumes)
+
+    def report_progress(self, imported, failed, started):
+        elapsed = time.monotonic() - started
+        rate = (imported + failed) / elapsed if elapsed else 0.0
+        self.stdout.write(f'  {imported} imported, {failed} failed ({rate:.1f} files/sec)')
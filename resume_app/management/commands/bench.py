@@ -0,0 +1,92 @@
+import json
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from resume_app import benchmark
+
+
+class Command(BaseCommand):
+    help = 'Time each stage of the parsing pipeline over a synthetic resume corpus'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', choices=list(benchmark.SIZES), default=list(benchmark.SIZES),
+                            help='Corpus sizes to run (default: all)')
+        parser.add_argument('--formats', nargs='+', choices=benchmark.FORMATS, default=list(benchmark.FORMATS),
+                            help='Resume formats to run (default: all)')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Timed runs per document (default: 5)')
+        parser.add_argument('--seed', type=int, default=benchmark.DEFAULT_SEED,
+                            help='Corpus seed; goldens are only checked for the default seed')
+        parser.add_argument('--json', action='store_true',
+                            help='Print the report as JSON instead of a summary')
+        parser.add_argument('--output', help='Also write the JSON report to this file')
+        parser.add_argument('--check', action='store_true',
+                            help='Fail if any output differs from the committed goldens')
+        parser.add_argument('--update-golden', action='store_true',
+                            help='Rewrite the committed goldens from this run')
+        parser.add_argument('--adversarial', action='store_true',
+                            help='Also time sentence classification on worst-case inputs')
+        parser.add_argument('--docx', action='store_true',
+                            help='Also compare the streaming DOCX reader with python-docx')
+
+    def handle(self, *args, **options):
+        if (options['check'] or options['update_golden']) and options['seed'] != benchmark.DEFAULT_SEED:
+            raise CommandError('Goldens are recorded for the default seed only')
+
+        with tempfile.TemporaryDirectory() as directory:
+            cases = benchmark.generate_corpus(directory, options['sizes'], options['formats'], options['seed'])
+            report, outputs = benchmark.run_benchmark(cases, repeat=max(1, options['repeat']))
+            if options['docx']:
+                report['docx_comparison'] = benchmark.run_docx_comparison(directory)
+        if options['adversarial']:
+            report['adversarial_ms'] = benchmark.run_adversarial()
+
+        if options['update_golden']:
+            # Only the cases that were run are replaced
+            goldens = benchmark.load_goldens()['outputs'] if os.path.exists(benchmark.GOLDEN_PATH) else {}
+            goldens.update(outputs)
+            benchmark.save_goldens(goldens)
+        elif options['check']:
+            differences = benchmark.compare_goldens(outputs, benchmark.load_goldens()['outputs'])
+            report['golden_differences'] = differences
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                json.dump(report, fh, indent=2)
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.write_summary(report)
+
+        if report.get('golden_differences'):
+            raise CommandError('Outputs differ from the goldens:\n' + '\n'.join(report['golden_differences']))
+
+    def write_summary(self, report):
+        stages = benchmark.STAGES
+        widths = [max(len(stage), 9) for stage in stages]
+        self.stdout.write(f"{'case':<12}" + ''.join(f'{stage:>{width + 2}}' for stage, width in zip(stages, widths)))
+        for name, case in report['cases'].items():
+            self.stdout.write(f'{name:<12}' + ''.join(
+                f"{case['stages'][stage]['median_ms']:>{width + 2}.2f}" for stage, width in zip(stages, widths)))
+        self.stdout.write(f"{'total':<12}" + ''.join(
+            f"{report['total_median_ms'][stage]:>{width + 2}.2f}" for stage, width in zip(stages, widths)))
+        self.stdout.write(f"Median milliseconds over {report['repeat']} run(s), parser {report['parser_version']}")
+        if 'adversarial_ms' in report:
+            self.stdout.write('')
+            lengths = benchmark.ADVERSARIAL_LENGTHS
+            self.stdout.write(f"{'adversarial input':<20}" + ''.join(f'{length:>12,}' for length in lengths))
+            for name, timings in report['adversarial_ms'].items():
+                self.stdout.write(f'{name:<20}' + ''.join(f'{timings[length]:>12.2f}' for length in lengths))
+            self.stdout.write('Best of 3 milliseconds for classify_sentences, by text length')
+        if 'docx_comparison' in report:
+            self.stdout.write('')
+            self.stdout.write(f"{'paragraphs':<12}{'streaming':>22}{'python-docx':>22}")
+            for line_count, readers in report['docx_comparison'].items():
+                self.stdout.write(f'{line_count:<12,}' + ''.join(
+                    f"{readers[name]['ms']:>10.1f}ms {readers[name]['peak_kb']:>8.0f}KB"
+                    for name in ('streaming', 'python-docx')))
+            self.stdout.write('Best of 3 time and peak allocated memory per DOCX reader')
+        if 'golden_differences' in report and not report['golden_differences']:
+            self.stdout.write(self.style.SUCCESS('All outputs match the goldens'))
@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from resume_app import matcher_store, vectors
+from resume_app.models import JobDescription, ResumeText
+from resume_app.resume_analyzer import JobMatcher
+
+
+class Command(BaseCommand):
+    help = 'Fit the job matching TF-IDF vectorizer over all stored resumes and job descriptions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Where to save the model (default: RESUME_MATCHER_MODEL)')
+        parser.add_argument('--min-df', type=int, default=1,
+                            help='Ignore terms that appear in fewer documents than this')
+        parser.add_argument('--max-df', type=float, default=1.0,
+                            help='Ignore terms that appear in more than this fraction of documents')
+        parser.add_argument('--max-features', type=int, default=None,
+                            help='Keep only the most frequent terms')
+
+    def iter_corpus(self):
+        """Yield every stored resume text and job description"""
+        resume_texts = ResumeText.objects.filter(text_length__gt=0).only('compressed_text')
+        for resume_text in resume_texts.iterator():
+            yield resume_text.text
+        # Each distinct job description once, however many resumes it was matched against
+        job_descriptions = JobDescription.objects.values_list('text', flat=True)
+        for text in job_descriptions.iterator():
+            if text:
+                yield text
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        corpus = list(self.iter_corpus())
+        if not corpus:
+            raise CommandError('No resumes or job descriptions stored yet; nothing to fit on')
+
+        vectorizer = JobMatcher.build_vectorizer(
+            min_df=options['min_df'],
+            max_df=options['max_df'],
+            max_features=options['max_features'],
+        )
+        try:
+            vectorizer.fit(corpus)
+        except ValueError as e:
+            raise CommandError(f'Could not fit vectorizer: {e}')
+
+        version = matcher_store.save_vectorizer(vectorizer, len(corpus), path=options['output'])
+        self.stdout.write(
+            f'Fitted vectorizer {version} on {len(corpus)} document(s), '
+            f'{len(vectorizer.vocabulary_)} terms'
+        )
+
+        if options['output'] and options['output'] != matcher_store.get_model_path():
+            self.stdout.write('Model written outside RESUME_MATCHER_MODEL; stored vectors left unchanged')
+        else:
+            # Stored vectors must come from the same vectorizer used to rank against them
+            bundle = matcher_store.load_vectorizer()
+            updated = vectors.vectorize_stored_resumes(bundle)
+            self.stdout.write(f'Re-vectorized {updated} stored resume(s)')
+
+        self.stdout.write(self.style.SUCCESS(f'Done in {time.monotonic() - started:.1f}s'))
@@ -0,0 +1,39 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from resume_app import vectors
+from resume_app.models import Resume
+
+
+class Command(BaseCommand):
+    help = 'Rank every analyzed resume against a job description'
+
+    def add_arguments(self, parser):
+        parser.add_argument('job_description', nargs='?',
+                            help='File containing the job description (default: read stdin)')
+        parser.add_argument('--top', type=int, default=10, help='Number of resumes to show')
+
+    def handle(self, *args, **options):
+        if options['job_description']:
+            with open(options['job_description'], encoding='utf-8') as fh:
+                job_description = fh.read()
+        else:
+            job_description = sys.stdin.read()
+        if not job_description.strip():
+            raise CommandError('Job description is empty')
+
+        started = time.monotonic()
+        ranking = vectors.rank_resumes(job_description, top_k=options['top'])
+        if ranking is None:
+            raise CommandError('No fitted vectorizer found; run "manage.py fit_matcher" first')
+        elapsed = time.monotonic() - started
+
+        resumes = Resume.objects.select_related('user').in_bulk([resume_id for resume_id, score in ranking])
+        for position, (resume_id, score) in enumerate(ranking, start=1):
+            resume = resumes.get(resume_id)
+            if resume is None:
+                continue
+            self.stdout.write(f'{position:>3}. {score:6.2f}%  #{resume.id} {resume.title} ({resume.user.username})')
+        self.stdout.write(self.style.SUCCESS(f'Ranked in {elapsed * 1000:.1f}ms'))
@@ -0,0 +1,48 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Measure process startup time by timing fresh "manage.py check" runs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5,
+                            help='Number of timed runs (default: 5)')
+        parser.add_argument('--json', action='store_true',
+                            help='Print the timings as JSON instead of a summary')
+
+    def handle(self, *args, **options):
+        runs = max(1, options['runs'])
+        command = [sys.executable, os.path.join(settings.BASE_DIR, 'manage.py'), 'check']
+
+        timings = []
+        for run in range(runs):
+            started = time.perf_counter()
+            result = subprocess.run(command, capture_output=True, text=True)
+            elapsed = time.perf_counter() - started
+            if result.returncode != 0:
+                raise CommandError(f'"manage.py check" failed:\n{result.stderr}')
+            timings.append(elapsed)
+
+        summary = {
+            'runs': runs,
+            'min': min(timings),
+            'median': statistics.median(timings),
+            'max': max(timings),
+            'timings': timings,
+        }
+        if options['json']:
+            self.stdout.write(json.dumps(summary, indent=2))
+            return
+
+        self.stdout.write(
+            f"manage.py check over {runs} run(s): "
+            f"min {summary['min']:.3f}s, median {summary['median']:.3f}s, max {summary['max']:.3f}s"
+        )
@@ -0,0 +1,77 @@
+"""
+Persistence for the TF-IDF vectorizer used by JobMatcher.
+
+``manage.py fit_matcher`` fits the vectorizer over every stored resume and job
+description and saves it with joblib under a version tag. Request handlers
+load it once per process (reloading when the file changes) and only ever call
+``transform``, which keeps IDF weights meaningful and scores stable.
+"""
+
+import hashlib
+import os
+import threading
+
+import joblib
+from django.conf import settings
+from django.utils import timezone
+
+from .resume_analyzer import JobMatcher
+
+_lock = threading.Lock()
+_loaded = {}
+
+
+def get_model_path():
+    """Return where the fitted vectorizer is stored"""
+    default = os.path.join(settings.BASE_DIR, 'models', 'job_matcher.joblib')
+    return str(getattr(settings, 'RESUME_MATCHER_MODEL', default))
+
+
+def make_version(vectorizer):
+    """Build a version tag from the fit time and the learned vocabulary"""
+    vocabulary = '\n'.join(sorted(vectorizer.vocabulary_))
+    digest = hashlib.sha256(vocabulary.encode('utf-8')).hexdigest()[:8]
+    return f"{timezone.now():%Y%m%d%H%M%S}-{digest}"
+
+
+def save_vectorizer(vectorizer, n_documents, path=None):
+    """Persist a fitted vectorizer and return its version tag"""
+    path = path or get_model_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    version = make_version(vectorizer)
+    bundle = {
+        'version': version,
+        'vectorizer': vectorizer,
+        'n_documents': n_documents,
+        'fitted_at': timezone.now().isoformat(),
+    }
+    # Write to a temporary file first so readers never see a partial model
+    tmp_path = f"{path}.tmp"
+    joblib.dump(bundle, tmp_path)
+    os.replace(tmp_path, path)
+    return version
+
+
+def load_vectorizer(path=None):
+    """Return the persisted model bundle, or None if no model has been fitted"""
+    path = path or get_model_path()
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+    cached = _loaded.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with _lock:
+        cached = _loaded.get(path)
+        if cached is None or cached[0] != mtime:
+            _loaded[path] = (mtime, joblib.load(path))
+        return _loaded[path][1]
+
+
+def get_job_matcher():
+    """Return a JobMatcher using the persisted vectorizer when one exists"""
+    bundle = load_vectorizer()
+    return JobMatcher(vectorizer=bundle['vectorizer'] if bundle else None)
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 00:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_app', '0003_resume_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='tfidf_vector',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='vector_version',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
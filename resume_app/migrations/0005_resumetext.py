@@ -0,0 +1,48 @@
+# Generated by Django 5.1.6 on 2026-10-18 00:34
+
+import zlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_cached_text(apps, schema_editor):
+    """Fill ResumeText for already analyzed resumes from the parse cache"""
+    Resume = apps.get_model('resume_app', 'Resume')
+    ParsedResumeCache = apps.get_model('resume_app', 'ParsedResumeCache')
+    ResumeText = apps.get_model('resume_app', 'ResumeText')
+
+    texts = {}
+    for content_hash, text in ParsedResumeCache.objects.values_list('content_hash', 'results__full_text'):
+        if text:
+            texts[content_hash] = text
+
+    rows = []
+    resumes = Resume.objects.filter(analysis__isnull=False).exclude(content_hash='')
+    for resume_id, content_hash in resumes.values_list('id', 'content_hash').iterator():
+        text = texts.get(content_hash)
+        if text:
+            rows.append(ResumeText(resume_id=resume_id, compressed_text=zlib.compress(text.encode('utf-8')),
+                                   text_length=len(text)))
+    ResumeText.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_app', '0004_resumeanalysis_tfidf_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('compressed_text', models.BinaryField()),
+                ('text_length', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('resume', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='extracted_text', to='resume_app.resume')),
+            ],
+        ),
+        migrations.RunPython(copy_cached_text, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 00:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_app', '0005_resumetext'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='page_count',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.1.6 on 2026-10-18 00:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def move_sentences_to_payload(apps, schema_editor):
+    """Move the sentence lists out of existing analyses into their payload rows"""
+    ResumeAnalysis = apps.get_model('resume_app', 'ResumeAnalysis')
+    ResumeAnalysisPayload = apps.get_model('resume_app', 'ResumeAnalysisPayload')
+
+    payloads = []
+    for analysis in ResumeAnalysis.objects.only('resume_id', 'education', 'experience').iterator():
+        education_sentences = analysis.education.pop('education_sentences', [])
+        experience_sentences = analysis.experience.pop('experience_sentences', [])
+        payloads.append(ResumeAnalysisPayload(resume_id=analysis.resume_id,
+                                              education_sentences=education_sentences,
+                                              experience_sentences=experience_sentences))
+        analysis.save(update_fields=['education', 'experience'])
+    ResumeAnalysisPayload.objects.bulk_create(payloads, batch_size=500)
+
+
+def move_sentences_back(apps, schema_editor):
+    ResumeAnalysis = apps.get_model('resume_app', 'ResumeAnalysis')
+    ResumeAnalysisPayload = apps.get_model('resume_app', 'ResumeAnalysisPayload')
+
+    for payload in ResumeAnalysisPayload.objects.iterator():
+        analysis = ResumeAnalysis.objects.filter(resume_id=payload.resume_id).only('education', 'experience').first()
+        if analysis is None:
+            continue
+        analysis.education['education_sentences'] = payload.education_sentences
+        analysis.experience['experience_sentences'] = payload.experience_sentences
+        analysis.save(update_fields=['education', 'experience'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_app', '0006_resume_page_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeAnalysisPayload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('education_sentences', models.JSONField(default=list)),
+                ('experience_sentences', models.JSONField(default=list)),
+                ('truncated', models.BooleanField(default=False)),
+                ('resume', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='analysis_payload', to='resume_app.resume')),
+            ],
+        ),
+        migrations.RunPython(move_sentences_to_payload, move_sentences_back),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.6 on 2026-10-18 00:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_app', '0007_resumeanalysispayload'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobmatch',
+            index=models.Index(fields=['resume', '-created_at'], name='jobmatch_resume_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['user', '-uploaded_at', '-id'], name='resume_user_uploaded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['content_hash'], name='resume_content_hash_idx'),
+        ),
+    ]
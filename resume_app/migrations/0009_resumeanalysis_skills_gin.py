@@ -0,0 +1,33 @@
+# Generated by Django 5.1.6 on 2026-10-18 01:05
+
+from django.db import migrations
+
+INDEX_NAME = 'resumeanalysis_skill_counts_gin'
+
+
+def create_skills_index(apps, schema_editor):
+    """GIN index over the skill -> count map, serving ResumeAnalysis.objects.with_skill()"""
+    # JSONField is jsonb on PostgreSQL; other databases have no GIN indexes
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} "
+        f"ON resume_app_resumeanalysis USING GIN ((skills -> 'skill_counts'))"
+    )
+
+
+def drop_skills_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_app', '0008_hot_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_skills_index, drop_skills_index),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.6 on 2026-10-18 00:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def index_existing_skills(apps, schema_editor):
+    """Fill ResumeSkill from the skill counts of existing analyses"""
+    ResumeAnalysis = apps.get_model('resume_app', 'ResumeAnalysis')
+    ResumeSkill = apps.get_model('resume_app', 'ResumeSkill')
+
+    rows = []
+    for resume_id, skills in ResumeAnalysis.objects.values_list('resume_id', 'skills').iterator():
+        for skill, count in (skills or {}).get('skill_counts', {}).items():
+            rows.append(ResumeSkill(resume_id=resume_id, skill=skill, count=count))
+        if len(rows) >= 5000:
+            ResumeSkill.objects.bulk_create(rows)
+            rows = []
+    ResumeSkill.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_app', '0009_resumeanalysis_skills_gin'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.CharField(max_length=100)),
+                ('count', models.PositiveIntegerField(default=1)),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_index', to='resume_app.resume')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('skill', 'resume'), name='unique_resume_skill')],
+            },
+        ),
+        migrations.RunPython(index_existing_skills, migrations.RunPython.noop),
+    ]
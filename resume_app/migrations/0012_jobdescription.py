@@ -0,0 +1,82 @@
+# Generated by Django 5.1.6 on 2026-10-18 05:12
+
+import hashlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def content_hash(text):
+    # Same normalization as resume_app.job_descriptions.content_hash, frozen here
+    normalized = ' '.join(text.split()).lower()
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def link_job_descriptions(apps, schema_editor):
+    """Replace each JobMatch's copy of its job description with a shared JobDescription"""
+    JobDescription = apps.get_model('resume_app', 'JobDescription')
+    JobMatch = apps.get_model('resume_app', 'JobMatch')
+
+    ids = {}
+    match_ids = {}
+    matches = (JobMatch.objects.exclude(job_description_text__isnull=True)
+               .exclude(job_description_text='')
+               .values_list('id', 'job_description_text'))
+    for match_id, text in matches.iterator():
+        key = content_hash(text)
+        if key not in ids:
+            # Skills and vectors are computed the next time the description is used
+            description, created = JobDescription.objects.get_or_create(content_hash=key, defaults={'text': text})
+            ids[key] = description.id
+        match_ids.setdefault(ids[key], []).append(match_id)
+
+    for description_id, matched in match_ids.items():
+        for start in range(0, len(matched), 500):
+            JobMatch.objects.filter(id__in=matched[start:start + 500]).update(job_description=description_id)
+
+
+def unlink_job_descriptions(apps, schema_editor):
+    """Copy each JobMatch's shared job description text back onto the match"""
+    JobDescription = apps.get_model('resume_app', 'JobDescription')
+    JobMatch = apps.get_model('resume_app', 'JobMatch')
+
+    for description_id, text in JobDescription.objects.values_list('id', 'text').iterator():
+        JobMatch.objects.filter(job_description=description_id).update(job_description_text=text)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_app', '0011_resumeanalysis_parse_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobDescription',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True)),
+                ('text', models.TextField()),
+                ('skills', models.JSONField(default=list)),
+                ('skills_version', models.CharField(blank=True, default='', max_length=64)),
+                ('tfidf_vector', models.BinaryField(blank=True, null=True)),
+                ('vector_version', models.CharField(blank=True, default='', max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RenameField(
+            model_name='jobmatch',
+            old_name='job_description',
+            new_name='job_description_text',
+        ),
+        migrations.AddField(
+            model_name='jobmatch',
+            name='job_description',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='job_matches', to='resume_app.jobdescription'),
+        ),
+        migrations.RunPython(link_job_descriptions, unlink_job_descriptions),
+        migrations.RemoveField(
+            model_name='jobmatch',
+            name='job_description_text',
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.6 on 2026-10-18 01:33
+
+from django.db import migrations, models
+
+
+def set_vector_updated_at(apps, schema_editor):
+    """Date the stored vectors by their analysis"""
+    ResumeAnalysis = apps.get_model('resume_app', 'ResumeAnalysis')
+    ResumeAnalysis.objects.filter(tfidf_vector__isnull=False).update(vector_updated_at=models.F('analyzed_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_app', '0012_jobdescription'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='vector_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(set_vector_updated_at, migrations.RunPython.noop),
+    ]
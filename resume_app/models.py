@@ -1,6 +1,8 @@
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 import os
+import zlib
 
 
 def resume_upload_path(instance, filename):
@@ -8,12 +10,42 @@ def resume_upload_path(instance, filename):
     return f'resumes/user_{instance.user.id}/{filename}'
 
 
+class ResumeQuerySet(models.QuerySet):
+    def for_dashboard(self):
+        # The analysis columns the dashboard table shows (not its JSON fields),
+        # whether career advice exists and how many job matches there are. The
+        # match count is a correlated subquery rather than a JOIN + GROUP BY so
+        # a page is still read straight off resume_user_uploaded_idx
+        job_match_counts = (JobMatch.objects.filter(resume=models.OuterRef('pk'))
+                            .order_by().values('resume').annotate(count=models.Count('*')).values('count'))
+        return (self.select_related('analysis')
+                .only('id', 'title', 'file', 'uploaded_at', 'analysis__id', 'analysis__analyzed_at')
+                .annotate(
+                    has_career_advice=models.Exists(CareerAdvice.objects.filter(resume=models.OuterRef('pk'))),
+                    job_match_count=Coalesce(models.Subquery(job_match_counts), 0),
+                ))
+
+
 class Resume(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='resumes')
     title = models.CharField(max_length=255)
     file = models.FileField(upload_to=resume_upload_path)
+    content_hash = models.CharField(max_length=64, blank=True, default='')
+    # Counted while the upload streams in; None when unknown or not a PDF
+    page_count = models.PositiveIntegerField(null=True, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     
+    objects = ResumeQuerySet.as_manager()
+    
+    class Meta:
+        indexes = [
+            # Dashboard listing: a user's resumes newest first, with id as the
+            # keyset pagination tiebreaker
+            models.Index(fields=['user', '-uploaded_at', '-id'], name='resume_user_uploaded_idx'),
+            # Finding earlier uploads of the same file
+            models.Index(fields=['content_hash'], name='resume_content_hash_idx'),
+        ]
+    
     def __str__(self):
         return self.title
     
@@ -25,18 +57,139 @@ class Resume(models.Model):
         return extension
 
 
+class ResumeAnalysisQuerySet(models.QuerySet):
+    def for_display(self):
+        # Only ranking reads the stored TF-IDF vector
+        return self.defer('tfidf_vector')
+    
+    # Skill lookups test keys of skills['skill_counts'] (canonical skill names),
+    # which a GIN index serves on PostgreSQL
+    def with_skill(self, skill):
+        return self.filter(skills__skill_counts__has_key=skill)
+    
+    def with_skills(self, skills, match_all=True):
+        lookup = 'has_keys' if match_all else 'has_any_keys'
+        return self.filter(**{f'skills__skill_counts__{lookup}': list(skills)})
+
+
 class ResumeAnalysis(models.Model):
     resume = models.OneToOneField(Resume, on_delete=models.CASCADE, related_name='analysis')
     skills = models.JSONField(default=dict)
     experience = models.JSONField(default=dict)
     education = models.JSONField(default=dict)
     summary = models.TextField(blank=True, null=True)
+    # TF-IDF vector of the resume text (see resume_app.vectors), the version
+    # of the fitted vectorizer that produced it and when it was last written,
+    # which tells the cached ranking index which rows to reload
+    tfidf_vector = models.BinaryField(blank=True, null=True)
+    vector_version = models.CharField(max_length=64, blank=True, default='')
+    vector_updated_at = models.DateTimeField(blank=True, null=True)
+    # How the parse went: total seconds (None when imported in bulk), the
+    # milliseconds spent in each stage (see resume_app.timing), pages read
+    # from a PDF and the length of the extracted text
+    parse_duration = models.FloatField(blank=True, null=True)
+    parse_timings = models.JSONField(default=dict, blank=True)
+    page_count = models.PositiveIntegerField(blank=True, null=True)
+    text_length = models.PositiveIntegerField(blank=True, null=True)
     analyzed_at = models.DateTimeField(auto_now_add=True)
     
+    objects = ResumeAnalysisQuerySet.as_manager()
+    
     def __str__(self):
         return f"Analysis for {self.resume.title}"
 
 
+class ResumeAnalysisPayload(models.Model):
+    # The sentence lists behind ResumeAnalysis.education/experience, kept in
+    # their own table so loading an analysis doesn't deserialize them
+    resume = models.OneToOneField(Resume, on_delete=models.CASCADE, related_name='analysis_payload')
+    education_sentences = models.JSONField(default=list)
+    experience_sentences = models.JSONField(default=list)
+    # Whether the lists were cut down to the RESUME_MAX_STORED_SENTENCES budget
+    truncated = models.BooleanField(default=False)
+    
+    def __str__(self):
+        return f"Analysis payload for {self.resume.title}"
+
+
+class ResumeSkill(models.Model):
+    # One row per skill found in a resume: the inverted index behind skill search
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='skill_index')
+    skill = models.CharField(max_length=100)
+    count = models.PositiveIntegerField(default=1)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['skill', 'resume'], name='unique_resume_skill'),
+        ]
+    
+    def __str__(self):
+        return f"{self.skill} x{self.count} in {self.resume_id}"
+
+
+class ResumeText(models.Model):
+    # Kept out of ResumeAnalysis so reading an analysis never pulls in the text
+    resume = models.OneToOneField(Resume, on_delete=models.CASCADE, related_name='extracted_text')
+    compressed_text = models.BinaryField()
+    text_length = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Text of {self.resume.title}"
+
+    @staticmethod
+    def compress(text):
+        return zlib.compress(text.encode('utf-8'))
+
+    @property
+    def text(self):
+        return zlib.decompress(self.compressed_text).decode('utf-8')
+
+    @text.setter
+    def text(self, value):
+        self.compressed_text = self.compress(value)
+        self.text_length = len(value)
+
+
+class ParsedResumeCache(models.Model):
+    content_hash = models.CharField(max_length=64)
+    parser_version = models.CharField(max_length=128)
+    results = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['content_hash', 'parser_version'], name='unique_parse_per_version'),
+        ]
+
+    def __str__(self):
+        return f"Parse cache {self.content_hash[:12]} ({self.parser_version})"
+
+
+class AnalysisJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    resume = models.OneToOneField(Resume, on_delete=models.CASCADE, related_name='analysis_job')
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True)
+    error = models.TextField(blank=True, default='')
+    attempts = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"Analysis job for {self.resume.title} ({self.status})"
+
+
 class CareerAdvice(models.Model):
     resume = models.OneToOneField(Resume, on_delete=models.CASCADE, related_name='career_advice')
     strengths = models.JSONField(default=list)
@@ -50,15 +203,39 @@ class CareerAdvice(models.Model):
         return f"Career Advice for {self.resume.title}"
 
 
+class JobDescription(models.Model):
+    # Each distinct job description is stored once, keyed by the SHA-256 of
+    # its normalized text (see resume_app.job_descriptions)
+    content_hash = models.CharField(max_length=64, unique=True)
+    text = models.TextField()
+    # JobMatcher.extract_job_skills output and the taxonomy content hash it was computed with
+    skills = models.JSONField(default=list)
+    skills_version = models.CharField(max_length=64, blank=True, default='')
+    # TF-IDF vector (see resume_app.vectors) and the fitted vectorizer version that produced it
+    tfidf_vector = models.BinaryField(blank=True, null=True)
+    vector_version = models.CharField(max_length=64, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Job description {self.content_hash[:12]}"
+
+
 class JobMatch(models.Model):
     resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='job_matches')
     job_title = models.CharField(max_length=255)
     company = models.CharField(max_length=255, blank=True, null=True)
     match_percentage = models.FloatField()
-    job_description = models.TextField(blank=True, null=True)
+    job_description = models.ForeignKey(JobDescription, on_delete=models.SET_NULL, blank=True, null=True,
+                                        related_name='job_matches')
     skills_matched = models.JSONField(default=list)
     skills_missing = models.JSONField(default=list)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        indexes = [
+            # A resume's job match history, newest first
+            models.Index(fields=['resume', '-created_at'], name='jobmatch_resume_created_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.job_title} - {self.match_percentage}% match"
@@ -0,0 +1,85 @@
+"""
+Lazily loaded NLP models shared by every ResumeParser in the process.
+
+Importing spaCy and NLTK and loading ``en_core_web_sm`` takes seconds, so
+nothing here happens at import time: each model is loaded by the first caller
+that needs it, under a lock so concurrent first requests load it only once.
+Long-running workers call ``warm_up()`` at startup to pay that cost before
+serving traffic.
+"""
+
+import logging
+import subprocess
+import sys
+import threading
+from importlib import metadata
+
+logger = logging.getLogger(__name__)
+
+SPACY_MODEL = 'en_core_web_sm'
+
+_lock = threading.Lock()
+_nlp = None
+_stopwords = None
+
+
+def get_nlp():
+    """Return the spaCy pipeline, loading (and if needed downloading) it on first use"""
+    global _nlp
+    if _nlp is None:
+        with _lock:
+            if _nlp is None:
+                import spacy
+
+                try:
+                    nlp = spacy.load(SPACY_MODEL)
+                except OSError:
+                    # If model not found, download it
+                    logger.warning('spaCy model %s not found, downloading it', SPACY_MODEL)
+                    subprocess.run([sys.executable, '-m', 'spacy', 'download', SPACY_MODEL])
+                    nlp = spacy.load(SPACY_MODEL)
+                _nlp = nlp
+    return _nlp
+
+
+def get_stopwords():
+    """Return the NLTK English stopword list, downloading the corpus on first use"""
+    global _stopwords
+    if _stopwords is None:
+        with _lock:
+            if _stopwords is None:
+                import nltk
+
+                try:
+                    nltk.data.find('corpora/stopwords')
+                except LookupError:
+                    nltk.download('stopwords')
+                _stopwords = nltk.corpus.stopwords.words('english')
+    return _stopwords
+
+
+def get_model_version():
+    """Return 'name-version' of the spaCy model, read from its package metadata
+
+    Going through the installed distribution keeps this cheap enough to call
+    before the model itself has been loaded, which parse cache lookups rely on.
+    """
+    try:
+        return f"{SPACY_MODEL.split('_', 1)[1]}-{metadata.version(SPACY_MODEL)}"
+    except metadata.PackageNotFoundError:
+        # Model installed some other way. Loading it just to read its meta would
+        # make a cache lookup cost seconds, and the answer must not change once
+        # the model is loaded, so use a fixed marker; bump PARSER_VERSION when
+        # swapping such a model.
+        return f"{SPACY_MODEL.split('_', 1)[1]}-unknown"
+
+
+def is_loaded():
+    """Whether both models are already in memory"""
+    return _nlp is not None and _stopwords is not None
+
+
+def warm_up():
+    """Load every model now instead of on the first request"""
+    get_nlp()
+    get_stopwords()
@@ -0,0 +1,52 @@
+"""
+Keyset (cursor) pagination for lists ordered newest first.
+
+Instead of OFFSET, which makes the database walk past every earlier row, each
+page is fetched with a WHERE clause that continues after the last row of the
+previous page. The position is passed around as an opaque cursor encoding that
+row's (timestamp, id) pair, so every page costs the same however deep it is.
+"""
+
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+
+def encode_cursor(timestamp, pk):
+    """Encode a row's ordering key as a URL-safe cursor"""
+    raw = f"{timestamp.isoformat()}|{pk}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return (timestamp, pk) from a cursor, or None if it is missing or malformed"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        timestamp, pk = raw.split('|')
+        return datetime.fromisoformat(timestamp), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def keyset_filter(queryset, cursor, field):
+    """Order queryset by (-field, -pk) and keep only the rows after cursor"""
+    queryset = queryset.order_by(f'-{field}', '-pk')
+    position = decode_cursor(cursor)
+    if position is None:
+        return queryset
+    timestamp, pk = position
+    return queryset.filter(Q(**{f'{field}__lt': timestamp}) | Q(**{field: timestamp, 'pk__lt': pk}))
+
+
+async def aget_page(queryset, cursor, field, page_size):
+    """Return (rows, next_cursor) for one page; next_cursor is None on the last page"""
+    # Fetch one extra row to find out whether another page follows
+    rows = [row async for row in keyset_filter(queryset, cursor, field)[:page_size + 1]]
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, field), last.pk)
@@ -0,0 +1,97 @@
+"""
+Cache of ResumeParser.parse_resume results keyed by file content.
+
+Entries are keyed by the SHA-256 of the uploaded file plus the parser version
+(parser code, spaCy model and skill taxonomy), so re-uploading the same file
+skips text extraction and NLP entirely. Lookups go through a small in-process
+LRU first and fall back to the ParsedResumeCache table.
+"""
+
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+from .models import ParsedResumeCache
+from .resume_analyzer import get_parser_version
+
+
+class LRUCache:
+    """Thread-safe, size-bounded least-recently-used mapping"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return None
+            return self._data[key]
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_memory = LRUCache(getattr(settings, 'RESUME_PARSE_CACHE_SIZE', 256))
+
+
+def get_cached(content_hash, parser_version=None):
+    """Return cached parse results for a content hash, or None"""
+    if not content_hash:
+        return None
+    parser_version = parser_version or get_parser_version()
+    key = (content_hash, parser_version)
+
+    results = _memory.get(key)
+    if results is not None:
+        return results
+
+    entry = (ParsedResumeCache.objects
+             .filter(content_hash=content_hash, parser_version=parser_version)
+             .only('results')
+             .first())
+    if entry is None:
+        return None
+    _memory.set(key, entry.results)
+    return entry.results
+
+
+def set_cached(content_hash, results, parser_version=None):
+    """Store parse results in both cache tiers"""
+    if not content_hash:
+        return
+    parser_version = parser_version or get_parser_version()
+    _memory.set((content_hash, parser_version), results)
+    # get_or_create tolerates another worker storing the same file concurrently
+    ParsedResumeCache.objects.get_or_create(
+        content_hash=content_hash,
+        parser_version=parser_version,
+        defaults={'results': results},
+    )
+
+
+def parse_resume_cached(parser, file_path, content_hash):
+    """parse_resume that short-circuits on a cache hit"""
+    parser_version = get_parser_version()
+    results = get_cached(content_hash, parser_version)
+    if results is None:
+        results = parser.parse_resume(file_path)
+        set_cached(content_hash, results, parser_version)
+    return results
@@ -1,53 +1,158 @@
 import re
-import nltk
-import spacy
-import PyPDF2
-import docx
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import time
+import zipfile
 
-# Download necessary NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+from . import nlp, timing
+from .taxonomy import get_taxonomy
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+# spaCy, NLTK, scikit-learn and the document readers are imported where they
+# are used so that importing this module (e.g. from the URLconf) stays cheap;
+# see nlp.py for how the models themselves are loaded
 
-# Load spaCy model
-try:
-    nlp = spacy.load('en_core_web_sm')
-except OSError:
-    # If model not found, download it
-    import subprocess
-    subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-    nlp = spacy.load('en_core_web_sm')
+# Pipeline components needed to produce doc.ents
+NER_PIPES = ('tok2vec', 'ner')
+
+# Bump whenever a change to ResumeParser alters its output for the same file
+PARSER_VERSION = '4'
+
+# WordprocessingML elements read when streaming a DOCX file's text
+DOCX_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+DOCX_BODY = DOCX_NAMESPACE + 'body'
+DOCX_PARAGRAPH = DOCX_NAMESPACE + 'p'
+DOCX_RUN = DOCX_NAMESPACE + 'r'
+DOCX_TEXT = DOCX_NAMESPACE + 't'
+DOCX_TABS = (DOCX_NAMESPACE + 'tab', DOCX_NAMESPACE + 'ptab')
+DOCX_BREAK = DOCX_NAMESPACE + 'br'
+DOCX_BREAK_TYPE = DOCX_NAMESPACE + 'type'
+DOCX_CARRIAGE_RETURN = DOCX_NAMESPACE + 'cr'
+DOCX_NO_BREAK_HYPHEN = DOCX_NAMESPACE + 'noBreakHyphen'
+DOCX_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+# Sentences end at ., ! or ? followed by whitespace (so "Node.js" and "3.8"
+# stay whole), at line breaks and at bullet characters. No alternative can
+# backtrack (punctuation runs like "..." are matched one character at a time
+# and stripped afterwards), so splitting is linear in the length of the text.
+SENTENCE_BOUNDARY = re.compile(r'[.!?](?=\s|$)|[\r\n\u2022\u2023\u2043\u25aa\u25cf\u25e6\u25a0\u00b7]+')
+# Leftover list markers and punctuation around a sentence
+SENTENCE_STRIP = ' \t\f\v-*>:;,.!?'
+WORD_PATTERN = re.compile(r'[a-z]+')
+
+# Words that put a sentence in the education or experience list. Matching is
+# on whole words, so common inflections are listed explicitly.
+EDUCATION_KEYWORDS = frozenset([
+    'bachelor', 'bachelors', 'master', 'masters', 'phd', 'doctorate', 'degree', 'degrees',
+    'bs', 'bsc', 'ms', 'msc', 'ba', 'ma', 'mba', 'university', 'universities', 'college',
+    'colleges', 'institute', 'school', 'academy', 'gpa', 'major', 'minor', 'graduated',
+    'graduate', 'graduation', 'diploma', 'certificate', 'certificates'
+])
+EXPERIENCE_KEYWORDS = frozenset([
+    'experience', 'experienced', 'work', 'worked', 'working', 'employment', 'employed', 'job',
+    'jobs', 'career', 'position', 'positions', 'role', 'roles', 'company', 'companies',
+    'organization', 'organizations', 'firm', 'employer', 'employers', 'corporation',
+    'enterprise', 'years', 'months', 'responsibilities', 'duties', 'tasks', 'achievements',
+    'managed', 'led', 'developed', 'created', 'implemented', 'designed', 'coordinated'
+])
+
+
+def get_parser_version():
+    """Identify everything that determines parse_resume output besides the file itself"""
+    return f"{PARSER_VERSION}:{nlp.get_model_version()}:{get_taxonomy().content_hash[:16]}"
+
+
+class ExtractionTimeout(Exception):
+    """Raised when text extraction exceeds the parser's time budget"""
 
 
 class ResumeParser:
     """Class to parse resume text and extract relevant information"""
     
-    def __init__(self):
-        self.stopwords = nltk.corpus.stopwords.words('english')
+    def __init__(self, max_pages=None, extraction_timeout=None):
+        # Guards against pathological PDFs: stop after max_pages pages and give
+        # up once extraction has taken longer than extraction_timeout seconds
+        self.max_pages = max_pages
+        self.extraction_timeout = extraction_timeout
+    
+    @property
+    def stopwords(self):
+        return nlp.get_stopwords()
+    
+    def iter_pdf_pages(self, pdf_path):
+        """Yield the text of each PDF page, extracting pages lazily"""
+        import PyPDF2
         
-    def extract_text_from_pdf(self, pdf_path):
-        """Extract text from PDF file"""
-        text = ""
+        started = time.monotonic()
         with open(pdf_path, 'rb') as file:
             pdf_reader = PyPDF2.PdfReader(file)
-            for page_num in range(len(pdf_reader.pages)):
-                text += pdf_reader.pages[page_num].extract_text()
-        return text
+            for page_num, page in enumerate(pdf_reader.pages):
+                if self.max_pages is not None and page_num >= self.max_pages:
+                    break
+                # A single slow page can't be interrupted, so the budget is checked between pages
+                if self.extraction_timeout is not None and time.monotonic() - started > self.extraction_timeout:
+                    raise ExtractionTimeout(
+                        f"PDF text extraction took longer than {self.extraction_timeout}s "
+                        f"(stopped after {page_num} pages)")
+                yield page.extract_text() or ''
+    
+    def extract_text_from_pdf(self, pdf_path):
+        """Extract text from PDF file"""
+        # Join once rather than growing a string page by page
+        return ''.join(self.iter_pdf_pages(pdf_path))
+    
+    def iter_docx_paragraphs(self, docx_path):
+        """Yield the text of each DOCX paragraph, table cells included, in document order"""
+        from xml.etree.ElementTree import iterparse
+        
+        # Stream word/document.xml instead of building python-docx's object
+        # model; blocks are discarded as soon as they have been read
+        with zipfile.ZipFile(docx_path) as archive, archive.open('word/document.xml') as document:
+            # Open paragraphs as [text pieces, open runs]; a text box nests a
+            # paragraph inside a run of the paragraph that anchors it
+            paragraphs = []
+            fallback = 0  # Depth inside mc:Fallback, a legacy copy of the mc:Choice content
+            depth = 0
+            body = None
+            for event, element in iterparse(document, events=('start', 'end')):
+                tag = element.tag
+                if event == 'start':
+                    depth += 1
+                    if tag == DOCX_FALLBACK or fallback:
+                        fallback += 1
+                    elif tag == DOCX_PARAGRAPH:
+                        paragraphs.append([[], 0])
+                    elif tag == DOCX_RUN and paragraphs:
+                        paragraphs[-1][1] += 1
+                    elif tag == DOCX_BODY:
+                        body = element
+                    continue
+                
+                depth -= 1
+                if fallback:
+                    fallback -= 1
+                elif tag == DOCX_PARAGRAPH:
+                    # Text box paragraphs come out before the paragraph holding the box
+                    yield ''.join(paragraphs.pop()[0])
+                elif tag == DOCX_RUN and paragraphs:
+                    paragraphs[-1][1] -= 1
+                elif paragraphs and paragraphs[-1][1]:
+                    # Run content, translated the way python-docx does
+                    pieces = paragraphs[-1][0]
+                    if tag == DOCX_TEXT:
+                        pieces.append(element.text or '')
+                    elif tag in DOCX_TABS:
+                        pieces.append('\t')
+                    elif tag == DOCX_CARRIAGE_RETURN or (
+                            tag == DOCX_BREAK and element.get(DOCX_BREAK_TYPE, 'textWrapping') == 'textWrapping'):
+                        pieces.append('\n')
+                    elif tag == DOCX_NO_BREAK_HYPHEN:
+                        pieces.append('-')
+                
+                if depth == 2 and body is not None:
+                    # A top-level paragraph or table is done: drop it
+                    body.clear()
     
     def extract_text_from_docx(self, docx_path):
         """Extract text from DOCX file"""
-        doc = docx.Document(docx_path)
-        text = [paragraph.text for paragraph in doc.paragraphs]
-        return '\n'.join(text)
+        return '\n'.join(self.iter_docx_paragraphs(docx_path))
     
     def extract_text(self, file_path):
         """Extract text from resume file based on extension"""
@@ -63,37 +168,8 @@ class ResumeParser:
     
     def extract_skills(self, text):
         """Extract skills from resume text"""
-        # Common technical skills
-        skill_keywords = [
-            # Programming languages
-            'python', 'java', 'javascript', 'c\+\+', 'c#', 'ruby', 'php', 'swift', 'kotlin', 'go', 'rust',
-            # Web development
-            'html', 'css', 'react', 'angular', 'vue', 'node\.js', 'express', 'django', 'flask', 'spring', 'asp\.net',
-            # Data science
-            'machine learning', 'deep learning', 'data analysis', 'statistics', 'r', 'pandas', 'numpy', 'tensorflow', 'pytorch',
-            'scikit-learn', 'tableau', 'power bi', 'sql', 'database', 'big data', 'hadoop', 'spark',
-            # Cloud
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'devops', 'ci/cd', 'jenkins',
-            # Other technical skills
-            'git', 'rest api', 'graphql', 'microservices', 'agile', 'scrum', 'jira',
-            # Soft skills
-            'leadership', 'communication', 'teamwork', 'problem solving', 'critical thinking', 'time management',
-            'project management', 'creativity', 'adaptability', 'collaboration'
-        ]
-        
-        # Create regex pattern for skills
-        pattern = re.compile(r'\b(' + '|'.join(skill_keywords) + r')\b', re.IGNORECASE)
-        
-        # Find all matches
-        skill_matches = pattern.findall(text.lower())
-        
-        # Count occurrences of each skill
-        skill_counts = {}
-        for skill in skill_matches:
-            if skill in skill_counts:
-                skill_counts[skill] += 1
-            else:
-                skill_counts[skill] = 1
+        # Count occurrences of each skill, under its canonical taxonomy name
+        skill_counts = get_taxonomy().matcher.count(text)
         
         # Sort skills by frequency
         sorted_skills = sorted(skill_counts.items(), key=lambda x: x[1], reverse=True)
@@ -104,69 +180,84 @@ class ResumeParser:
             'skill_counts': skill_counts
         }
     
-    def extract_education(self, text):
+    def split_sentences(self, text):
+        """Split text into stripped sentences at sentence punctuation, line breaks and bullets"""
+        sentences = []
+        for sentence in SENTENCE_BOUNDARY.split(text):
+            sentence = sentence.strip(SENTENCE_STRIP)
+            if sentence:
+                sentences.append(sentence)
+        return sentences
+    
+    def classify_sentences(self, text):
+        """Sort sentences into education and experience lists in a single pass over the text"""
+        education_sentences = []
+        experience_sentences = []
+        for sentence in self.split_sentences(text):
+            # A sentence can mention both, e.g. "Graduated and joined the company"
+            words = set(WORD_PATTERN.findall(sentence.lower()))
+            if not words.isdisjoint(EDUCATION_KEYWORDS):
+                education_sentences.append(sentence)
+            if not words.isdisjoint(EXPERIENCE_KEYWORDS):
+                experience_sentences.append(sentence)
+        return education_sentences, experience_sentences
+    
+    def find_education_sentences(self, text):
+        """Find sentences in resume text that mention education"""
+        return self.classify_sentences(text)[0]
+    
+    def find_experience_sentences(self, text):
+        """Find sentences in resume text that mention work experience"""
+        return self.classify_sentences(text)[1]
+    
+    def extract_entities(self, sentences):
+        """Run NER over sentences in one batched pass, keyed by sentence"""
+        # Duplicate sentences only need to go through the pipeline once
+        unique_sentences = list(dict.fromkeys(sentences))
+        
+        # Only doc.ents is read, so skip the tagger, parser, lemmatizer, etc.
+        pipeline = nlp.get_nlp()
+        disabled = [name for name in pipeline.pipe_names if name not in NER_PIPES]
+        
+        entities = {}
+        for sentence, doc in zip(unique_sentences, pipeline.pipe(unique_sentences, disable=disabled)):
+            entities[sentence] = [(ent.text, ent.label_) for ent in doc.ents]
+        return entities
+    
+    def extract_education(self, text, sentences=None, entities=None):
         """Extract education information from resume text"""
-        # Education related keywords
-        education_keywords = [
-            'bachelor', 'master', 'phd', 'doctorate', 'degree', 'bs', 'ms', 'ba', 'ma', 'mba',
-            'university', 'college', 'institute', 'school', 'academy', 'gpa', 'major', 'minor',
-            'graduated', 'graduation', 'diploma', 'certificate'
-        ]
-        
-        # Create regex pattern for education
-        pattern = re.compile(r'([^.]*(' + '|'.join(education_keywords) + r')[^.]*)\.',
-                            re.IGNORECASE)
+        education_info = sentences if sentences is not None else self.find_education_sentences(text)
+        if entities is None:
+            entities = self.extract_entities(education_info)
         
-        # Find all matches
-        education_matches = pattern.findall(text)
-        
-        # Extract education sentences
-        education_info = [match[0].strip() for match in education_matches]
-        
-        # Process with spaCy to extract organizations
+        # Collect organizations recognized by spaCy
         education_orgs = []
         for edu in education_info:
-            doc = nlp(edu)
-            for ent in doc.ents:
-                if ent.label_ == 'ORG':
-                    education_orgs.append(ent.text)
+            for ent_text, ent_label in entities[edu]:
+                if ent_label == 'ORG':
+                    education_orgs.append(ent_text)
         
         return {
             'education_sentences': education_info,
             'institutions': list(set(education_orgs))
         }
     
-    def extract_experience(self, text):
+    def extract_experience(self, text, sentences=None, entities=None):
         """Extract work experience information from resume text"""
-        # Experience related keywords
-        experience_keywords = [
-            'experience', 'work', 'employment', 'job', 'career', 'position', 'role',
-            'company', 'organization', 'firm', 'employer', 'corporation', 'enterprise',
-            'years', 'months', 'responsibilities', 'duties', 'tasks', 'achievements',
-            'managed', 'led', 'developed', 'created', 'implemented', 'designed', 'coordinated'
-        ]
-        
-        # Create regex pattern for experience
-        pattern = re.compile(r'([^.]*(' + '|'.join(experience_keywords) + r')[^.]*)\.',
-                            re.IGNORECASE)
+        experience_info = sentences if sentences is not None else self.find_experience_sentences(text)
+        if entities is None:
+            entities = self.extract_entities(experience_info)
         
-        # Find all matches
-        experience_matches = pattern.findall(text)
-        
-        # Extract experience sentences
-        experience_info = [match[0].strip() for match in experience_matches]
-        
-        # Process with spaCy to extract organizations and dates
+        # Collect organizations and dates recognized by spaCy
         experience_orgs = []
         experience_dates = []
         
         for exp in experience_info:
-            doc = nlp(exp)
-            for ent in doc.ents:
-                if ent.label_ == 'ORG':
-                    experience_orgs.append(ent.text)
-                elif ent.label_ == 'DATE':
-                    experience_dates.append(ent.text)
+            for ent_text, ent_label in entities[exp]:
+                if ent_label == 'ORG':
+                    experience_orgs.append(ent_text)
+                elif ent_label == 'DATE':
+                    experience_dates.append(ent_text)
         
         # Try to extract job titles using patterns
         job_title_pattern = re.compile(r'\b(Senior|Junior|Lead|Chief|Principal|Director|Manager|Engineer|Developer|Analyst|Consultant|Specialist|Coordinator|Administrator|Assistant|Officer|Supervisor|Head|Architect)\s+[A-Za-z]+\b', re.IGNORECASE)
@@ -203,12 +294,29 @@ class ResumeParser:
     def parse_resume(self, file_path):
         """Parse resume and extract all relevant information"""
         # Extract text from resume
-        text = self.extract_text(file_path)
+        with timing.stage('extract_text'):
+            if file_path.endswith('.pdf'):
+                # Keep the pages to report how many were read
+                pages = list(self.iter_pdf_pages(file_path))
+                text = ''.join(pages)
+            else:
+                pages = None
+                text = self.extract_text(file_path)
         
         # Extract information
-        skills = self.extract_skills(text)
-        education = self.extract_education(text)
-        experience = self.extract_experience(text)
+        with timing.stage('extract_skills'):
+            skills = self.extract_skills(text)
+        
+        # Share a single NER pass between the education and experience extractors
+        with timing.stage('find_sentences'):
+            education_sentences, experience_sentences = self.classify_sentences(text)
+        with timing.stage('ner'):
+            entities = self.extract_entities(education_sentences + experience_sentences)
+        
+        with timing.stage('extract_education'):
+            education = self.extract_education(text, education_sentences, entities)
+        with timing.stage('extract_experience'):
+            experience = self.extract_experience(text, experience_sentences, entities)
         
         # Generate summary
         summary = self.generate_summary(skills, education, experience)
@@ -218,71 +326,57 @@ class ResumeParser:
             'education': education,
             'experience': experience,
             'summary': summary,
-            'full_text': text
+            'full_text': text,
+            'stats': {
+                'page_count': len(pages) if pages is not None else None,
+                'text_length': len(text)
+            }
         }
 
 
 class CareerAdvisor:
     """Class to provide career advice based on resume analysis"""
     
-    def __init__(self):
-        # Career paths with required skills
-        self.career_paths = {
-            'Software Developer': [
-                'python', 'java', 'javascript', 'c++', 'c#', 'html', 'css', 'sql', 'git', 'agile'
-            ],
-            'Data Scientist': [
-                'python', 'r', 'sql', 'machine learning', 'statistics', 'pandas', 'numpy', 'tensorflow', 'data analysis'
-            ],
-            'Web Developer': [
-                'html', 'css', 'javascript', 'react', 'angular', 'vue', 'node.js', 'php', 'django', 'flask'
-            ],
-            'DevOps Engineer': [
-                'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'jenkins', 'ci/cd', 'git', 'linux', 'bash'
-            ],
-            'Product Manager': [
-                'agile', 'scrum', 'jira', 'product development', 'user experience', 'market research', 'leadership', 'communication'
-            ],
-            'UX/UI Designer': [
-                'user experience', 'user interface', 'wireframing', 'prototyping', 'figma', 'sketch', 'adobe xd', 'design thinking'
-            ],
-            'Cybersecurity Specialist': [
-                'network security', 'encryption', 'firewall', 'penetration testing', 'security auditing', 'risk assessment', 'compliance'
-            ],
-            'AI Engineer': [
-                'machine learning', 'deep learning', 'neural networks', 'tensorflow', 'pytorch', 'nlp', 'computer vision', 'python'
-            ],
-            'Cloud Architect': [
-                'aws', 'azure', 'gcp', 'cloud migration', 'serverless', 'microservices', 'docker', 'kubernetes'
-            ],
-            'Business Analyst': [
-                'data analysis', 'requirements gathering', 'sql', 'tableau', 'power bi', 'excel', 'business intelligence', 'communication'
-            ]
-        }
+    @property
+    def career_paths(self):
+        """Career paths with required skills, from the skill taxonomy"""
+        return get_taxonomy().career_paths
     
     def calculate_career_matches(self, skills):
         """Calculate match percentage for different career paths"""
-        user_skills = [skill.lower() for skill in skills['all_skills']]
-        
-        career_matches = {}
-        for career, required_skills in self.career_paths.items():
-            # Count matching skills
-            matching_skills = [skill for skill in required_skills if skill in user_skills]
-            match_percentage = (len(matching_skills) / len(required_skills)) * 100
-            
-            # Missing skills
-            missing_skills = [skill for skill in required_skills if skill not in user_skills]
+        return self.calculate_career_matches_batch([skills])[0]
+    
+    def calculate_career_matches_batch(self, skills_list):
+        """Calculate career matches for many resumes' skills in one pass"""
+        from .career_matrix import get_career_matrix
+        
+        matrix = get_career_matrix()
+        user_skills = [[skill.lower() for skill in skills['all_skills']] for skills in skills_list]
+        percentages = matrix.match_percentages(user_skills)
+        
+        results = []
+        for skill_set, row in zip(map(set, user_skills), percentages.tolist()):
+            career_matches = []
+            for career, required_skills, match_percentage in zip(matrix.careers, matrix.required_skills, row):
+                career_matches.append((career, {
+                    'match_percentage': round(match_percentage, 2),
+                    'matching_skills': [skill for skill in required_skills if skill in skill_set],
+                    'missing_skills': [skill for skill in required_skills if skill not in skill_set]
+                }))
             
-            career_matches[career] = {
-                'match_percentage': round(match_percentage, 2),
-                'matching_skills': matching_skills,
-                'missing_skills': missing_skills
-            }
+            # Sort by match percentage
+            career_matches.sort(key=lambda x: x[1]['match_percentage'], reverse=True)
+            results.append(career_matches)
         
-        # Sort by match percentage
-        sorted_matches = sorted(career_matches.items(), key=lambda x: x[1]['match_percentage'], reverse=True)
+        return results
+    
+    def score_careers(self, skills_list):
+        """Return a (resumes, careers) array of match percentages and the career names"""
+        from .career_matrix import get_career_matrix
         
-        return sorted_matches
+        matrix = get_career_matrix()
+        user_skills = [skills['all_skills'] for skills in skills_list]
+        return matrix.match_percentages(user_skills), matrix.careers
     
     def identify_strengths_weaknesses(self, resume_analysis):
         """Identify strengths and weaknesses based on resume analysis"""
@@ -326,10 +420,12 @@ class CareerAdvisor:
     def generate_career_advice(self, resume_analysis):
         """Generate career advice based on resume analysis"""
         # Calculate career matches
-        career_matches = self.calculate_career_matches(resume_analysis['skills'])
+        with timing.stage('career_matches'):
+            career_matches = self.calculate_career_matches(resume_analysis['skills'])
         
         # Identify strengths and weaknesses
-        strengths_weaknesses = self.identify_strengths_weaknesses(resume_analysis)
+        with timing.stage('strengths_weaknesses'):
+            strengths_weaknesses = self.identify_strengths_weaknesses(resume_analysis)
         
         # Get top 3 career paths
         top_careers = career_matches[:3]
@@ -385,16 +481,32 @@ class CareerAdvisor:
 class JobMatcher:
     """Class to match resume with job descriptions"""
     
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(stop_words='english')
+    def __init__(self, vectorizer=None):
+        # A vectorizer fitted over the whole corpus (see manage.py fit_matcher)
+        # is only used to transform; without one we fall back to fitting on
+        # the resume/job pair for every match
+        self.fitted = vectorizer is not None
+        self.vectorizer = vectorizer if vectorizer is not None else self.build_vectorizer()
+    
+    @staticmethod
+    def build_vectorizer(**options):
+        """Create an unfitted TF-IDF vectorizer with the matcher's settings"""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        
+        return TfidfVectorizer(stop_words='english', **options)
     
     def match_resume_to_job(self, resume_text, job_description):
         """Match resume to job description using TF-IDF and cosine similarity"""
+        from sklearn.metrics.pairwise import cosine_similarity
+        
         # Create corpus with resume and job description
         corpus = [resume_text, job_description]
         
         # Vectorize the corpus
-        tfidf_matrix = self.vectorizer.fit_transform(corpus)
+        if self.fitted:
+            tfidf_matrix = self.vectorizer.transform(corpus)
+        else:
+            tfidf_matrix = self.vectorizer.fit_transform(corpus)
         
         # Calculate cosine similarity
         cosine_sim = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
@@ -404,13 +516,21 @@ class JobMatcher:
         
         return match_percentage
     
+    def match_resume_to_vector(self, resume_text, job_vector):
+        """Match resume to an already vectorized job description (fitted vectorizer only)"""
+        from sklearn.metrics.pairwise import cosine_similarity
+        
+        resume_vector = self.vectorizer.transform([resume_text])
+        cosine_sim = cosine_similarity(resume_vector, job_vector)[0][0]
+        
+        return round(cosine_sim * 100, 2)
+    
     def extract_job_skills(self, job_description):
         """Extract skills from job description"""
-        # Use the same skill extraction logic as in ResumeParser
-        parser = ResumeParser()
-        skills = parser.extract_skills(job_description)
+        # Use the same skill matcher as ResumeParser, sorted by frequency
+        skill_counts = get_taxonomy().matcher.count(job_description)
         
-        return skills['all_skills']
+        return sorted(skill_counts, key=skill_counts.get, reverse=True)
     
     def identify_matching_missing_skills(self, resume_skills, job_skills):
         """Identify matching and missing skills"""
@@ -428,17 +548,24 @@ class JobMatcher:
             'missing_skills': missing_skills
         }
     
-    def match_job(self, resume_analysis, job_title, company, job_description):
+    def match_job(self, resume_analysis, job_title, company, job_description, job_skills=None, job_vector=None):
         """Match resume to job and provide detailed analysis"""
-        # Calculate match percentage
-        match_percentage = self.match_resume_to_job(resume_analysis['full_text'], job_description)
+        # Calculate match percentage, reusing the job's TF-IDF vector when it was stored
+        with timing.stage('tfidf_match'):
+            if job_vector is not None and self.fitted:
+                match_percentage = self.match_resume_to_vector(resume_analysis['full_text'], job_vector)
+            else:
+                match_percentage = self.match_resume_to_job(resume_analysis['full_text'], job_description)
         
-        # Extract skills from job description
-        job_skills = self.extract_job_skills(job_description)
+        # Extract skills from job description, unless they were stored
+        if job_skills is None:
+            with timing.stage('job_skills'):
+                job_skills = self.extract_job_skills(job_description)
         
         # Identify matching and missing skills
-        skills_analysis = self.identify_matching_missing_skills(
-            resume_analysis['skills']['all_skills'], job_skills)
+        with timing.stage('skill_gap'):
+            skills_analysis = self.identify_matching_missing_skills(
+                resume_analysis['skills']['all_skills'], job_skills)
         
         return {
             'job_title': job_title,
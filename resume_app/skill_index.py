@@ -0,0 +1,195 @@
+"""
+In-memory inverted index over ResumeSkill for "find candidates with skills".
+
+For every skill the index holds a posting list: the ids of the resumes that
+mention it (sorted) and how many times each does. AND/OR queries then come
+down to a few numpy operations over those arrays instead of a GROUP BY over
+millions of rows. The index is built from the ResumeSkill table once per
+process and brought up to date at most every ``RESUME_SKILL_INDEX_REFRESH``
+seconds: new rows are appended, and any deletion triggers a rebuild.
+"""
+
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Count, Q
+
+from .models import ResumeSkill
+from .taxonomy import get_taxonomy
+
+# Ranking key: matched skill count in the high bits, total mentions below
+_MATCHED_SHIFT = 40
+
+_lock = threading.Lock()
+_index = None
+_last_checked = 0.0
+
+
+class SkillIndex:
+    """Posting lists of (resume ids, skill counts), keyed by canonical skill"""
+
+    def __init__(self):
+        self.postings = {}
+        # Highest ResumeSkill id and number of rows loaded, for refreshing
+        self.max_id = 0
+        self.count = 0
+        # Length of the per-query score arrays (one slot per resume id)
+        self.size = 0
+
+    def load_rows(self, queryset):
+        """Merge the ResumeSkill rows in queryset into the posting lists"""
+        grouped = {}
+        max_id = self.max_id
+        count = 0
+        for row_id, resume_id, skill, skill_count in queryset.values_list(
+                'id', 'resume_id', 'skill', 'count').iterator(chunk_size=10000):
+            resume_ids, counts = grouped.setdefault(skill, ([], []))
+            resume_ids.append(resume_id)
+            counts.append(skill_count)
+            max_id = max(max_id, row_id)
+            count += 1
+
+        postings = {}
+        size = self.size
+        for skill, (resume_ids, counts) in grouped.items():
+            resume_ids = np.array(resume_ids, dtype=np.int64)
+            counts = np.array(counts, dtype=np.int32)
+            if skill in self.postings:
+                old_ids, old_counts = self.postings[skill]
+                resume_ids = np.concatenate([old_ids, resume_ids])
+                counts = np.concatenate([old_counts, counts])
+            order = np.argsort(resume_ids, kind='stable')
+            postings[skill] = (resume_ids[order], counts[order])
+            size = max(size, int(resume_ids[order[-1]]) + 1)
+
+        # Searches read without the lock: grow the score arrays before any
+        # posting list can refer to the new resume ids
+        self.size = size
+        self.postings.update(postings)
+        self.max_id = max_id
+        self.count += count
+
+    def search(self, skills, match_all=True, limit=20):
+        """Return (total, [(resume_id, score, matched), ...]) for the best matches
+
+        score is the total number of mentions of the queried skills and
+        matched how many of them the resume has; results are ordered by
+        matched, then score, then resume id.
+        """
+        postings = [self.postings.get(skill) for skill in skills]
+        if match_all and (not postings or any(posting is None for posting in postings)):
+            return 0, []
+        postings = [posting for posting in postings if posting is not None]
+        if not postings:
+            return 0, []
+
+        size = self.size
+        matched = np.zeros(size, dtype=np.int16)
+        scores = np.zeros(size, dtype=np.int64)
+        for resume_ids, counts in postings:
+            # Each posting list holds a resume at most once, so plain
+            # fancy-index addition is safe here
+            matched[resume_ids] += 1
+            scores[resume_ids] += counts
+
+        if match_all:
+            # Every hit appears in the shortest posting list
+            shortest = min(postings, key=lambda posting: len(posting[0]))[0]
+            candidates = shortest[matched[shortest] == len(postings)]
+        else:
+            candidates = np.flatnonzero(matched)
+
+        total = len(candidates)
+        if total == 0 or limit <= 0:
+            return total, []
+
+        keys = (matched[candidates].astype(np.int64) << _MATCHED_SHIFT) | scores[candidates]
+        k = min(limit, total)
+        best = np.argpartition(-keys, k - 1)[:k]
+        best = best[np.lexsort((candidates[best], -keys[best]))]
+        return total, [
+            (int(candidates[i]), int(scores[candidates[i]]), int(matched[candidates[i]]))
+            for i in best
+        ]
+
+    def skill_counts(self, resume_id, skills):
+        """Return {skill: count} for the given skills found in one resume"""
+        found = {}
+        for skill in skills:
+            posting = self.postings.get(skill)
+            if posting is None:
+                continue
+            resume_ids, counts = posting
+            position = np.searchsorted(resume_ids, resume_id)
+            if position < len(resume_ids) and resume_ids[position] == resume_id:
+                found[skill] = int(counts[position])
+        return found
+
+
+def get_skill_index():
+    """Return the process-wide index, refreshing it if the check interval has passed"""
+    global _index, _last_checked
+    interval = getattr(settings, 'RESUME_SKILL_INDEX_REFRESH', 30)
+    if _index is not None and time.monotonic() - _last_checked < interval:
+        return _index
+
+    with _lock:
+        if _index is not None and time.monotonic() - _last_checked < interval:
+            return _index
+        index = _index
+        if index is None:
+            index = SkillIndex()
+            index.load_rows(ResumeSkill.objects.order_by('id'))
+        else:
+            stats = ResumeSkill.objects.aggregate(count=Count('id'), new=Count('id', filter=Q(id__gt=index.max_id)))
+            if stats['count'] != index.count + stats['new']:
+                # Rows were deleted (resumes removed or re-analyzed): start over
+                index = SkillIndex()
+                index.load_rows(ResumeSkill.objects.order_by('id'))
+            elif stats['new']:
+                index.load_rows(ResumeSkill.objects.filter(id__gt=index.max_id).order_by('id'))
+        _index = index
+        _last_checked = time.monotonic()
+        return index
+
+
+def search_skills(skills, match_all=True, limit=20):
+    """Find the resumes mentioning all (or any) of the given skills
+
+    Skill names and aliases are mapped to their canonical taxonomy names first.
+    Returns a dict with the canonical ``skills``, any ``unknown`` names, the
+    ``total`` number of matching resumes and the top ``results``, each with
+    its resume_id, score, matched count and per-skill counts.
+    """
+    taxonomy = get_taxonomy()
+    canonical = []
+    unknown = []
+    for skill in skills:
+        name = taxonomy.canonicalize(skill.strip())
+        if name is None:
+            unknown.append(skill.strip())
+        elif name not in canonical:
+            canonical.append(name)
+
+    if not canonical or (match_all and unknown):
+        # No resume can mention a skill the taxonomy doesn't know
+        return {'skills': canonical, 'unknown': unknown, 'total': 0, 'results': []}
+
+    index = get_skill_index()
+    total, hits = index.search(canonical, match_all=match_all, limit=limit)
+    return {
+        'skills': canonical,
+        'unknown': unknown,
+        'total': total,
+        'results': [
+            {
+                'resume_id': resume_id,
+                'score': score,
+                'matched': matched,
+                'skill_counts': index.skill_counts(resume_id, canonical),
+            }
+            for resume_id, score, matched in hits
+        ],
+    }
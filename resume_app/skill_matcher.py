@@ -0,0 +1,82 @@
+import re
+
+# Zero-width matches at every word boundary, found at C speed
+_BOUNDARY = re.compile(r'\b')
+
+# Trie key marking the end of a skill
+_END = None
+
+
+def _is_word_char(char):
+    """Same definition of a word character as the \\w regex class"""
+    return char.isalnum() or char == '_'
+
+
+class SkillMatcher:
+    """Match a fixed skill vocabulary against text in a single left-to-right scan
+
+    Skills are stored in a character trie built once up front. Matching only
+    starts at word boundaries and keeps the longest skill that also ends on a
+    word boundary, the same results as a ``\\b(skill1|skill2|...)\\b`` regex
+    without recompiling or backtracking through thousands of alternatives.
+    """
+
+    def __init__(self, skills, aliases=None):
+        self.root = {}
+        self.size = 0
+        for skill in skills:
+            self.add(skill)
+        for alias, skill in (aliases or {}).items():
+            self.add(alias, skill)
+
+    def add(self, term, skill=None):
+        """Add a term to the vocabulary, reported as skill when matched (default: itself)"""
+        node = self.root
+        for char in term.lower():
+            node = node.setdefault(char, {})
+        if _END not in node:
+            self.size += 1
+        node[_END] = (skill or term).lower()
+
+    def __len__(self):
+        return self.size
+
+    def _ends_on_boundary(self, text, end):
+        if end >= len(text):
+            return _is_word_char(text[end - 1])
+        return _is_word_char(text[end]) != _is_word_char(text[end - 1])
+
+    def iter_matches(self, text):
+        """Yield (start, end, skill) for each non-overlapping match in lowercased text"""
+        root = self.root
+        next_start = 0
+        for boundary in _BOUNDARY.finditer(text):
+            start = boundary.start()
+            if start < next_start or start >= len(text):
+                continue
+
+            node = root
+            best = None
+            position = start
+            while position < len(text):
+                node = node.get(text[position])
+                if node is None:
+                    break
+                position += 1
+                if _END in node and self._ends_on_boundary(text, position):
+                    best = (position, node[_END])
+
+            if best is not None:
+                next_start = best[0]
+                yield start, best[0], best[1]
+
+    def find_all(self, text):
+        """Return every skill mentioned in text, in order of appearance"""
+        return [skill for start, end, skill in self.iter_matches(text.lower())]
+
+    def count(self, text):
+        """Count skill mentions in text, keyed in order of first appearance"""
+        skill_counts = {}
+        for skill in self.find_all(text):
+            skill_counts[skill] = skill_counts.get(skill, 0) + 1
+        return skill_counts
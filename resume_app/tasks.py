@@ -0,0 +1,262 @@
+"""
+Background analysis of uploaded resumes.
+
+Parsing a resume (PDF extraction plus spaCy NER) is far too slow to run on the
+request thread, so views only enqueue work here. The backend that runs it is
+selected with the ``RESUME_ANALYSIS_BACKEND`` setting:
+
+- ``resume_app.tasks.DatabaseBackend`` records an ``AnalysisJob`` row that the
+  ``analysis_worker`` management command picks up.
+- ``resume_app.tasks.ImmediateBackend`` runs the analysis inline, which is
+  handy for tests and single-user development.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from . import parse_cache, timing
+from .models import AnalysisJob, ResumeAnalysis, ResumeAnalysisPayload, ResumeSkill, ResumeText
+from .resume_analyzer import ResumeParser
+from .utils import hash_file
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = 'resume_app.tasks.DatabaseBackend'
+
+_parser = None
+_backend = None
+
+
+def get_parser():
+    """Return the parser shared by every job run in this process"""
+    global _parser
+    if _parser is None:
+        _parser = ResumeParser(
+            max_pages=getattr(settings, 'RESUME_MAX_PAGES', None),
+            extraction_timeout=getattr(settings, 'RESUME_EXTRACTION_TIMEOUT', None),
+        )
+    return _parser
+
+
+def truncate_sentences(sentences):
+    """Cut a sentence list down to the storage budget, returning (sentences, truncated)"""
+    max_sentences = getattr(settings, 'RESUME_MAX_STORED_SENTENCES', None)
+    max_length = getattr(settings, 'RESUME_MAX_SENTENCE_LENGTH', None)
+    truncated = False
+    if max_sentences is not None and len(sentences) > max_sentences:
+        sentences = sentences[:max_sentences]
+        truncated = True
+    if max_length is not None and any(len(sentence) > max_length for sentence in sentences):
+        sentences = [sentence[:max_length] for sentence in sentences]
+        truncated = True
+    return sentences, truncated
+
+
+def analysis_fields(analysis_results):
+    """Map ResumeParser.parse_resume output onto ResumeAnalysis fields"""
+    # vectors imports numpy and scipy; only pay for them once there is something to store
+    from . import vectors
+
+    tfidf_vector, vector_version = vectors.vectorize_text(analysis_results.get('full_text'))
+    # Sentence lists go to ResumeAnalysisPayload (see payload_fields)
+    education = {key: value for key, value in analysis_results['education'].items()
+                 if key != 'education_sentences'}
+    experience = {key: value for key, value in analysis_results['experience'].items()
+                  if key != 'experience_sentences'}
+    return {
+        'skills': analysis_results['skills'],
+        'education': education,
+        'experience': experience,
+        'summary': analysis_results['summary'],
+        'tfidf_vector': tfidf_vector,
+        'vector_version': vector_version,
+        'vector_updated_at': timezone.now(),
+    }
+
+
+def payload_fields(analysis_results):
+    """Map ResumeParser.parse_resume output onto ResumeAnalysisPayload fields"""
+    education_sentences, education_truncated = truncate_sentences(
+        analysis_results['education'].get('education_sentences', []))
+    experience_sentences, experience_truncated = truncate_sentences(
+        analysis_results['experience'].get('experience_sentences', []))
+    return {
+        'education_sentences': education_sentences,
+        'experience_sentences': experience_sentences,
+        'truncated': education_truncated or experience_truncated,
+    }
+
+
+def stats_fields(analysis_results, timer=None):
+    """Map parse statistics (and the timer around the parse, if any) onto ResumeAnalysis fields"""
+    stats = analysis_results.get('stats') or {}
+    return {
+        'parse_duration': timer.timings.get('parse') if timer is not None else None,
+        'parse_timings': timer.as_milliseconds() if timer is not None else {},
+        'page_count': stats.get('page_count'),
+        'text_length': stats.get('text_length', len(analysis_results.get('full_text') or '')),
+    }
+
+
+def skill_rows(resume, analysis_results):
+    """Build the ResumeSkill rows for a resume's skill counts"""
+    return [ResumeSkill(resume=resume, skill=skill, count=count)
+            for skill, count in analysis_results['skills']['skill_counts'].items()]
+
+
+def store_analysis(resume, analysis_results, timer=None):
+    """Create or replace the ResumeAnalysis, payload, skill index rows and extracted text of a resume"""
+    with timing.stage('store'), transaction.atomic():
+        analysis, created = ResumeAnalysis.objects.update_or_create(
+            resume=resume,
+            defaults={**analysis_fields(analysis_results), **stats_fields(analysis_results, timer)}
+        )
+        ResumeAnalysisPayload.objects.update_or_create(
+            resume=resume,
+            defaults=payload_fields(analysis_results)
+        )
+        ResumeSkill.objects.filter(resume=resume).delete()
+        ResumeSkill.objects.bulk_create(skill_rows(resume, analysis_results))
+        full_text = analysis_results.get('full_text') or ''
+        ResumeText.objects.update_or_create(
+            resume=resume,
+            defaults={
+                'compressed_text': ResumeText.compress(full_text),
+                'text_length': len(full_text),
+            }
+        )
+    return analysis
+
+
+def run_analysis(resume):
+    """Parse a resume (or reuse a cached parse of the same file) and store its ResumeAnalysis"""
+    if not resume.content_hash:
+        resume.content_hash = hash_file(resume.file.path)
+        resume.save(update_fields=['content_hash'])
+
+    with timing.collect() as timer, timing.stage('parse'):
+        analysis_results = parse_cache.parse_resume_cached(get_parser(), resume.file.path, resume.content_hash)
+    return store_analysis(resume, analysis_results, timer)
+
+
+def process_job(job):
+    """Run a claimed job and record its outcome"""
+    try:
+        run_analysis(job.resume)
+    except Exception as e:
+        logger.exception('Analysis job %s failed', job.pk)
+        job.status = AnalysisJob.STATUS_FAILED
+        job.error = str(e)
+    else:
+        job.status = AnalysisJob.STATUS_DONE
+        job.error = ''
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_at'])
+    return job
+
+
+def claim_next_job():
+    """Atomically move the oldest pending or stale running job to running and return it
+
+    A job left running for longer than RESUME_JOB_TIMEOUT seconds belongs to a
+    worker that died and is claimed again, until it has been started
+    RESUME_JOB_MAX_ATTEMPTS times; then it is marked failed.
+    """
+    now = timezone.now()
+    stale = Q(status=AnalysisJob.STATUS_RUNNING,
+              started_at__lt=now - timedelta(seconds=getattr(settings, 'RESUME_JOB_TIMEOUT', 600)))
+    AnalysisJob.objects.filter(stale, attempts__gte=getattr(settings, 'RESUME_JOB_MAX_ATTEMPTS', 3)).update(
+        status=AnalysisJob.STATUS_FAILED,
+        error='The analysis did not finish, please try again',
+        finished_at=now,
+    )
+
+    candidates = (AnalysisJob.objects
+                  .filter(Q(status=AnalysisJob.STATUS_PENDING) | stale)
+                  .order_by('created_at')
+                  .values_list('pk', 'status', 'started_at')[:10])
+    for pk, status, started_at in candidates:
+        # The conditional update is the lock: only one worker can win it
+        claimed = AnalysisJob.objects.filter(pk=pk, status=status, started_at=started_at).update(
+            status=AnalysisJob.STATUS_RUNNING,
+            started_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return AnalysisJob.objects.select_related('resume').get(pk=pk)
+    return None
+
+
+class BaseBackend:
+    """Interface for analysis queue backends"""
+
+    def enqueue(self, resume):
+        raise NotImplementedError
+
+
+class DatabaseBackend(BaseBackend):
+    """Queue jobs in the database for the analysis_worker command"""
+
+    def enqueue(self, resume):
+        job, created = AnalysisJob.objects.get_or_create(resume=resume)
+        return job
+
+
+class ImmediateBackend(BaseBackend):
+    """Run analysis synchronously in the calling process"""
+
+    def enqueue(self, resume):
+        job, created = AnalysisJob.objects.get_or_create(resume=resume)
+        if job.status == AnalysisJob.STATUS_PENDING:
+            job.status = AnalysisJob.STATUS_RUNNING
+            job.started_at = timezone.now()
+            job.attempts += 1
+            job.save(update_fields=['status', 'started_at', 'attempts'])
+            process_job(job)
+        return job
+
+
+def get_backend():
+    """Return the configured queue backend instance"""
+    global _backend
+    if _backend is None:
+        backend_path = getattr(settings, 'RESUME_ANALYSIS_BACKEND', DEFAULT_BACKEND)
+        _backend = import_string(backend_path)()
+    return _backend
+
+
+def enqueue_analysis(resume):
+    """Queue a resume for analysis, returning its AnalysisJob"""
+    # A file we have already parsed is analyzed straight away, skipping the queue
+    with timing.collect() as timer, timing.stage('parse'):
+        analysis_results = parse_cache.get_cached(resume.content_hash)
+    if analysis_results is not None:
+        store_analysis(resume, analysis_results, timer)
+        now = timezone.now()
+        job, created = AnalysisJob.objects.update_or_create(
+            resume=resume,
+            defaults={
+                'status': AnalysisJob.STATUS_DONE,
+                'error': '',
+                'started_at': now,
+                'finished_at': now,
+            }
+        )
+        return job
+    return get_backend().enqueue(resume)
+
+
+def get_analysis_status(resume):
+    """Return the analysis status of a resume as a plain string"""
+    if ResumeAnalysis.objects.filter(resume=resume).exists():
+        return AnalysisJob.STATUS_DONE
+    job = AnalysisJob.objects.filter(resume=resume).only('status').first()
+    if job is None:
+        return 'missing'
+    return job.status
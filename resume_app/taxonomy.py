@@ -0,0 +1,143 @@
+"""
+Skill taxonomy shared by ResumeParser, JobMatcher and CareerAdvisor.
+
+Skills, their aliases and the skills each career path requires live in a
+JSON file (``data/skill_taxonomy.json`` by default, or the path in the
+``RESUME_SKILL_TAXONOMY`` setting). The file is indexed into dictionaries and
+a SkillMatcher when loaded, and reloaded automatically when it changes on disk.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+from .skill_matcher import SkillMatcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), 'data', 'skill_taxonomy.json')
+
+# Minimum number of seconds between checks of the file's modification time
+RELOAD_CHECK_INTERVAL = 2.0
+
+_lock = threading.Lock()
+_taxonomy = None
+_last_checked = 0.0
+
+
+class SkillTaxonomy:
+    """In-memory index over a loaded taxonomy file"""
+
+    def __init__(self, data, content_hash=''):
+        self.version = data.get('version', '')
+        self.content_hash = content_hash
+        # (path, mtime, size) of the file this was loaded from
+        self.signature = None
+
+        # Canonical skill name -> category
+        self.categories = {}
+        for category, skills in data.get('skills', {}).items():
+            for skill in skills:
+                self.categories[skill.lower()] = category
+
+        # Any known spelling (canonical names included) -> canonical name
+        self.aliases = {skill: skill for skill in self.categories}
+        for alias, skill in data.get('aliases', {}).items():
+            skill = skill.lower()
+            if skill not in self.categories:
+                raise ValueError(f"Alias '{alias}' refers to unknown skill '{skill}'")
+            self.aliases[alias.lower()] = skill
+
+        self.career_paths = {}
+        for career, skills in data.get('career_paths', {}).items():
+            unknown = [skill for skill in skills if skill.lower() not in self.categories]
+            if unknown:
+                raise ValueError(f"Career path '{career}' requires unknown skills: {', '.join(unknown)}")
+            self.career_paths[career] = [skill.lower() for skill in skills]
+
+        self.matcher = SkillMatcher(self.categories, self.aliases)
+
+    @classmethod
+    def from_file(cls, path):
+        """Load and index a taxonomy JSON file"""
+        with open(path, 'rb') as file:
+            raw = file.read()
+        return cls(json.loads(raw), hashlib.sha256(raw).hexdigest())
+
+    @property
+    def skills(self):
+        return list(self.categories)
+
+    def __contains__(self, skill):
+        return skill.lower() in self.aliases
+
+    def __len__(self):
+        return len(self.categories)
+
+    def canonicalize(self, skill):
+        """Return the canonical name for a skill or alias, or None if unknown"""
+        return self.aliases.get(skill.lower())
+
+    def category(self, skill):
+        """Return the category of a skill or alias, or None if unknown"""
+        canonical = self.canonicalize(skill)
+        return self.categories.get(canonical) if canonical else None
+
+
+def get_taxonomy_path():
+    """Return the taxonomy file path from settings, falling back to the bundled file"""
+    if settings.configured:
+        return str(getattr(settings, 'RESUME_SKILL_TAXONOMY', DEFAULT_TAXONOMY_PATH))
+    return DEFAULT_TAXONOMY_PATH
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+def reload_taxonomy():
+    """Load the taxonomy file unconditionally and make it current"""
+    global _taxonomy, _last_checked
+    path = get_taxonomy_path()
+    with _lock:
+        signature = _file_signature(path)
+        taxonomy = SkillTaxonomy.from_file(path)
+        taxonomy.signature = signature
+        # Keep the existing object when the content did not actually change
+        if _taxonomy is None or _taxonomy.content_hash != taxonomy.content_hash:
+            _taxonomy = taxonomy
+        else:
+            _taxonomy.signature = signature
+        _last_checked = time.monotonic()
+        return _taxonomy
+
+
+def get_taxonomy():
+    """Return the current taxonomy, reloading it if the file changed on disk"""
+    global _last_checked
+    taxonomy = _taxonomy
+    if taxonomy is None:
+        return reload_taxonomy()
+
+    now = time.monotonic()
+    if now - _last_checked < RELOAD_CHECK_INTERVAL:
+        return taxonomy
+    _last_checked = now
+
+    try:
+        signature = _file_signature(get_taxonomy_path())
+    except OSError:
+        # Keep serving the last good taxonomy if the file is briefly missing
+        return taxonomy
+    if signature != taxonomy.signature:
+        try:
+            return reload_taxonomy()
+        except (OSError, ValueError):
+            logger.exception('Could not reload skill taxonomy, keeping version %s', taxonomy.version)
+    return taxonomy
@@ -1,3 +1,1445 @@
-from django.test import TestCase
+import hashlib
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import zipfile
+import zlib
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import docx
+import numpy as np
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from scipy import sparse
+
+from . import (benchmark, career_matrix, executor, job_descriptions, matcher_store, nlp, pagination, parse_cache,
+               skill_index, tasks, taxonomy, timing, uploads, vectors)
+from .forms import ResumeUploadForm
+from .models import AnalysisJob, JobDescription, JobMatch, Resume, ResumeAnalysis, ResumeSkill, ResumeText
+from .resume_analyzer import CareerAdvisor, JobMatcher, ResumeParser
+from .skill_matcher import SkillMatcher
+from .uploads import ResumeUploadHandler
+
+
+class QueryPlanTests(TestCase):
+    """The hot lookups must be served by indexes, not table scans"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('planner', 'planner@example.com', 'password')
+        cls.resume = Resume.objects.create(user=cls.user, title='Resume', file='resumes/resume.pdf',
+                                           content_hash='0' * 64)
+        cls.job_match = JobMatch.objects.create(resume=cls.resume, job_title='Engineer', match_percentage=50.0)
+
+    def explain(self, queryset):
+        if connection.vendor == 'postgresql':
+            # The test tables are tiny, so stop the planner preferring a sequential scan
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = self.explain(queryset)
+        self.assertIn(index_name, plan, f'Expected {index_name} in query plan:\n{plan}')
+        if connection.vendor == 'sqlite':
+            # The index must also provide the ordering
+            self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', plan, plan)
+        return plan
+
+    @skipUnless(connection.vendor in ('sqlite', 'postgresql'), 'Query plans checked on SQLite and PostgreSQL')
+    def test_user_resumes_newest_first(self):
+        self.assertUsesIndex(
+            Resume.objects.filter(user=self.user).order_by('-uploaded_at'),
+            'resume_user_uploaded_idx')
+
+    @skipUnless(connection.vendor in ('sqlite', 'postgresql'), 'Query plans checked on SQLite and PostgreSQL')
+    def test_dashboard_keyset_page(self):
+        resumes = Resume.objects.filter(user=self.user).for_dashboard()
+        cursor = pagination.encode_cursor(self.resume.uploaded_at, self.resume.pk)
+        for page_cursor in (None, cursor):
+            with self.subTest(cursor=page_cursor):
+                # The page the dashboard fetches, annotations included
+                plan = self.assertUsesIndex(pagination.keyset_filter(resumes, page_cursor, 'uploaded_at')[:26],
+                                            'resume_user_uploaded_idx')
+                if connection.vendor == 'sqlite':
+                    self.assertNotIn('TEMP B-TREE', plan, plan)
+
+    @skipUnless(connection.vendor in ('sqlite', 'postgresql'), 'Query plans checked on SQLite and PostgreSQL')
+    def test_resume_job_matches_newest_first(self):
+        self.assertUsesIndex(
+            JobMatch.objects.filter(resume=self.resume).order_by('-created_at'),
+            'jobmatch_resume_created_idx')
+
+    @skipUnless(connection.vendor in ('sqlite', 'postgresql'), 'Query plans checked on SQLite and PostgreSQL')
+    def test_resume_by_content_hash(self):
+        self.assertUsesIndex(
+            Resume.objects.filter(content_hash=self.resume.content_hash),
+            'resume_content_hash_idx')
+
+    @skipUnless(connection.vendor in ('sqlite', 'postgresql'), 'Query plans checked on SQLite and PostgreSQL')
+    def test_job_match_owned_by_user(self):
+        plan = self.explain(JobMatch.objects.filter(id=self.job_match.id, resume__user=self.user))
+        if connection.vendor == 'sqlite':
+            self.assertIn('INTEGER PRIMARY KEY', plan, plan)
+            self.assertNotIn('SCAN', plan, plan)
+        else:
+            self.assertIn('resume_app_jobmatch_pkey', plan, plan)
+
+
+class ClaimJobTests(TestCase):
+    """Jobs whose worker died are claimed again, up to the attempt limit"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('worker', 'worker@example.com', 'password')
+        cls.resume = Resume.objects.create(user=cls.user, title='Resume', file='resumes/resume.pdf')
+
+    def create_job(self, started_minutes_ago, attempts):
+        return AnalysisJob.objects.create(
+            resume=self.resume, status=AnalysisJob.STATUS_RUNNING, attempts=attempts,
+            started_at=timezone.now() - timedelta(minutes=started_minutes_ago))
+
+    @override_settings(RESUME_JOB_TIMEOUT=600, RESUME_JOB_MAX_ATTEMPTS=3)
+    def test_running_job_is_left_alone(self):
+        self.create_job(started_minutes_ago=5, attempts=1)
+        self.assertIsNone(tasks.claim_next_job())
+
+    @override_settings(RESUME_JOB_TIMEOUT=600, RESUME_JOB_MAX_ATTEMPTS=3)
+    def test_stale_job_is_claimed_again(self):
+        job = self.create_job(started_minutes_ago=15, attempts=1)
+        claimed = tasks.claim_next_job()
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual(claimed.status, AnalysisJob.STATUS_RUNNING)
+        self.assertEqual(claimed.attempts, 2)
+        self.assertGreater(claimed.started_at, job.started_at)
+
+    @override_settings(RESUME_JOB_TIMEOUT=600, RESUME_JOB_MAX_ATTEMPTS=3)
+    def test_stale_job_fails_after_max_attempts(self):
+        job = self.create_job(started_minutes_ago=15, attempts=3)
+        self.assertIsNone(tasks.claim_next_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, AnalysisJob.STATUS_FAILED)
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(tasks.get_analysis_status(self.resume), AnalysisJob.STATUS_FAILED)
+
+
+class SkillMatcherTests(SimpleTestCase):
+    """SkillMatcher must find what the alternation regex it replaced found"""
+
+    # The vocabulary and pattern extract_skills used before SkillMatcher
+    PREVIOUS_KEYWORDS = [
+        'python', 'java', 'javascript', r'c\+\+', 'c#', 'ruby', 'php', 'swift', 'kotlin', 'go', 'rust',
+        'html', 'css', 'react', 'angular', 'vue', r'node\.js', 'express', 'django', 'flask', 'spring', r'asp\.net',
+        'machine learning', 'deep learning', 'data analysis', 'statistics', 'r', 'pandas', 'numpy', 'tensorflow',
+        'pytorch', 'scikit-learn', 'tableau', 'power bi', 'sql', 'database', 'big data', 'hadoop', 'spark',
+        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'devops', 'ci/cd', 'jenkins',
+        'git', 'rest api', 'graphql', 'microservices', 'agile', 'scrum', 'jira',
+        'leadership', 'communication', 'teamwork', 'problem solving', 'critical thinking', 'time management',
+        'project management', 'creativity', 'adaptability', 'collaboration',
+    ]
+
+    CASES = [
+        ('Python, Java and JavaScript; not Javanese', ['python', 'java', 'javascript']),
+        # A skill ending in punctuation needs a word character after it for \b
+        ('C++ and C# developer', []),
+        ('C++11, C#7 and c++/cli', ['c++', 'c#']),
+        ('Node.js, node.jsx and nodejs', ['node.js']),
+        ('ASP.NET Core, asp.network', ['asp.net']),
+        ('CI/CD pipelines, ci/cdk and ci / cd', ['ci/cd']),
+        ('gitlab, git, golang, go-to', ['git', 'go']),
+        ('Scikit-Learn, scikit', ['scikit-learn']),
+        # Multi-word skills: matches never overlap
+        ('machine learning and deep learning', ['machine learning', 'deep learning']),
+        ('big data analysis', ['big data']),
+        ('data analysis, statistics and R', ['data analysis', 'statistics', 'r']),
+        ('R, rest api and rest apis', ['r', 'rest api']),
+        ('Power BI, power bill', ['power bi']),
+    ]
+
+    def test_matches_previous_regex(self):
+        pattern = re.compile(r'\b(' + '|'.join(self.PREVIOUS_KEYWORDS) + r')\b', re.IGNORECASE)
+        matcher = SkillMatcher([keyword.replace('\\', '') for keyword in self.PREVIOUS_KEYWORDS])
+        for text, expected in self.CASES:
+            with self.subTest(text=text):
+                self.assertEqual(pattern.findall(text.lower()), expected)
+                self.assertEqual(matcher.find_all(text), expected)
+
+    def test_longest_skill_wins(self):
+        # The same as the regex with longer alternatives listed first
+        skills = ['machine', 'learning', 'machine learning', 'big data', 'data analysis', 'data']
+        pattern = re.compile(r'\b(' + '|'.join(map(re.escape, sorted(skills, key=len, reverse=True))) + r')\b')
+        matcher = SkillMatcher(skills)
+        for text, expected in [
+            ('machine learning', ['machine learning']),
+            ('machine, learning', ['machine', 'learning']),
+            ('big data analysis', ['big data']),
+            ('data analysis on big data', ['data analysis', 'big data']),
+        ]:
+            with self.subTest(text=text):
+                self.assertEqual(pattern.findall(text), expected)
+                self.assertEqual(matcher.find_all(text), expected)
+
+
+def previous_career_matches(career_paths, skills):
+    """CareerAdvisor.calculate_career_matches as it was before the career matrix"""
+    user_skills = [skill.lower() for skill in skills['all_skills']]
+    career_matches = {}
+    for career, required_skills in career_paths.items():
+        matching_skills = [skill for skill in required_skills if skill in user_skills]
+        career_matches[career] = {
+            'match_percentage': round(len(matching_skills) / len(required_skills) * 100, 2),
+            'matching_skills': matching_skills,
+            'missing_skills': [skill for skill in required_skills if skill not in user_skills]
+        }
+    return sorted(career_matches.items(), key=lambda x: x[1]['match_percentage'], reverse=True)
+
+
+class CareerMatrixTests(SimpleTestCase):
+    """Matrix scoring must reproduce the per-career loop it replaced"""
+
+    skill_sets = [
+        [],
+        ['python'],
+        ['Python', 'SQL', 'Machine Learning', 'pandas'],
+        ['html', 'css', 'javascript', 'react', 'git', 'unknown skill'],
+        ['python', 'java', 'javascript', 'c++', 'c#', 'html', 'css', 'sql', 'git', 'agile'],
+    ]
+
+    def test_matches_previous_loop(self):
+        advisor = CareerAdvisor()
+        career_paths = advisor.career_paths
+        skill_sets = self.skill_sets + [
+            # Random draws from the skills careers actually ask for
+            list(np.random.default_rng(seed).choice(sorted(career_matrix.get_career_matrix().skill_index), 8))
+            for seed in range(5)
+        ]
+        batch = advisor.calculate_career_matches_batch([{'all_skills': skills} for skills in skill_sets])
+        percentages, careers = advisor.score_careers([{'all_skills': skills} for skills in skill_sets])
+        for skills, matches, scores in zip(skill_sets, batch, percentages):
+            with self.subTest(skills=skills):
+                expected = previous_career_matches(career_paths, {'all_skills': skills})
+                self.assertEqual(advisor.calculate_career_matches({'all_skills': skills}), expected)
+                self.assertEqual(matches, expected)
+                self.assertEqual({career: round(score, 2) for career, score in zip(careers, scores.tolist())},
+                                 {career: match['match_percentage'] for career, match in expected})
+
+    def test_rebuilt_when_taxonomy_changes(self):
+        self.enterContext(mock.patch.object(career_matrix, '_matrix', None))
+        current = mock.Mock(content_hash='a' * 64, career_paths={'Backend': ['python', 'sql']})
+        with mock.patch.object(career_matrix, 'get_taxonomy', return_value=current):
+            matrix = career_matrix.get_career_matrix()
+            self.assertIs(career_matrix.get_career_matrix(), matrix)
+            self.assertEqual(matrix.match_percentages([['python']]).tolist(), [[50.0]])
+
+            # The taxonomy file was edited
+            current.content_hash = 'b' * 64
+            current.career_paths = {'Backend': ['python'], 'Data': ['sql']}
+            rebuilt = career_matrix.get_career_matrix()
+        self.assertIsNot(rebuilt, matrix)
+        self.assertEqual(rebuilt.careers, ['Backend', 'Data'])
+        self.assertEqual(rebuilt.match_percentages([['python']]).tolist(), [[100.0, 0.0]])
+
+
+class TaxonomyTests(SimpleTestCase):
+    """get_taxonomy follows edits to the taxonomy file and rejects broken ones"""
+
+    data = {
+        'version': '1',
+        'skills': {'languages': ['python', 'sql'], 'devops': ['kubernetes']},
+        'aliases': {'k8s': 'kubernetes', 'py': 'Python'},
+        'career_paths': {'Platform Engineer': ['python', 'kubernetes']},
+    }
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'taxonomy.json')
+        self.write(self.data)
+        self.enterContext(override_settings(RESUME_SKILL_TAXONOMY=self.path))
+        # Start from nothing and check the file on every call
+        self.enterContext(mock.patch.object(taxonomy, '_taxonomy', None))
+        self.enterContext(mock.patch.object(taxonomy, 'RELOAD_CHECK_INTERVAL', 0))
+
+    def write(self, data, mtime_ns=None):
+        with open(self.path, 'w') as file:
+            file.write(data if isinstance(data, str) else json.dumps(data))
+        if mtime_ns is not None:
+            os.utime(self.path, ns=(mtime_ns, mtime_ns))
+        return os.stat(self.path).st_mtime_ns
+
+    def test_reload_on_mtime_or_size_change(self):
+        loaded = taxonomy.get_taxonomy()
+        self.assertEqual(loaded.version, '1')
+        self.assertIs(taxonomy.get_taxonomy(), loaded)
+        mtime_ns = os.stat(self.path).st_mtime_ns
+
+        # Same size, new modification time
+        self.write({**self.data, 'version': '2'}, mtime_ns=mtime_ns + 10 ** 9)
+        self.assertEqual(taxonomy.get_taxonomy().version, '2')
+        # New size, same modification time
+        self.write({**self.data, 'version': '10'}, mtime_ns=mtime_ns + 10 ** 9)
+        self.assertEqual(taxonomy.get_taxonomy().version, '10')
+
+    def test_invalid_file_keeps_last_good_version(self):
+        loaded = taxonomy.get_taxonomy()
+        broken_career = {**self.data, 'career_paths': {'Mainframe Developer': ['cobol']}}
+        for contents in ('{"version": "2", ', broken_career):
+            with self.subTest(contents=contents):
+                self.write(contents, mtime_ns=os.stat(self.path).st_mtime_ns + 10 ** 9)
+                with self.assertLogs('resume_app.taxonomy', 'ERROR'):
+                    self.assertIs(taxonomy.get_taxonomy(), loaded)
+
+    def test_aliases_reported_as_canonical(self):
+        loaded = taxonomy.get_taxonomy()
+        self.assertEqual(loaded.canonicalize('K8s'), 'kubernetes')
+        self.assertEqual(loaded.category('py'), 'languages')
+        self.assertIsNone(loaded.canonicalize('cobol'))
+        self.assertEqual(loaded.matcher.count('Python and SQL on K8s; py, kubernetes'),
+                         {'python': 2, 'sql': 1, 'kubernetes': 2})
+
+    def test_career_paths_need_extractable_skills(self):
+        # The parser only ever extracts taxonomy skills, so such a career could never match
+        with self.assertRaisesMessage(ValueError, "Career path 'Mainframe Developer' requires unknown skills: cobol"):
+            taxonomy.SkillTaxonomy({**self.data, 'career_paths': {'Mainframe Developer': ['python', 'cobol']}})
+        with self.assertRaisesMessage(ValueError, "Alias 'golang' refers to unknown skill 'go'"):
+            taxonomy.SkillTaxonomy({**self.data, 'aliases': {'golang': 'go'}})
+
+
+class UploadHandlerTests(SimpleTestCase):
+    """ResumeUploadHandler must give the same answers however the upload is chunked"""
+
+    PDF = (b'%PDF-1.4\n'
+           b'1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\n'
+           b'2 0 obj << /Type /Pages /Kids [3 0 R 4 0 R 5 0 R] /Count 3 >> endobj\n'
+           b'3 0 obj << /Type /Page /Parent 2 0 R >> endobj\n'
+           b'4 0 obj << /Type/Page /Parent 2 0 R >> endobj\n'
+           b'5 0 obj << /Type\n/Page /Parent 2 0 R >> endobj\n'
+           b'%%EOF\n')
+
+    def upload(self, data, chunk_size, name='resume.pdf'):
+        handler = ResumeUploadHandler()
+        handler.new_file('file', name, 'application/octet-stream', len(data))
+        for start in range(0, len(data), chunk_size):
+            handler.receive_data_chunk(data[start:start + chunk_size], start)
+        file = handler.file_complete(len(data))
+        self.addCleanup(file.close)
+        return file
+
+    def test_chunked_hash(self):
+        data = self.PDF * 20
+        for chunk_size in (1, 7, 64, len(data)):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.upload(data, chunk_size).content_hash, hashlib.sha256(data).hexdigest())
+
+    def test_pdf_pages_counted_across_chunk_boundaries(self):
+        # Every chunk size up to the overlap splits some /Type /Page marker
+        for chunk_size in range(1, uploads.PDF_PAGE_OVERLAP + 2):
+            with self.subTest(chunk_size=chunk_size):
+                file = self.upload(self.PDF, chunk_size)
+                self.assertEqual(file.detected_type, 'pdf')
+                self.assertEqual(file.page_count, 3)
+
+    def test_sniffed_type(self):
+        cases = [
+            (b'PK\x03\x04' + b'\x00' * 40, 'resume.docx', 'zip'),
+            (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + b'\x00' * 40, 'resume.doc', 'ole'),
+            ('Jos\u00e9 Garc\u00eda, Python developer\n'.encode('utf-8'), 'resume.txt', 'text'),
+            (b'Python developer\n\xff\xfe\n', 'resume.txt', 'binary'),
+            (b'%PDF', 'resume.pdf', 'text'),
+        ]
+        for data, name, detected_type in cases:
+            for chunk_size in (1, 3, len(data)):
+                with self.subTest(name=name, detected_type=detected_type, chunk_size=chunk_size):
+                    file = self.upload(data, chunk_size, name)
+                    self.assertEqual(file.detected_type, detected_type)
+                    self.assertIsNone(file.page_count)
+
+    def test_form_rejects_mismatched_contents(self):
+        cases = [
+            (self.PDF, 'resume.docx'),
+            (b'PK\x03\x04' + b'\x00' * 40, 'resume.pdf'),
+            (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + b'\x00' * 40, 'resume.docx'),
+            (self.PDF, 'resume.txt'),
+        ]
+        for data, name in cases:
+            with self.subTest(name=name, head=data[:4]):
+                form = ResumeUploadForm(data={'title': 'Resume'}, files={'file': self.upload(data, 5, name)})
+                self.assertFalse(form.is_valid())
+                self.assertIn('file', form.errors)
+
+        form = ResumeUploadForm(data={'title': 'Resume'}, files={'file': self.upload(self.PDF, 5)})
+        self.assertTrue(form.is_valid(), form.errors)
+
+    def test_form_fallback_checks_utf8(self):
+        # Uploads that bypassed the handler carry no detected_type, so the form sniffs them itself
+        text = 'Jos\u00e9 Garc\u00eda, Python developer\n'.encode('utf-8')
+        form = ResumeUploadForm(data={'title': 'Resume'},
+                                files={'file': SimpleUploadedFile('resume.txt', text)})
+        self.assertTrue(form.is_valid(), form.errors)
+        # Invalid bytes past the sniffed head
+        form = ResumeUploadForm(data={'title': 'Resume'},
+                                files={'file': SimpleUploadedFile('resume.txt', b'Python developer\n\xff\xfe\n')})
+        self.assertFalse(form.is_valid())
+        self.assertIn('file', form.errors)
+
+
+class UploadViewTests(TestCase):
+    """The upload view installs ResumeUploadHandler for its own requests only"""
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name,
+                                            RESUME_ANALYSIS_BACKEND='resume_app.tasks.DatabaseBackend'))
+        self.enterContext(mock.patch.object(tasks, '_backend', None))
+        self.user = User.objects.create_user('uploader', 'uploader@example.com', 'password')
+
+    def post(self, client, data):
+        client.force_login(self.user)
+        return client.post(reverse('resume_app:upload_resume'),
+                           {'title': 'Resume', 'file': SimpleUploadedFile('resume.txt', data)})
+
+    def test_default_handlers_unchanged(self):
+        self.assertNotIn('resume_app.uploads.ResumeUploadHandler', settings.FILE_UPLOAD_HANDLERS)
+
+    def test_upload_is_hashed_by_handler(self):
+        data = b'Python developer with Django experience.\n'
+        # The view only hashes the file itself when the handler didn't
+        with mock.patch('resume_app.views.hash_file', side_effect=AssertionError('file read again')):
+            response = self.post(self.client, data)
+        resume = Resume.objects.get(user=self.user)
+        self.assertRedirects(response, reverse('resume_app:analyze_resume', args=[resume.id]),
+                             fetch_redirect_response=False)
+        self.assertEqual(resume.content_hash, hashlib.sha256(data).hexdigest())
+        self.assertEqual(AnalysisJob.objects.get(resume=resume).status, AnalysisJob.STATUS_PENDING)
+
+    def test_csrf_still_enforced(self):
+        response = self.post(self.client_class(enforce_csrf_checks=True), b'Python developer\n')
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Resume.objects.exists())
+
+
+class BenchmarkGoldenTests(SimpleTestCase):
+    """The pipeline must keep producing the committed outputs for the benchmark corpus"""
+
+    # The large corpus is left to "manage.py bench --check"
+    sizes = ('small', 'medium')
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.cases = benchmark.generate_corpus(cls.directory.name, cls.sizes)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+        super().tearDownClass()
+
+    def test_corpus_is_deterministic(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for case in benchmark.generate_corpus(directory, self.sizes):
+                with open(case['path'], 'rb') as first, \
+                        open(os.path.join(self.directory.name, case['name']), 'rb') as second:
+                    self.assertEqual(first.read(), second.read(), case['name'])
+
+    def test_outputs_match_goldens(self):
+        goldens = benchmark.load_goldens()['outputs']
+        # The goldens leave out everything NER finds, so skip the spaCy model
+        # (which nlp.get_nlp would download if it is missing)
+        def no_entities(parser, sentences):
+            return {sentence: [] for sentence in sentences}
+
+        with mock.patch.object(ResumeParser, 'extract_entities', no_entities):
+            outputs = benchmark.golden_outputs(self.cases)
+        for name, output in outputs.items():
+            with self.subTest(case=name):
+                self.assertEqual(output, goldens[name])
+
+
+class DocxReaderTests(SimpleTestCase):
+    """The streaming DOCX reader must agree with python-docx on body and table paragraphs"""
+
+    NAMESPACES = (
+        'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+        'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+        'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+        'xmlns:v="urn:schemas-microsoft-com:vml"')
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.parser = ResumeParser()
+
+    def write_docx(self, body):
+        path = os.path.join(self.directory.name, 'resume.docx')
+        document = f'<w:document {self.NAMESPACES}><w:body>{body}</w:body></w:document>'
+        with zipfile.ZipFile(path, 'w') as archive:
+            for name, data in list(benchmark.DOCX_PARTS.items()) + [('word/document.xml', document)]:
+                archive.writestr(name, data)
+        return path
+
+    def run_xml(self, text):
+        return f'<w:r><w:t xml:space="preserve">{text}</w:t></w:r>'
+
+    def test_table_cells(self):
+        cell = '<w:tc><w:p>{}</w:p></w:tc>'
+        path = self.write_docx(
+            '<w:p>' + self.run_xml('Skills') + '</w:p>'
+            '<w:tbl><w:tr>'
+            + cell.format(self.run_xml('Python')) + cell.format(self.run_xml('Django') + self.run_xml(' REST'))
+            + '</w:tr></w:tbl>'
+            '<w:p>' + self.run_xml('Experience') + '</w:p>')
+
+        document = docx.Document(path)
+        expected = [document.paragraphs[0].text]
+        expected += [paragraph.text for cell in document.tables[0].rows[0].cells for paragraph in cell.paragraphs]
+        expected += [document.paragraphs[1].text]
+        self.assertEqual(list(self.parser.iter_docx_paragraphs(path)), expected)
+        self.assertEqual(expected, ['Skills', 'Python', 'Django REST', 'Experience'])
+
+    def test_text_box(self):
+        box = '<w:txbxContent><w:p>' + self.run_xml('Inside box') + '</w:p></w:txbxContent>'
+        path = self.write_docx(
+            '<w:p>' + self.run_xml('Before box ')
+            + '<w:r><mc:AlternateContent>'
+            '<mc:Choice Requires="wps"><w:drawing><wps:txbx>' + box + '</wps:txbx></w:drawing></mc:Choice>'
+            '<mc:Fallback><w:pict><v:textbox>' + box + '</v:textbox></w:pict></mc:Fallback>'
+            '</mc:AlternateContent></w:r>'
+            + self.run_xml(' after box') + '</w:p>'
+            '<w:p>' + self.run_xml('Next') + '</w:p>')
+
+        paragraphs = list(self.parser.iter_docx_paragraphs(path))
+        # The box text comes once, on its own, and the anchoring paragraph reads as in python-docx
+        self.assertEqual(paragraphs, ['Inside box', 'Before box  after box', 'Next'])
+        self.assertEqual([paragraph.text for paragraph in docx.Document(path).paragraphs], paragraphs[1:])
+
+    def test_legacy_text_box(self):
+        path = self.write_docx(
+            '<w:p>' + self.run_xml('Before')
+            + '<w:r><w:pict><v:textbox><w:txbxContent>'
+            '<w:p>' + self.run_xml('Box one') + '</w:p><w:p>' + self.run_xml('Box two') + '</w:p>'
+            '</w:txbxContent></v:textbox></w:pict></w:r>'
+            + self.run_xml('After') + '</w:p>')
+
+        self.assertEqual(list(self.parser.iter_docx_paragraphs(path)), ['Box one', 'Box two', 'BeforeAfter'])
+
+
+class VectorIndexTests(TestCase):
+    """Ranking must score against the vectors currently stored"""
+
+    n_features = 4
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ranker', 'ranker@example.com', 'password')
+
+    def setUp(self):
+        vectors._index = None
+        self.addCleanup(setattr, vectors, '_index', None)
+
+    def row(self, values):
+        row = np.array(values, dtype=np.float32)
+        return sparse.csr_matrix(row / np.linalg.norm(row))
+
+    def create_resume(self, title, values):
+        resume = Resume.objects.create(user=self.user, title=title, file=f'resumes/{title}.txt')
+        ResumeAnalysis.objects.create(resume=resume, tfidf_vector=vectors.encode_vector(self.row(values)),
+                                      vector_version='v1', vector_updated_at=timezone.now())
+        return resume
+
+    def top_k(self, values, k=10):
+        return [resume_id for resume_id, score in
+                vectors.get_vector_index('v1', self.n_features).top_k(self.row(values), k)]
+
+    def test_encode_decode_round_trip(self):
+        row = sparse.csr_matrix(([0.25, 0.5, 0.75], ([0, 0, 0], [1, 7, 30])), shape=(1, 40))
+        indices, data, n_features = vectors.decode_vector(vectors.encode_vector(row))
+        self.assertEqual(n_features, 40)
+        self.assertEqual(indices.tolist(), [1, 7, 30])
+        self.assertEqual(data.dtype, np.float32)
+        self.assertEqual(data.tolist(), [0.25, 0.5, 0.75])
+
+        empty = sparse.csr_matrix((1, 40), dtype=np.float32)
+        indices, data, n_features = vectors.decode_vector(vectors.encode_vector(empty))
+        self.assertEqual((len(indices), len(data), n_features), (0, 0, 40))
+
+    def test_rank_order_and_top_k(self):
+        first = self.create_resume('first', [1, 0, 0, 0])
+        second = self.create_resume('second', [1, 1, 0, 0])
+        third = self.create_resume('third', [0, 0, 1, 1])
+        self.assertEqual(self.top_k([1, 0, 0, 0]), [first.id, second.id, third.id])
+        self.assertEqual(self.top_k([0, 1, 1, 0], k=2), [second.id, third.id])
+        self.assertEqual(self.top_k([1, 0, 0, 0], k=1), [first.id])
+        self.assertEqual(self.top_k([1, 0, 0, 0], k=0), [])
+
+    def test_rank_resumes_percentages(self):
+        vectorizer = JobMatcher.build_vectorizer().fit(['python django developer', 'java spring developer'])
+        bundle = {'version': 'v1', 'vectorizer': vectorizer}
+        python = Resume.objects.create(user=self.user, title='python', file='resumes/python.txt')
+        java = Resume.objects.create(user=self.user, title='java', file='resumes/java.txt')
+        for resume, text in ((python, 'python django developer'), (java, 'java spring developer')):
+            ResumeAnalysis.objects.create(
+                resume=resume, tfidf_vector=vectors.encode_vector(vectorizer.transform([text])),
+                vector_version='v1', vector_updated_at=timezone.now())
+
+        with mock.patch.object(matcher_store, 'load_vectorizer', return_value=bundle):
+            ranking = vectors.rank_resumes('python django developer', top_k=1)
+        self.assertEqual(ranking, [(python.id, 100.0)])
+
+    def test_new_and_deleted_rows(self):
+        first = self.create_resume('first', [1, 0, 0, 0])
+        self.assertEqual(self.top_k([1, 0, 0, 0]), [first.id])
+        second = self.create_resume('second', [1, 0.1, 0, 0])
+        self.assertEqual(self.top_k([1, 0, 0, 0]), [first.id, second.id])
+        first.delete()
+        self.assertEqual(self.top_k([1, 0, 0, 0]), [second.id])
+
+    def test_revectorized_row_is_reloaded(self):
+        first = self.create_resume('first', [1, 0, 0, 0])
+        second = self.create_resume('second', [0, 1, 0, 0])
+        self.assertEqual(self.top_k([1, 0, 0, 0]), [first.id, second.id])
+
+        # Re-analysis rewrites the vector of the existing ResumeAnalysis row
+        results = {'skills': {'skill_counts': {}}, 'education': {}, 'experience': {}, 'summary': '',
+                   'full_text': 'text'}
+        with mock.patch.object(vectors, 'vectorize_text',
+                               return_value=(vectors.encode_vector(self.row([0, 0, 1, 0])), 'v1')):
+            tasks.store_analysis(first, results)
+
+        index = vectors.get_vector_index('v1', self.n_features)
+        self.assertEqual(index.count, 2)
+        [(resume_id, score)] = index.top_k(self.row([0, 0, 1, 0]), 1)
+        self.assertEqual(resume_id, first.id)
+        self.assertAlmostEqual(score, 1.0, places=5)
+        self.assertEqual(self.top_k([0, 1, 0, 0], k=1), [second.id])
+
+
+class JobDescriptionTests(TestCase):
+    """Each distinct job description is stored and analyzed once"""
+
+    text = 'Senior Python developer.\nDjango, Docker and AWS experience required.'
+
+    @classmethod
+    def setUpTestData(cls):
+        vectorizer = JobMatcher.build_vectorizer().fit([cls.text, 'Java developer with Spring and SQL'])
+        cls.bundle = {'version': 'v1', 'vectorizer': vectorizer}
+        cls.resume_analysis = {'full_text': 'Python developer using Django and Docker',
+                               'skills': {'all_skills': ['python', 'django', 'docker']}}
+
+    def setUp(self):
+        patcher = mock.patch.object(matcher_store, 'load_vectorizer', return_value=self.bundle)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_normalized_variants_share_a_row(self):
+        matcher = JobMatcher()
+        variants = [self.text, '  ' + self.text.upper() + '\n', self.text.replace(' ', '\t  ')]
+        descriptions = [job_descriptions.get_job_description(text, matcher) for text in variants]
+        self.assertEqual({description.pk for description in descriptions}, {descriptions[0].pk})
+        self.assertEqual(JobDescription.objects.count(), 1)
+        # The first submission's text is the one kept
+        self.assertEqual(descriptions[0].text, self.text)
+        self.assertEqual(descriptions[0].content_hash, job_descriptions.content_hash(variants[1]))
+
+    def test_repeat_submission_reuses_skills_and_vector(self):
+        first = job_descriptions.match_job(self.resume_analysis, 'Engineer', 'Acme', self.text)
+        description = first['job_description']
+        self.assertEqual(sorted(description.skills), ['aws', 'django', 'docker', 'python'])
+        self.assertEqual(description.vector_version, 'v1')
+
+        with mock.patch.object(JobMatcher, 'extract_job_skills') as extract_job_skills, \
+                mock.patch.object(vectors, 'vectorize_text') as vectorize_text:
+            second = job_descriptions.match_job(self.resume_analysis, 'Engineer', 'Acme', self.text.lower())
+        extract_job_skills.assert_not_called()
+        vectorize_text.assert_not_called()
+        self.assertEqual(second['job_description'].pk, description.pk)
+        self.assertEqual(second['match_percentage'], first['match_percentage'])
+        self.assertEqual(second['skills_matched'], first['skills_matched'])
+        self.assertEqual(second['skills_missing'], ['aws'])
+
+        # The stored vector gives the same score as vectorizing the text again
+        matcher = JobMatcher(vectorizer=self.bundle['vectorizer'])
+        self.assertEqual(second['match_percentage'],
+                         matcher.match_resume_to_job(self.resume_analysis['full_text'], self.text))
+
+    def test_taxonomy_change_recomputes_skills(self):
+        matcher = JobMatcher()
+        description = job_descriptions.get_job_description(self.text, matcher)
+        with mock.patch.object(job_descriptions, 'get_taxonomy',
+                               return_value=mock.Mock(content_hash='edited')), \
+                mock.patch.object(JobMatcher, 'extract_job_skills', return_value=['python']) as extract_job_skills:
+            refreshed = job_descriptions.get_job_description(self.text, matcher)
+        extract_job_skills.assert_called_once_with(self.text)
+        self.assertEqual(refreshed.pk, description.pk)
+        refreshed.refresh_from_db()
+        self.assertEqual((refreshed.skills, refreshed.skills_version), (['python'], 'edited'))
+
+    def test_vectorizer_change_recomputes_vector(self):
+        matcher = JobMatcher()
+        job_descriptions.get_job_description(self.text, matcher, 'v1')
+        with mock.patch.object(vectors, 'vectorize_text', return_value=(b'vector', 'v2')) as vectorize_text:
+            job_descriptions.get_job_description(self.text, matcher, 'v1')
+            vectorize_text.assert_not_called()
+            refreshed = job_descriptions.get_job_description(self.text, matcher, 'v2')
+        vectorize_text.assert_called_once_with(self.text)
+        refreshed.refresh_from_db()
+        self.assertEqual((bytes(refreshed.tfidf_vector), refreshed.vector_version), (b'vector', 'v2'))
+        # Without a fitted vectorizer the stored vector is left alone
+        self.assertIsNone(job_descriptions.decode_job_vector(refreshed, 'v3'))
+
+
+@override_settings(RESUME_MAX_STORED_SENTENCES=2, RESUME_MAX_SENTENCE_LENGTH=10)
+class SentenceBudgetTests(SimpleTestCase):
+    """Stored sentence lists are cut to the configured budget and flagged when they are"""
+
+    def payload(self, education_sentences, experience_sentences=()):
+        return tasks.payload_fields({
+            'education': {'degrees': [], 'education_sentences': list(education_sentences)},
+            'experience': {'experience_sentences': list(experience_sentences)},
+        })
+
+    def test_within_budget(self):
+        self.assertEqual(self.payload(['BSc', 'MSc'], ['Acme']), {
+            'education_sentences': ['BSc', 'MSc'],
+            'experience_sentences': ['Acme'],
+            'truncated': False,
+        })
+
+    def test_too_many_sentences(self):
+        payload = self.payload(['BSc', 'MSc', 'PhD'])
+        self.assertEqual(payload['education_sentences'], ['BSc', 'MSc'])
+        self.assertTrue(payload['truncated'])
+
+    def test_long_sentences(self):
+        payload = self.payload(['BSc'], ['Worked at Acme Corp'])
+        self.assertEqual(payload['education_sentences'], ['BSc'])
+        self.assertEqual(payload['experience_sentences'], ['Worked at '])
+        self.assertTrue(payload['truncated'])
+
+    @override_settings(RESUME_MAX_STORED_SENTENCES=None, RESUME_MAX_SENTENCE_LENGTH=None)
+    def test_unlimited(self):
+        sentences = ['Worked at Acme Corp'] * 5
+        self.assertEqual(tasks.truncate_sentences(sentences), (sentences, False))
+
+
+class ResumeTextTests(TestCase):
+    """Extracted text is stored compressed and read back unchanged"""
+
+    def test_compressed_round_trip(self):
+        user = User.objects.create_user('reader', 'reader@example.com', 'password')
+        resume = Resume.objects.create(user=user, title='Resume', file='resumes/resume.txt')
+        text = 'Jos\u00e9 Garc\u00eda \u2022 Python developer with Django experience.\n' * 50
+        resume_text = ResumeText(resume=resume)
+        resume_text.text = text
+        resume_text.save()
+
+        stored = ResumeText.objects.get(resume=resume)
+        self.assertEqual(stored.text, text)
+        self.assertEqual(stored.text_length, len(text))
+        self.assertLess(len(stored.compressed_text), len(text.encode('utf-8')))
+
+
+class MigrationTestCase(TransactionTestCase):
+    """Base for tests that move the schema back to migrate_from and run migrate_to on data"""
+
+    migrate_from = None
+    migrate_to = None
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(self.migrate, None)
+        self.apps = self.migrate(self.migrate_from)
+
+    def migrate(self, target):
+        """Migrate resume_app to target (None: the latest migration) and return the historical apps"""
+        executor = MigrationExecutor(connection)
+        if target is None:
+            targets = executor.loader.graph.leaf_nodes('resume_app')
+        else:
+            targets = [('resume_app', target)]
+        executor.migrate(targets)
+        executor.loader.build_graph()
+        return executor.loader.project_state(targets).apps
+
+    def create_resume(self, apps, title='Resume'):
+        User = apps.get_model('auth', 'User')
+        Resume = apps.get_model('resume_app', 'Resume')
+        user, created = User.objects.get_or_create(username='migrator')
+        return Resume.objects.create(user=user, title=title, file=f'resumes/{title}.pdf')
+
+
+class JobDescriptionMigrationTests(MigrationTestCase):
+    """0012 moves job description text from JobMatch onto shared JobDescription rows and back"""
+
+    migrate_from = '0011_resumeanalysis_parse_stats'
+    migrate_to = '0012_jobdescription'
+
+    def test_forward_and_back(self):
+        JobMatch = self.apps.get_model('resume_app', 'JobMatch')
+        resume = self.create_resume(self.apps)
+        texts = ['Python developer', '  python   DEVELOPER ', 'Java developer', '']
+        for text in texts:
+            JobMatch.objects.create(resume=resume, job_title='Engineer', match_percentage=50.0,
+                                    job_description=text)
+
+        apps = self.migrate(self.migrate_to)
+        JobDescription = apps.get_model('resume_app', 'JobDescription')
+        JobMatch = apps.get_model('resume_app', 'JobMatch')
+        self.assertEqual(sorted(JobDescription.objects.values_list('text', flat=True)),
+                         ['Java developer', 'Python developer'])
+        linked = [match.job_description.text if match.job_description else None
+                  for match in JobMatch.objects.order_by('id').select_related('job_description')]
+        self.assertEqual(linked, ['Python developer', 'Python developer', 'Java developer', None])
+        self.assertEqual(JobDescription.objects.get(text='Python developer').content_hash,
+                         job_descriptions.content_hash('Python developer'))
+
+        apps = self.migrate(self.migrate_from)
+        JobMatch = apps.get_model('resume_app', 'JobMatch')
+        # The first copy's spelling is what every match sharing the description gets back
+        self.assertEqual(list(JobMatch.objects.order_by('id').values_list('job_description', flat=True)),
+                         ['Python developer', 'Python developer', 'Java developer', None])
+
+
+class ResumeTextMigrationTests(MigrationTestCase):
+    """0005 fills ResumeText for analyzed resumes from the parse cache"""
+
+    migrate_from = '0004_resumeanalysis_tfidf_vector'
+    migrate_to = '0005_resumetext'
+
+    def test_backfill_from_parse_cache(self):
+        ParsedResumeCache = self.apps.get_model('resume_app', 'ParsedResumeCache')
+        ResumeAnalysis = self.apps.get_model('resume_app', 'ResumeAnalysis')
+        resumes = {}
+        for title, analyzed in (('cached', True), ('uncached', True), ('pending', False), ('empty', True)):
+            resume = self.create_resume(self.apps, title)
+            resume.content_hash = title.ljust(64, '0')
+            resume.save()
+            if analyzed:
+                ResumeAnalysis.objects.create(resume=resume)
+            resumes[title] = resume
+        text = 'Jos\u00e9 Garc\u00eda. Python developer.'
+        for title, full_text in (('cached', text), ('pending', text), ('empty', '')):
+            ParsedResumeCache.objects.create(content_hash=resumes[title].content_hash, parser_version='1',
+                                             results={'full_text': full_text, 'skills': {}})
+
+        apps = self.migrate(self.migrate_to)
+        ResumeText = apps.get_model('resume_app', 'ResumeText')
+        # Only analyzed resumes with cached, non-empty text get a row
+        row = ResumeText.objects.get()
+        self.assertEqual(row.resume_id, resumes['cached'].id)
+        self.assertEqual(zlib.decompress(row.compressed_text).decode('utf-8'), text)
+        self.assertEqual(row.text_length, len(text))
+
+
+class PayloadMigrationTests(MigrationTestCase):
+    """0007 moves the sentence lists from ResumeAnalysis into ResumeAnalysisPayload and back"""
+
+    migrate_from = '0006_resume_page_count'
+    migrate_to = '0007_resumeanalysispayload'
+
+    def test_forward_and_back(self):
+        ResumeAnalysis = self.apps.get_model('resume_app', 'ResumeAnalysis')
+        with_sentences = self.create_resume(self.apps, 'with_sentences')
+        ResumeAnalysis.objects.create(
+            resume=with_sentences,
+            education={'degrees': ['BSc'], 'education_sentences': ['BSc from State University']},
+            experience={'organizations': ['Acme'], 'experience_sentences': ['Worked at Acme', 'Led a team']})
+        without_sentences = self.create_resume(self.apps, 'without_sentences')
+        ResumeAnalysis.objects.create(resume=without_sentences, education={'degrees': []}, experience={})
+
+        apps = self.migrate(self.migrate_to)
+        ResumeAnalysis = apps.get_model('resume_app', 'ResumeAnalysis')
+        ResumeAnalysisPayload = apps.get_model('resume_app', 'ResumeAnalysisPayload')
+        analysis = ResumeAnalysis.objects.get(resume_id=with_sentences.id)
+        self.assertEqual((analysis.education, analysis.experience), ({'degrees': ['BSc']}, {'organizations': ['Acme']}))
+        payload = ResumeAnalysisPayload.objects.get(resume_id=with_sentences.id)
+        self.assertEqual(payload.education_sentences, ['BSc from State University'])
+        self.assertEqual(payload.experience_sentences, ['Worked at Acme', 'Led a team'])
+        self.assertFalse(payload.truncated)
+        payload = ResumeAnalysisPayload.objects.get(resume_id=without_sentences.id)
+        self.assertEqual((payload.education_sentences, payload.experience_sentences), ([], []))
+
+        apps = self.migrate(self.migrate_from)
+        ResumeAnalysis = apps.get_model('resume_app', 'ResumeAnalysis')
+        analysis = ResumeAnalysis.objects.get(resume_id=with_sentences.id)
+        self.assertEqual(analysis.education, {'degrees': ['BSc'], 'education_sentences': ['BSc from State University']})
+        self.assertEqual(analysis.experience, {'organizations': ['Acme'],
+                                               'experience_sentences': ['Worked at Acme', 'Led a team']})
+
+
+@override_settings(RESUME_SKILL_INDEX_REFRESH=0)
+class SkillIndexTests(TestCase):
+    """Skill search over the in-memory ResumeSkill index"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('searcher', 'searcher@example.com', 'password')
+        cls.staff = User.objects.create_user('staff', 'staff@example.com', 'password', is_staff=True)
+        cls.python = cls.create_resume('python', {'python': 3, 'django': 1})
+        cls.cloud = cls.create_resume('cloud', {'python': 1, 'kubernetes': 2})
+        cls.web = cls.create_resume('web', {'django': 5})
+
+    @classmethod
+    def create_resume(cls, title, skill_counts):
+        resume = Resume.objects.create(user=cls.user, title=title, file=f'resumes/{title}.txt')
+        ResumeSkill.objects.bulk_create(ResumeSkill(resume=resume, skill=skill, count=count)
+                                        for skill, count in skill_counts.items())
+        return resume
+
+    def setUp(self):
+        skill_index._index = None
+        self.addCleanup(setattr, skill_index, '_index', None)
+
+    def hits(self, skills, match_all=True):
+        return [(hit['resume_id'], hit['matched'], hit['score'])
+                for hit in skill_index.search_skills(skills, match_all=match_all)['results']]
+
+    def test_all_and_any(self):
+        self.assertEqual(self.hits(['python', 'django']), [(self.python.id, 2, 4)])
+        # More skills matched ranks first, then more mentions
+        self.assertEqual(self.hits(['python', 'django'], match_all=False),
+                         [(self.python.id, 2, 4), (self.web.id, 1, 5), (self.cloud.id, 1, 1)])
+        search = skill_index.search_skills(['python', 'django'], match_all=False, limit=1)
+        self.assertEqual(search['total'], 3)
+        self.assertEqual(search['results'][0]['skill_counts'], {'python': 3, 'django': 1})
+
+    def test_aliases_and_unknown_skills(self):
+        search = skill_index.search_skills(['K8s', 'kubernetes'])
+        self.assertEqual(search['skills'], ['kubernetes'])
+        self.assertEqual([hit['resume_id'] for hit in search['results']], [self.cloud.id])
+
+        search = skill_index.search_skills(['python', 'cobolscript'])
+        self.assertEqual((search['unknown'], search['total'], search['results']), (['cobolscript'], 0, []))
+        search = skill_index.search_skills(['python', 'cobolscript'], match_all=False)
+        self.assertEqual(search['unknown'], ['cobolscript'])
+        self.assertEqual(search['total'], 2)
+        # Known but unmentioned skill
+        self.assertEqual(skill_index.search_skills(['rust'])['total'], 0)
+
+    def test_new_rows_are_added_incrementally(self):
+        index = skill_index.get_skill_index()
+        self.assertEqual(self.hits(['kubernetes']), [(self.cloud.id, 1, 2)])
+        ops = self.create_resume('ops', {'kubernetes': 4})
+        self.assertIs(skill_index.get_skill_index(), index)
+        self.assertEqual(self.hits(['kubernetes']), [(ops.id, 1, 4), (self.cloud.id, 1, 2)])
+
+    def test_deletions_rebuild(self):
+        index = skill_index.get_skill_index()
+        self.python.delete()
+        self.assertIsNot(skill_index.get_skill_index(), index)
+        self.assertEqual(self.hits(['python']), [(self.cloud.id, 1, 1)])
+
+    @override_settings(RESUME_SKILL_INDEX_REFRESH=3600)
+    def test_refresh_interval(self):
+        skill_index.get_skill_index()
+        self.create_resume('ops', {'kubernetes': 4})
+        self.assertEqual(self.hits(['kubernetes']), [(self.cloud.id, 1, 2)])
+
+    def test_api_is_staff_only(self):
+        url = reverse('resume_app:skill_search')
+        self.assertEqual(self.client.get(url, {'skills': 'python'}).status_code, 302)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url, {'skills': 'python'}).status_code, 302)
+
+        self.client.force_login(self.staff)
+        response = self.client.get(url, {'skills': 'k8s, python', 'mode': 'any', 'limit': 5})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([(hit['resume_id'], hit['title'], hit['username']) for hit in results],
+                         [(self.cloud.id, 'cloud', 'searcher'), (self.python.id, 'python', 'searcher')])
+        self.assertEqual(self.client.get(url, {'skills': ' , '}).status_code, 400)
+
+
+class ExecutorTests(SimpleTestCase):
+    """The CPU pool turns work away once its threads and queue are full"""
+
+    def test_saturated_pool_raises_busy(self):
+        pool = executor.BoundedExecutor(max_workers=1, max_queued=1)
+        release = threading.Event()
+        self.addCleanup(release.set)
+        running = [pool.submit(release.wait), pool.submit(release.wait)]
+        with self.assertRaises(executor.ExecutorBusy):
+            pool.submit(release.wait)
+
+        release.set()
+        for future in running:
+            future.result(timeout=5)
+        self.assertEqual(pool.submit(lambda: 42).result(timeout=5), 42)
+
+    def test_failed_work_frees_its_slot(self):
+        pool = executor.BoundedExecutor(max_workers=1, max_queued=0)
+        with self.assertRaises(ZeroDivisionError):
+            pool.submit(lambda: 1 / 0).result(timeout=5)
+        self.assertEqual(pool.submit(lambda: 'ok').result(timeout=5), 'ok')
+
+    @override_settings(RESUME_CPU_WORKERS=1, RESUME_CPU_QUEUE_SIZE=0)
+    def test_executor_from_settings(self):
+        self.addCleanup(setattr, executor, '_executor', executor._executor)
+        executor._executor = None
+        pool = executor.get_executor()
+        self.assertEqual((pool.max_workers, pool.max_queued), (1, 0))
+        self.assertIs(executor.get_executor(), pool)
+
+
+class TimingTests(TestCase):
+    """Stage timings follow work onto the CPU pool and feed the stats page"""
+
+    def test_stages_recorded_on_executor_threads(self):
+        pool = executor.BoundedExecutor(max_workers=1, max_queued=0)
+
+        def work():
+            with timing.stage('work'):
+                return threading.current_thread().name
+
+        with timing.collect() as request_timer:
+            with timing.collect() as timer:
+                thread_name = pool.submit(work).result(timeout=5)
+        self.assertTrue(thread_name.startswith('resume-cpu'), thread_name)
+        self.assertEqual(list(timer.timings), ['work'])
+        # Nested timers see the stage too
+        self.assertEqual(request_timer.timings, timer.timings)
+        # Outside collect() nothing is recorded
+        self.assertEqual(pool.submit(work).result(timeout=5), thread_name)
+        self.assertEqual(list(timer.timings), ['work'])
+
+    def test_percentiles(self):
+        self.assertEqual(timing.percentiles([]), {'p50': None, 'p95': None, 'p99': None})
+        self.assertEqual(timing.percentiles([7]), {'p50': 7.0, 'p95': 7.0, 'p99': 7.0})
+        # Linear interpolation between the closest ranks
+        self.assertEqual(timing.percentiles(list(range(100, 0, -1))), {'p50': 50.5, 'p95': 95.05, 'p99': 99.01})
+
+    def test_stats_page(self):
+        staff = User.objects.create_user('staff', 'staff@example.com', 'password', is_staff=True)
+        for number in range(1, 11):
+            resume = Resume.objects.create(user=staff, title=f'Resume {number}', file=f'resumes/{number}.txt')
+            ResumeAnalysis.objects.create(resume=resume, parse_duration=number / 1000, page_count=number,
+                                          text_length=number * 100,
+                                          parse_timings={'extract_text': number, 'ner': number * 2})
+        # A parse cache hit only records the overall parse
+        resume = Resume.objects.create(user=staff, title='Cached', file='resumes/cached.txt')
+        ResumeAnalysis.objects.create(resume=resume, parse_duration=0.5, parse_timings={'parse': 0.1})
+
+        url = reverse('resume_app:analysis_stats')
+        self.client.force_login(staff)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        context = response.context
+        self.assertEqual((context['analyses_count'], context['parses_count'], context['cached_count']), (11, 10, 1))
+        self.assertEqual(context['duration'], timing.percentiles(list(range(1, 11))))
+        self.assertEqual(context['stages'], [
+            {'name': 'extract_text', **timing.percentiles(list(range(1, 11)))},
+            {'name': 'ner', **timing.percentiles(list(range(2, 21, 2)))},
+        ])
+        self.assertEqual(context['pages'], timing.percentiles(list(range(1, 11))))
+
+        self.client.force_login(User.objects.create_user('user', 'user@example.com', 'password'))
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+
+def no_entities(parser, sentences):
+    """Stand-in for ResumeParser.extract_entities that never loads the spaCy model"""
+    return {sentence: [] for sentence in sentences}
+
+
+@override_settings(RESUME_ANALYSIS_BACKEND='resume_app.tasks.ImmediateBackend')
+class AsyncViewTests(TransactionTestCase):
+    """The async views, called through the test client"""
+
+    resume_text = (b'Jane Doe. Senior Python developer with Django and Docker experience.\n'
+                   b'Worked at Acme Corp as Lead Engineer since 2019.\n'
+                   b'Bachelor of Science degree from State University.\n')
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        self.enterContext(mock.patch.object(ResumeParser, 'extract_entities', no_entities))
+        self.enterContext(mock.patch.object(matcher_store, 'load_vectorizer', return_value=None))
+        # Backend and executor are built from the overridden settings
+        self.enterContext(mock.patch.object(tasks, '_backend', None))
+        self.enterContext(mock.patch.object(executor, '_executor', None))
+        parse_cache._memory.clear()
+        self.user = User.objects.create_user('async', 'async@example.com', 'password')
+        self.client.force_login(self.user)
+
+    def create_resume(self, title='Resume'):
+        return Resume.objects.create(user=self.user, title=title,
+                                     file=SimpleUploadedFile(f'{title}.txt', self.resume_text))
+
+    def analyze(self, resume):
+        return self.client.get(reverse('resume_app:analyze_resume', args=[resume.id]))
+
+    def fill_executor(self):
+        """Occupy the only worker thread until the test ends"""
+        release = threading.Event()
+        self.addCleanup(release.set)
+        executor.get_executor().submit(release.wait)
+
+    def test_login_required(self):
+        resume = self.create_resume()
+        self.client.logout()
+        for url in (reverse('resume_app:analyze_resume', args=[resume.id]),
+                    reverse('resume_app:job_match', args=[resume.id]),
+                    reverse('resume_app:dashboard')):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 302)
+                self.assertTrue(response['Location'].startswith(settings.LOGIN_URL), response['Location'])
+
+    def test_analyze_resume(self):
+        resume = self.create_resume()
+        response = self.analyze(resume)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'resume_app/analysis_results.html')
+        analysis = ResumeAnalysis.objects.get(resume=resume)
+        self.assertIn('python', analysis.skills['all_skills'])
+        # Another user's resume is not found
+        other = User.objects.create_user('other', 'other@example.com', 'password')
+        self.client.force_login(other)
+        self.assertEqual(self.analyze(resume).status_code, 404)
+
+    def test_job_match(self):
+        resume = self.create_resume()
+        self.analyze(resume)
+        url = reverse('resume_app:job_match', args=[resume.id])
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        response = self.client.post(url, {'job_title': 'Engineer', 'company': 'Acme',
+                                           'job_description': 'Python and AWS engineer'})
+        job_match = JobMatch.objects.get(resume=resume)
+        self.assertRedirects(response, reverse('resume_app:job_match_detail', args=[job_match.id]),
+                             fetch_redirect_response=False)
+        self.assertEqual((job_match.skills_matched, job_match.skills_missing), (['python'], ['aws']))
+
+    def test_job_match_without_stored_text(self):
+        resume = self.create_resume()
+        self.analyze(resume)
+        # Resumes analyzed before the text was kept are matched on their summary
+        ResumeText.objects.filter(resume=resume).delete()
+        with mock.patch.object(job_descriptions, 'match_job', wraps=job_descriptions.match_job) as match_job:
+            response = self.client.post(reverse('resume_app:job_match', args=[resume.id]),
+                                        {'job_title': 'Engineer', 'job_description': 'Python and AWS engineer'})
+        self.assertEqual(response.status_code, 302)
+        resume_data = match_job.call_args.args[0]
+        self.assertEqual(resume_data['full_text'], ResumeAnalysis.objects.get(resume=resume).summary)
+        self.assertTrue(JobMatch.objects.filter(resume=resume).exists())
+
+    def test_dashboard(self):
+        analyzed = self.create_resume('analyzed')
+        self.analyze(analyzed)
+        JobMatch.objects.create(resume=analyzed, job_title='Engineer', match_percentage=50.0)
+        JobMatch.objects.create(resume=analyzed, job_title='Lead', match_percentage=60.0)
+        pending = self.create_resume('pending')
+
+        response = self.client.get(reverse('resume_app:dashboard'))
+        self.assertEqual(response.status_code, 200)
+        resumes = {resume.id: resume for resume in response.context['resumes']}
+        self.assertEqual(list(resumes), [pending.id, analyzed.id])
+        self.assertEqual(resumes[analyzed.id].job_match_count, 2)
+        self.assertEqual(resumes[pending.id].job_match_count, 0)
+        self.assertEqual((response.context['resumes_count'], response.context['analyzed_resumes_count']), (2, 1))
+
+    def test_server_timing_headers(self):
+        resume = self.create_resume()
+        # extract_text runs on an executor thread, so reaching the header
+        # shows the request's timer followed the work there
+        self.assertServerTiming(self.analyze(resume), ['analysis', 'parse', 'extract_text', 'store', 'total'])
+        response = self.client.post(reverse('resume_app:job_match', args=[resume.id]),
+                                    {'job_title': 'Engineer', 'job_description': 'Python and AWS engineer'})
+        self.assertServerTiming(response, ['match', 'total'])
+        response = self.client.get(reverse('resume_app:career_advice', args=[resume.id]))
+        self.assertServerTiming(response, ['career_matches', 'total'])
+
+    def assertServerTiming(self, response, stages):
+        header = response['Server-Timing']
+        self.assertRegex(header, r'^\w+;dur=\d+\.\d(, \w+;dur=\d+\.\d)*$')
+        recorded = [metric.split(';')[0] for metric in header.split(', ')]
+        for stage in stages:
+            self.assertIn(stage, recorded)
+
+    @override_settings(RESUME_CPU_WORKERS=1, RESUME_CPU_QUEUE_SIZE=0, RESUME_BUSY_RETRY_AFTER=7)
+    def test_busy_pool_returns_429(self):
+        analyzed = self.create_resume('analyzed')
+        self.analyze(analyzed)
+        pending = self.create_resume('pending')
+        self.fill_executor()
+
+        response = self.analyze(pending)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '7')
+        self.assertFalse(ResumeAnalysis.objects.filter(resume=pending).exists())
+
+        response = self.client.post(reverse('resume_app:job_match', args=[analyzed.id]), {
+            'job_title': 'Engineer', 'company': 'Acme', 'job_description': 'Python engineer'})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '7')
+        self.assertFalse(JobMatch.objects.exists())
+
+
+class ParseCacheTests(TestCase):
+    """Parse results are reused per file content and parser version"""
+
+    content_hash = 'a' * 64
+    results = {'skills': ['python'], 'summary': 'Python developer'}
+
+    def setUp(self):
+        parse_cache._memory.clear()
+        self.addCleanup(parse_cache._memory.clear)
+
+    def test_lru_evicts_least_recently_used(self):
+        self.assertEqual(parse_cache._memory.maxsize, settings.RESUME_PARSE_CACHE_SIZE)
+        cache = parse_cache.LRUCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        # 'b' is now the least recently used
+        cache.set('c', 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_database_tier_hit(self):
+        parse_cache.set_cached(self.content_hash, self.results)
+        parse_cache._memory.clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(parse_cache.get_cached(self.content_hash), self.results)
+        # The hit is promoted back into the LRU
+        with self.assertNumQueries(0):
+            self.assertEqual(parse_cache.get_cached(self.content_hash), self.results)
+
+    def test_key_includes_parser_version_and_taxonomy(self):
+        parse_cache.set_cached(self.content_hash, self.results)
+        self.assertEqual(parse_cache.get_cached(self.content_hash), self.results)
+        with mock.patch('resume_app.resume_analyzer.PARSER_VERSION', 'next'):
+            self.assertIsNone(parse_cache.get_cached(self.content_hash))
+        taxonomy = mock.Mock(content_hash='f' * 64)
+        with mock.patch('resume_app.resume_analyzer.get_taxonomy', return_value=taxonomy):
+            self.assertIsNone(parse_cache.get_cached(self.content_hash))
+
+    def test_parser_version_does_not_load_model(self):
+        with mock.patch('resume_app.nlp.metadata.version', side_effect=nlp.metadata.PackageNotFoundError), \
+                mock.patch.object(nlp, 'get_nlp', side_effect=AssertionError('model loaded')):
+            self.assertEqual(nlp.get_model_version(), 'core_web_sm-unknown')
+
+    def test_duplicate_upload_is_analyzed_without_queueing(self):
+        self.enterContext(mock.patch.object(ResumeParser, 'extract_entities', no_entities))
+        self.enterContext(mock.patch.object(matcher_store, 'load_vectorizer', return_value=None))
+        with tempfile.NamedTemporaryFile(suffix='.txt') as file:
+            file.write(AsyncViewTests.resume_text)
+            file.flush()
+            results = ResumeParser().parse_resume(file.name)
+        parse_cache.set_cached(self.content_hash, results)
+
+        user = User.objects.create_user('duplicate', 'duplicate@example.com', 'password')
+        resume = Resume.objects.create(user=user, title='Copy', file='resumes/copy.txt',
+                                       content_hash=self.content_hash)
+        backend = mock.Mock()
+        with mock.patch.object(tasks, 'get_backend', return_value=backend), \
+                mock.patch.object(ResumeParser, 'parse_resume', side_effect=AssertionError('parsed again')):
+            job = tasks.enqueue_analysis(resume)
+        backend.enqueue.assert_not_called()
+        self.assertEqual(job.status, AnalysisJob.STATUS_DONE)
+        self.assertEqual(ResumeAnalysis.objects.get(resume=resume).skills, results['skills'])
+
+
+class StubPipeline:
+    """Stands in for the spaCy model: a few known organizations and years as entities"""
+
+    pipe_names = ['tok2vec', 'tagger', 'parser', 'attribute_ruler', 'lemmatizer', 'ner']
+    patterns = [(re.compile(r'Acme Corp|Globex|State University'), 'ORG'), (re.compile(r'\b(?:19|20)\d\d\b'), 'DATE')]
+
+    def pipe(self, texts, disable=()):
+        for text in texts:
+            matches = sorted((match.start(), match.group(), label)
+                             for pattern, label in self.patterns for match in pattern.finditer(text))
+            yield SimpleNamespace(ents=[SimpleNamespace(text=text, label_=label) for start, text, label in matches])
+
+
+class SharedEntityPassTests(SimpleTestCase):
+    """parse_resume runs NER once for both extractors, with the same results as running them separately"""
+
+    text = ('Jane Doe\n'
+            'Bachelor of Science, State University, 2014.\n'
+            'Worked at Acme Corp as Senior Engineer since 2019.\n'
+            'Worked at State University as Research Assistant in 2015.\n'
+            'Developer at Globex for three years.\n'
+            'Worked at Acme Corp as Senior Engineer since 2019.\n')
+
+    def setUp(self):
+        pipeline = nlp.get_nlp() if importlib.util.find_spec(nlp.SPACY_MODEL) else None
+        if pipeline is None or 'ner' not in pipeline.pipe_names:
+            # No usable model installed (nlp.get_nlp would try to download one)
+            pipeline = StubPipeline()
+            self.enterContext(mock.patch.object(nlp, 'get_nlp', return_value=pipeline))
+        self.pipe = self.enterContext(mock.patch.object(pipeline, 'pipe', wraps=pipeline.pipe))
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'resume.txt')
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write(self.text)
+
+    def assertSameExtraction(self, shared, separate):
+        self.assertEqual(shared.keys(), separate.keys())
+        for key, value in separate.items():
+            # Entity lists come out of a set, so only their contents are compared
+            self.assertCountEqual(shared[key], value, key)
+
+    def test_shared_pass_matches_separate_extractors(self):
+        parser = ResumeParser()
+        results = parser.parse_resume(self.path)
+        self.assertEqual(self.pipe.call_count, 1)
+        sentences = list(self.pipe.call_args.args[0])
+        # A sentence in both lists, or repeated, goes through the pipeline once
+        self.assertEqual(len(sentences), len(set(sentences)))
+        self.assertNotIn('ner', self.pipe.call_args.kwargs['disable'])
+
+        self.pipe.reset_mock()
+        education = parser.extract_education(results['full_text'])
+        experience = parser.extract_experience(results['full_text'])
+        self.assertEqual(self.pipe.call_count, 2)
+        self.assertSameExtraction(results['education'], education)
+        self.assertSameExtraction(results['experience'], experience)
+        if isinstance(nlp.get_nlp(), StubPipeline):
+            # The stub's entities are known, so the comparison can't pass on empty lists
+            self.assertEqual(results['education']['institutions'], ['State University'])
+            self.assertCountEqual(results['experience']['dates'], ['2015', '2019'])
+
+
+@skipUnless(multiprocessing.get_start_method() == 'fork', 'Parser processes must inherit the NLP stubs')
+class AnalyzeBulkTests(TestCase):
+    """analyze_bulk imports a directory of resumes and seeds the parse cache"""
+
+    resumes = {
+        'alice.txt': b'Alice. Python and Django developer.\nBachelor of Science from State University.\n',
+        'bob.txt': b'Bob. Java and SQL engineer at Acme Corp since 2018.\n',
+    }
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        # The worker processes are forked, so they run with these stubs too
+        self.enterContext(mock.patch.object(ResumeParser, 'extract_entities', no_entities))
+        self.enterContext(mock.patch.object(nlp, 'warm_up'))
+        self.enterContext(mock.patch.object(matcher_store, 'load_vectorizer', return_value=None))
+        parse_cache._memory.clear()
+        self.addCleanup(parse_cache._memory.clear)
+
+        source = tempfile.TemporaryDirectory()
+        self.addCleanup(source.cleanup)
+        self.source = source.name
+        for name, data in self.resumes.items():
+            with open(os.path.join(self.source, name), 'wb') as file:
+                file.write(data)
+        with open(os.path.join(self.source, 'notes.md'), 'wb') as file:
+            file.write(b'Not a resume')
+        self.user = User.objects.create_user('bulk', 'bulk@example.com', 'password')
+
+    def test_import(self):
+        out = io.StringIO()
+        call_command('analyze_bulk', self.source, user='bulk', workers=1, stdout=out, stderr=io.StringIO())
+        self.assertIn('Imported 2 resume(s), 0 failed', out.getvalue())
+
+        resumes = {resume.title: resume for resume in Resume.objects.filter(user=self.user)}
+        self.assertEqual(sorted(resumes), ['alice', 'bob'])
+        for name, data in self.resumes.items():
+            with self.subTest(name=name):
+                resume = resumes[name.removesuffix('.txt')]
+                self.assertEqual(resume.content_hash, hashlib.sha256(data).hexdigest())
+                analysis = ResumeAnalysis.objects.get(resume=resume)
+                self.assertEqual(ResumeText.objects.get(resume=resume).text, data.decode('utf-8'))
+                self.assertEqual(
+                    dict(ResumeSkill.objects.filter(resume=resume).values_list('skill', 'count')),
+                    analysis.skills['skill_counts'])
+                cached = parse_cache.get_cached(resume.content_hash)
+                self.assertIsNotNone(cached)
+                self.assertEqual(cached['skills'], analysis.skills)
+        self.assertEqual(set(resumes['alice'].analysis.skills['all_skills']), {'python', 'django'})
+
+
+class MatcherStoreTests(TestCase):
+    """The fitted vectorizer is saved atomically and reloaded when the file changes"""
+
+    corpus = ['Python developer with Django', 'Java engineer with SQL', 'Data scientist using Python and SQL']
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'models', 'job_matcher.joblib')
+        self.enterContext(override_settings(RESUME_MATCHER_MODEL=self.path))
+        self.enterContext(mock.patch.dict(matcher_store._loaded, clear=True))
+
+    def save(self, corpus):
+        vectorizer = JobMatcher.build_vectorizer().fit(corpus)
+        return matcher_store.save_vectorizer(vectorizer, len(corpus))
+
+    def test_save_and_load(self):
+        version = self.save(self.corpus)
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ['job_matcher.joblib'])
+        bundle = matcher_store.load_vectorizer()
+        self.assertEqual((bundle['version'], bundle['n_documents']), (version, 3))
+        self.assertIn('django', bundle['vectorizer'].vocabulary_)
+
+        # A failed save leaves the previous model in place
+        with mock.patch.object(matcher_store.joblib, 'dump', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                self.save(['Go developer'])
+        matcher_store._loaded.clear()
+        self.assertEqual(matcher_store.load_vectorizer()['version'], version)
+
+    def test_reload_when_file_changes(self):
+        self.save(self.corpus)
+        bundle = matcher_store.load_vectorizer()
+        self.assertIs(matcher_store.load_vectorizer(), bundle)
+
+        version = self.save(['Go developer with Kubernetes'])
+        # Make sure the modification time moves even on coarse-grained filesystems
+        mtime_ns = os.stat(self.path).st_mtime_ns + 10 ** 9
+        os.utime(self.path, ns=(mtime_ns, mtime_ns))
+        reloaded = matcher_store.load_vectorizer()
+        self.assertEqual(reloaded['version'], version)
+        self.assertIn('kubernetes', reloaded['vectorizer'].vocabulary_)
+
+    def test_job_matcher_without_model(self):
+        self.assertIsNone(matcher_store.load_vectorizer())
+        matcher = matcher_store.get_job_matcher()
+        self.assertFalse(matcher.fitted)
+        # Fitted on the pair itself
+        self.assertEqual(matcher.match_resume_to_job('Python Django developer', 'Python Django developer'), 100.0)
+        self.assertEqual(matcher.match_resume_to_job('Python developer', 'Java engineer'), 0.0)
+
+        self.save(self.corpus)
+        matcher = matcher_store.get_job_matcher()
+        self.assertTrue(matcher.fitted)
+        self.assertEqual(matcher.match_resume_to_job('Python Django developer', 'Python Django developer'), 100.0)
+
+    def test_fit_matcher(self):
+        user = User.objects.create_user('fitter', 'fitter@example.com', 'password')
+        for number, text in enumerate(self.corpus):
+            resume = Resume.objects.create(user=user, title=f'Resume {number}', file=f'resumes/{number}.txt')
+            ResumeAnalysis.objects.create(resume=resume)
+            ResumeText.objects.create(resume=resume, compressed_text=ResumeText.compress(text),
+                                      text_length=len(text))
+
+        out = io.StringIO()
+        call_command('fit_matcher', stdout=out)
+        bundle = matcher_store.load_vectorizer()
+        self.assertEqual(bundle['n_documents'], 3)
+        self.assertIn('Re-vectorized 3 stored resume(s)', out.getvalue())
+        self.assertEqual(set(ResumeAnalysis.objects.values_list('vector_version', flat=True)), {bundle['version']})
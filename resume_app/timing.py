@@ -0,0 +1,107 @@
+"""
+Per-stage wall-clock timing for the analysis and job matching hot paths.
+
+Code marks its stages with ``with timing.stage('extract_text'):``. Outside a
+``timing.collect()`` block that costs a single context variable lookup; inside
+one, the stage's duration is added to the collecting StageTimer and to any
+timers it is nested in. The current timer lives in a context variable, so it
+follows work handed to the CPU executor (see executor.py). Views report the
+collected stages in a ``Server-Timing`` header, which browsers show next to
+the request in their developer tools.
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+
+_current = contextvars.ContextVar('resume_stage_timer', default=None)
+_no_timer = nullcontext()
+
+
+class StageTimer:
+    """Accumulates seconds spent per named stage"""
+
+    def __init__(self, parent=None):
+        self.parent = parent
+        # Stage name -> seconds, in the order the stages first ran
+        self.timings = {}
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name, seconds):
+        timer = self
+        while timer is not None:
+            timer.timings[name] = timer.timings.get(name, 0.0) + seconds
+            timer = timer.parent
+
+    def as_milliseconds(self):
+        return {name: round(seconds * 1000, 3) for name, seconds in self.timings.items()}
+
+    def server_timing(self):
+        """Format the stages as a Server-Timing header value"""
+        return ', '.join(f'{name};dur={seconds * 1000:.1f}' for name, seconds in self.timings.items())
+
+
+def stage(name):
+    """Time a block as the named stage of the current timer, if one is collecting"""
+    timer = _current.get()
+    if timer is None:
+        return _no_timer
+    return timer.stage(name)
+
+
+@contextmanager
+def collect():
+    """Collect the stages run inside the block into a new StageTimer"""
+    timer = StageTimer(parent=_current.get())
+    token = _current.set(timer)
+    try:
+        yield timer
+    finally:
+        _current.reset(token)
+
+
+def add_server_timing(response, timer):
+    """Set the Server-Timing header from timer's stages and return the response"""
+    if timer.timings:
+        response['Server-Timing'] = timer.server_timing()
+    return response
+
+
+def server_timing(view):
+    """View decorator collecting the request's stages, plus a total, into a Server-Timing header"""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            with collect() as timer:
+                with timer.stage('total'):
+                    response = await view(request, *args, **kwargs)
+            return add_server_timing(response, timer)
+    else:
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            with collect() as timer:
+                with timer.stage('total'):
+                    response = view(request, *args, **kwargs)
+            return add_server_timing(response, timer)
+    return wrapper
+
+
+def percentiles(values, points=(50, 95, 99)):
+    """Return {'p50': ..., ...} for values, or None for each point if there are none"""
+    if not values:
+        return {f'p{point}': None for point in points}
+    # Only the stats page needs numpy; keep it out of the URLconf's imports
+    import numpy as np
+
+    results = np.percentile(np.asarray(values, dtype=np.float64), points)
+    return {f'p{point}': float(result) for point, result in zip(points, results)}
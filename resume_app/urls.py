@@ -7,9 +7,13 @@ urlpatterns = [
     path('', views.home, name='home'),
     path('upload/', views.upload_resume, name='upload_resume'),
     path('analyze/<int:resume_id>/', views.analyze_resume, name='analyze_resume'),
+    path('analyze/<int:resume_id>/status/', views.analysis_status, name='analysis_status'),
     path('career_advice/<int:resume_id>/', views.career_advice, name='career_advice'),
     path('job_match/<int:resume_id>/', views.job_match, name='job_match'),
     path('job_match_detail/<int:match_id>/', views.job_match_detail, name='job_match_detail'),
+    path('rank/', views.rank_resumes, name='rank_resumes'),
+    path('api/skills/search/', views.skill_search, name='skill_search'),
+    path('stats/', views.analysis_stats, name='analysis_stats'),
     path('dashboard/', views.dashboard, name='dashboard'),
     path('logout/', views.logout_view, name='logout'),
 ]
\ No newline at end of file
@@ -0,0 +1,42 @@
+import hashlib
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def hash_file(file):
+    """Return the SHA-256 hex digest of a file, streamed in chunks"""
+    digest = hashlib.sha256()
+    if hasattr(file, 'chunks'):
+        # Django File/UploadedFile objects rewind and stream themselves
+        for chunk in file.chunks(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    else:
+        with open(file, 'rb') as fh:
+            for chunk in iter(lambda: fh.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def process_memory(pid='self'):
+    """Return memory use of a process in kB as a dict, or None where /proc is unavailable
+
+    rss counts every resident page, including pages shared copy-on-write with
+    the parent; pss splits shared pages between the processes that map them,
+    so summing pss over workers gives their real combined footprint.
+    """
+    fields = {'Rss': 'rss', 'Pss': 'pss', 'Shared_Clean': 'shared_clean',
+              'Shared_Dirty': 'shared_dirty', 'Private_Clean': 'private_clean',
+              'Private_Dirty': 'private_dirty'}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as fh:
+            lines = fh.readlines()
+    except OSError:
+        return None
+
+    usage = {}
+    for line in lines:
+        name, _, value = line.partition(':')
+        if name in fields:
+            usage[fields[name]] = int(value.split()[0])
+    usage['shared'] = usage.get('shared_clean', 0) + usage.get('shared_dirty', 0)
+    return usage
@@ -0,0 +1,189 @@
+"""
+Stored TF-IDF vectors for ranking every resume against one job description.
+
+Each ResumeAnalysis keeps its resume's TF-IDF vector (from the persisted job
+matcher vectorizer) as a compact blob. For ranking, all vectors of the current
+vectorizer version are stacked into a single CSR matrix that is cached per
+process, so scoring every resume is one sparse matrix-vector product.
+"""
+
+import struct
+import threading
+
+import numpy as np
+from django.db.models import Count, Max
+from django.utils import timezone
+from scipy import sparse
+
+from . import matcher_store
+from .models import ResumeAnalysis, ResumeText
+
+# n_features, nnz
+_HEADER = struct.Struct('<II')
+
+_index_lock = threading.Lock()
+_index = None
+
+
+def encode_vector(row):
+    """Serialize a 1 x n sparse row as header + int32 indices + float32 values"""
+    row = sparse.csr_matrix(row)
+    indices = row.indices.astype('<i4', copy=False)
+    data = row.data.astype('<f4', copy=False)
+    return _HEADER.pack(row.shape[1], len(indices)) + indices.tobytes() + data.tobytes()
+
+
+def decode_vector(blob):
+    """Return (indices, data, n_features) from an encoded vector"""
+    blob = bytes(blob)
+    n_features, nnz = _HEADER.unpack_from(blob)
+    offset = _HEADER.size
+    indices = np.frombuffer(blob, dtype='<i4', count=nnz, offset=offset)
+    data = np.frombuffer(blob, dtype='<f4', count=nnz, offset=offset + 4 * nnz)
+    return indices, data, n_features
+
+
+def vectorize_text(text):
+    """Return (blob, version) for text, or (None, '') if no vectorizer is fitted"""
+    bundle = matcher_store.load_vectorizer()
+    if bundle is None or not text:
+        return None, ''
+    return encode_vector(bundle['vectorizer'].transform([text])), bundle['version']
+
+
+def vectorize_stored_resumes(bundle, chunk_size=500):
+    """Recompute every ResumeAnalysis vector with a newly fitted vectorizer"""
+    vectorizer = bundle['vectorizer']
+    analyses = ResumeAnalysis.objects.values_list('id', 'resume_id').order_by('id')
+    updated = 0
+    chunk = []
+    for row in analyses.iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            updated += _vectorize_chunk(vectorizer, bundle['version'], chunk)
+            chunk = []
+    if chunk:
+        updated += _vectorize_chunk(vectorizer, bundle['version'], chunk)
+    return updated
+
+
+def _vectorize_chunk(vectorizer, version, chunk):
+    texts = {
+        resume_text.resume_id: resume_text.text
+        for resume_text in ResumeText.objects.filter(
+            resume_id__in=[resume_id for analysis_id, resume_id in chunk], text_length__gt=0
+        ).only('resume_id', 'compressed_text')
+    }
+    chunk = [(analysis_id, texts[resume_id]) for analysis_id, resume_id in chunk
+             if resume_id in texts]
+    if not chunk:
+        return 0
+
+    # One transform call for the whole chunk
+    matrix = vectorizer.transform([text for analysis_id, text in chunk])
+    now = timezone.now()
+    analyses = [
+        ResumeAnalysis(id=analysis_id, tfidf_vector=encode_vector(matrix[row]), vector_version=version,
+                       vector_updated_at=now)
+        for row, (analysis_id, text) in enumerate(chunk)
+    ]
+    ResumeAnalysis.objects.bulk_update(analyses, ['tfidf_vector', 'vector_version', 'vector_updated_at'])
+    return len(analyses)
+
+
+class ResumeVectorIndex:
+    """All stored resume vectors of one vectorizer version as a CSR matrix"""
+
+    def __init__(self, version, n_features):
+        self.version = version
+        self.n_features = n_features
+        self.analysis_ids = np.empty(0, dtype=np.int64)
+        self.resume_ids = np.empty(0, dtype=np.int64)
+        self.matrix = sparse.csr_matrix((0, n_features), dtype=np.float32)
+        # Latest vector_updated_at among the loaded rows
+        self.updated_at = None
+        self.count = 0
+
+    def load_rows(self, queryset):
+        """Load the vectors in queryset, replacing rows that are already in the matrix"""
+        analysis_ids = []
+        resume_ids = []
+        indptr = [0]
+        indices = []
+        data = []
+        rows = queryset.values_list('id', 'resume_id', 'tfidf_vector', 'vector_updated_at')
+        for analysis_id, resume_id, blob, updated_at in rows.iterator():
+            row_indices, row_data, n_features = decode_vector(blob)
+            analysis_ids.append(analysis_id)
+            resume_ids.append(resume_id)
+            indices.append(row_indices)
+            data.append(row_data)
+            indptr.append(indptr[-1] + len(row_indices))
+            if updated_at is not None and (self.updated_at is None or updated_at > self.updated_at):
+                self.updated_at = updated_at
+        if not analysis_ids:
+            return
+
+        analysis_ids = np.array(analysis_ids, dtype=np.int64)
+        # Re-vectorized rows: drop the stale copy before appending the new one
+        keep = ~np.isin(self.analysis_ids, analysis_ids)
+        rows = sparse.csr_matrix(
+            (np.concatenate(data), np.concatenate(indices), np.array(indptr)),
+            shape=(len(analysis_ids), self.n_features),
+        )
+        self.matrix = sparse.vstack([self.matrix[keep], rows], format='csr')
+        self.analysis_ids = np.concatenate([self.analysis_ids[keep], analysis_ids])
+        self.resume_ids = np.concatenate([self.resume_ids[keep], np.array(resume_ids, dtype=np.int64)])
+        self.count = len(self.resume_ids)
+
+    def score(self, query_vector):
+        """Cosine score of every indexed resume against an L2-normalized query row"""
+        query = np.asarray(query_vector.todense(), dtype=np.float32).ravel()
+        return self.matrix @ query
+
+    def top_k(self, query_vector, k):
+        """Return [(resume_id, score), ...] for the k best matching resumes"""
+        if self.count == 0 or k <= 0:
+            return []
+        scores = self.score(query_vector)
+        k = min(k, len(scores))
+        # argpartition finds the top k in linear time; only those k get sorted
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [(int(self.resume_ids[i]), float(scores[i])) for i in best]
+
+
+def get_vector_index(version, n_features):
+    """Return the cached index for version, loading only rows written since last use"""
+    global _index
+    vectors = ResumeAnalysis.objects.filter(vector_version=version, tfidf_vector__isnull=False)
+    with _index_lock:
+        index = _index
+        if index is not None and index.version == version:
+            stats = vectors.aggregate(count=Count('id'), updated_at=Max('vector_updated_at'))
+            if stats['updated_at'] != index.updated_at and index.updated_at is not None:
+                # New and re-vectorized rows
+                index.load_rows(vectors.filter(vector_updated_at__gt=index.updated_at))
+            if stats['count'] != index.count or stats['updated_at'] != index.updated_at:
+                # Rows were deleted or moved to another version: start over
+                index = None
+        if index is None or index.version != version:
+            index = ResumeVectorIndex(version, n_features)
+            index.load_rows(vectors.order_by('id'))
+        _index = index
+        return index
+
+
+def rank_resumes(job_description, top_k=10):
+    """Rank every vectorized resume against a job description
+
+    Returns [(resume_id, match_percentage), ...] best first, or None when no
+    vectorizer has been fitted yet.
+    """
+    bundle = matcher_store.load_vectorizer()
+    if bundle is None:
+        return None
+    vectorizer = bundle['vectorizer']
+    query = vectorizer.transform([job_description])
+    index = get_vector_index(bundle['version'], len(vectorizer.vocabulary_))
+    return [(resume_id, round(score * 100, 2)) for resume_id, score in index.top_k(query, top_k)]
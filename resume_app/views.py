@@ -1,13 +1,36 @@
-from django.shortcuts import render, redirect, get_object_or_404
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
-from django.http import HttpResponse
+from django.http import HttpResponse, JsonResponse
 from django.contrib.auth import logout
-from .models import Resume, ResumeAnalysis, CareerAdvice, JobMatch
-from .forms import ResumeUploadForm, JobSearchForm, UserRegistrationForm
-from .resume_analyzer import ResumeParser, CareerAdvisor, JobMatcher
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.db.models import Count
+from .models import Resume, ResumeAnalysis, ResumeText, CareerAdvice, JobMatch, AnalysisJob
+from .forms import ResumeUploadForm, JobSearchForm, JobRankingForm, SkillSearchForm, UserRegistrationForm
+from .resume_analyzer import CareerAdvisor
+from .uploads import ResumeUploadHandler
+from .utils import hash_file
+# job_descriptions, skill_index and vectors pull in numpy and scipy, so the
+# views that need them import them when called, keeping the URLconf cheap
+from . import executor, pagination, tasks, timing
 import os
 
+# Templates may evaluate querysets, so async views render on the sync thread
+arender = sync_to_async(render)
+
+# Stateless; the career matrix it scores against is cached per taxonomy version
+career_advisor = CareerAdvisor()
+
+
+def busy_response():
+    """429 returned by async views when the CPU executor is saturated"""
+    response = HttpResponse('The server is busy. Please try again in a few seconds.', status=429)
+    response['Retry-After'] = str(getattr(settings, 'RESUME_BUSY_RETRY_AFTER', 5))
+    return response
+
 
 def home(request):
     """Home page view"""
@@ -36,8 +59,17 @@ def logout_view(request):
 
 
 @login_required
+@csrf_exempt
 def upload_resume(request):
     """View for uploading a resume"""
+    # Upload handlers can't change once request.POST has been read, which the
+    # CSRF middleware would do, so the CSRF check runs after installing ours
+    request.upload_handlers.insert(0, ResumeUploadHandler(request))
+    return _upload_resume(request)
+
+
+@csrf_protect
+def _upload_resume(request):
     if request.method == 'POST':
         form = ResumeUploadForm(request.POST, request.FILES)
         if form.is_valid():
@@ -45,8 +77,15 @@ def upload_resume(request):
             resume = form.save(commit=False)
             # Add user to resume
             resume.user = request.user
+            # Identify the file by content so re-uploads reuse earlier analyses.
+            # ResumeUploadHandler hashed it while it was received.
+            file = form.cleaned_data['file']
+            resume.content_hash = getattr(file, 'content_hash', None) or hash_file(file)
+            resume.page_count = getattr(file, 'page_count', None)
             # Save resume to DB
             resume.save()
+            # Parsing happens in the background worker, not on this request
+            tasks.enqueue_analysis(resume)
             
             messages.success(request, 'Resume uploaded successfully!')
             return redirect('resume_app:analyze_resume', resume_id=resume.id)
@@ -57,55 +96,69 @@ def upload_resume(request):
 
 
 @login_required
-def analyze_resume(request, resume_id):
+@timing.server_timing
+async def analyze_resume(request, resume_id):
     """View for analyzing a resume"""
-    resume = get_object_or_404(Resume, id=resume_id, user=request.user)
+    user = await request.auser()
+    resume = await aget_object_or_404(Resume, id=resume_id, user=user)
     
     # Check if analysis already exists
-    try:
-        analysis = resume.analysis
+    analysis = await ResumeAnalysis.objects.for_display().filter(resume=resume).afirst()
+    if analysis is not None:
         # Analysis exists, redirect to results
-        return render(request, 'resume_app/analysis_results.html', {
+        return await arender(request, 'resume_app/analysis_results.html', {
             'resume': resume,
             'analysis': analysis
         })
-    except ResumeAnalysis.DoesNotExist:
-        # Analysis doesn't exist, create it
-        try:
-            # Get file path
-            file_path = resume.file.path
-            
-            # Parse resume
-            parser = ResumeParser()
-            analysis_results = parser.parse_resume(file_path)
-            
-            # Create analysis object
-            analysis = ResumeAnalysis.objects.create(
-                resume=resume,
-                skills=analysis_results['skills'],
-                education=analysis_results['education'],
-                experience=analysis_results['experience'],
-                summary=analysis_results['summary']
-            )
-            
-            messages.success(request, 'Resume analyzed successfully!')
-            return render(request, 'resume_app/analysis_results.html', {
-                'resume': resume,
-                'analysis': analysis
-            })
-        except Exception as e:
-            messages.error(request, f'Error analyzing resume: {str(e)}')
-            return redirect('resume_app:upload_resume')
+    
+    # Analysis doesn't exist, queue it (a no-op if already queued). The
+    # immediate backend parses the resume right here, so run it on the CPU pool.
+    try:
+        with timing.stage('analysis'):
+            job = await executor.run(tasks.enqueue_analysis, resume)
+    except executor.ExecutorBusy:
+        return busy_response()
+    
+    if job.status == AnalysisJob.STATUS_FAILED:
+        messages.error(request, f'Error analyzing resume: {job.error}')
+        # Drop the failed job so the next visit retries the analysis
+        await job.adelete()
+        return redirect('resume_app:upload_resume')
+    
+    if job.status == AnalysisJob.STATUS_DONE:
+        # Immediate backend finished the analysis inline
+        messages.success(request, 'Resume analyzed successfully!')
+        return await arender(request, 'resume_app/analysis_results.html', {
+            'resume': resume,
+            'analysis': await ResumeAnalysis.objects.for_display().aget(resume=resume)
+        })
+    
+    return await arender(request, 'resume_app/analysis_pending.html', {
+        'resume': resume,
+        'job': job
+    })
 
 
 @login_required
+async def analysis_status(request, resume_id):
+    """JSON endpoint polled by the pending page while a resume is analyzed"""
+    user = await request.auser()
+    resume = await aget_object_or_404(Resume, id=resume_id, user=user)
+    return JsonResponse({
+        'resume_id': resume.id,
+        'status': await sync_to_async(tasks.get_analysis_status)(resume),
+    })
+
+
+@login_required
+@timing.server_timing
 def career_advice(request, resume_id):
     """View for providing career advice based on resume analysis"""
     resume = get_object_or_404(Resume, id=resume_id, user=request.user)
     
     # Check if analysis exists
     try:
-        analysis = resume.analysis
+        analysis = ResumeAnalysis.objects.for_display().get(resume=resume)
     except ResumeAnalysis.DoesNotExist:
         messages.error(request, 'Resume must be analyzed first!')
         return redirect('resume_app:analyze_resume', resume_id=resume.id)
@@ -122,8 +175,7 @@ def career_advice(request, resume_id):
         # Advice doesn't exist, create it
         try:
             # Generate career advice
-            advisor = CareerAdvisor()
-            advice_results = advisor.generate_career_advice({
+            advice_results = career_advisor.generate_career_advice({
                 'skills': analysis.skills,
                 'education': analysis.education,
                 'experience': analysis.experience,
@@ -151,70 +203,86 @@ def career_advice(request, resume_id):
 
 
 @login_required
-def job_match(request, resume_id):
+@timing.server_timing
+async def job_match(request, resume_id):
     """View for matching resume with job descriptions"""
-    resume = get_object_or_404(Resume, id=resume_id, user=request.user)
+    user = await request.auser()
+    resume = await aget_object_or_404(Resume, id=resume_id, user=user)
     
     # Check if analysis exists
-    try:
-        analysis = resume.analysis
-    except ResumeAnalysis.DoesNotExist:
+    analysis = await ResumeAnalysis.objects.for_display().filter(resume=resume).afirst()
+    if analysis is None:
         messages.error(request, 'Resume must be analyzed first!')
         return redirect('resume_app:analyze_resume', resume_id=resume.id)
     
     if request.method == 'POST':
         form = JobSearchForm(request.POST)
         if form.is_valid():
+            from . import job_descriptions
+            
             job_title = form.cleaned_data['job_title']
             company = form.cleaned_data['company']
             job_description = form.cleaned_data['job_description']
             
             try:
-                # Match job
-                matcher = JobMatcher()
-                match_results = matcher.match_job(
-                    {
-                        'full_text': analysis.summary,
-                        'skills': analysis.skills
-                    },
-                    job_title,
-                    company,
-                    job_description
-                )
+                # Load the stored resume text only now that we need it,
+                # falling back to the summary for resumes analyzed before it was kept
+                with timing.stage('load_text'):
+                    resume_text = await ResumeText.objects.filter(resume=resume).afirst()
+                    full_text = resume_text.text if resume_text else analysis.summary
+                
+                # Match job on the CPU pool, keeping the event loop free
+                with timing.stage('match'):
+                    match_results = await executor.run(
+                        job_descriptions.match_job,
+                        {
+                            'full_text': full_text,
+                            'skills': analysis.skills
+                        },
+                        job_title,
+                        company,
+                        job_description
+                    )
                 
-                # Create job match object
-                job_match = JobMatch.objects.create(
-                    resume=resume,
-                    job_title=match_results['job_title'],
-                    company=match_results['company'],
-                    match_percentage=match_results['match_percentage'],
-                    job_description=match_results['job_description'],
-                    skills_matched=match_results['skills_matched'],
-                    skills_missing=match_results['skills_missing']
-                )
+                # Create job match object, pointing at the shared job description
+                with timing.stage('store'):
+                    job_match = await JobMatch.objects.acreate(
+                        resume=resume,
+                        job_title=match_results['job_title'],
+                        company=match_results['company'],
+                        match_percentage=match_results['match_percentage'],
+                        job_description=match_results['job_description'],
+                        skills_matched=match_results['skills_matched'],
+                        skills_missing=match_results['skills_missing']
+                    )
                 
                 messages.success(request, 'Job match analysis completed!')
                 # Redirect to job match results page
                 return redirect('resume_app:job_match_detail', match_id=job_match.id)
+            except executor.ExecutorBusy:
+                return busy_response()
             except Exception as e:
                 messages.error(request, f'Error matching job: {str(e)}')
     else:
         form = JobSearchForm()
     
-    # Get previous job matches
-    previous_matches = JobMatch.objects.filter(resume=resume).order_by('-created_at')
+    # Get previous job matches, without the job description text or skill lists
+    job_match_history = (JobMatch.objects.filter(resume=resume)
+                         .only('id', 'job_title', 'company', 'match_percentage', 'created_at')
+                         .order_by('-created_at'))
     
-    return render(request, 'resume_app/job_match.html', {
+    return await arender(request, 'resume_app/job_match.html', {
         'resume': resume,
         'form': form,
-        'previous_matches': previous_matches
+        'job_match_history': job_match_history
     })
 
 
 @login_required
 def job_match_detail(request, match_id):
     """View for displaying detailed information about a specific job match"""
-    job_match = get_object_or_404(JobMatch, id=match_id, resume__user=request.user)
+    job_match = get_object_or_404(JobMatch.objects.select_related('job_description'),
+                                  id=match_id, resume__user=request.user)
     
     # Prepare data for skill gap chart
     matching_skills = job_match.skills_matched.split(',') if job_match.skills_matched else []
@@ -271,16 +339,106 @@ def job_match_detail(request, match_id):
     })
 
 
+@staff_member_required
+def rank_resumes(request):
+    """View for ranking every analyzed resume against one job description"""
+    results = None
+    if request.method == 'POST':
+        form = JobRankingForm(request.POST)
+        if form.is_valid():
+            from . import vectors
+            
+            ranking = vectors.rank_resumes(form.cleaned_data['job_description'],
+                                           top_k=form.cleaned_data['top_k'] or 20)
+            if ranking is None:
+                messages.error(request, 'Resume ranking is not available until the job matcher has been fitted.')
+            else:
+                resumes = (Resume.objects.select_related('user')
+                           .only('id', 'title', 'file', 'user__username')
+                           .in_bulk([resume_id for resume_id, score in ranking]))
+                results = [(resumes[resume_id], score) for resume_id, score in ranking if resume_id in resumes]
+    else:
+        form = JobRankingForm()
+    
+    return render(request, 'resume_app/rank_resumes.html', {
+        'form': form,
+        'results': results
+    })
+
+
+@staff_member_required
+def analysis_stats(request):
+    """Staff page with p50/p95/p99 parse timings over the most recent analyses"""
+    window = getattr(settings, 'RESUME_STATS_WINDOW', 1000)
+    rows = list(ResumeAnalysis.objects.order_by('-id')
+                .values_list('parse_duration', 'parse_timings', 'page_count', 'text_length')[:window])
+    
+    # Analyses served from the parse cache only have the overall 'parse' timing,
+    # and bulk imports or older analyses none at all
+    parses = [row for row in rows if 'extract_text' in (row[1] or {})]
+    stage_names = list(dict.fromkeys(stage for row in parses for stage in row[1]))
+    stages = [
+        {'name': stage, **timing.percentiles([row[1][stage] for row in parses if stage in row[1]])}
+        for stage in stage_names
+    ]
+    
+    return render(request, 'resume_app/analysis_stats.html', {
+        'analyses_count': len(rows),
+        'parses_count': len(parses),
+        'cached_count': sum(1 for row in rows if row[1] and 'extract_text' not in row[1]),
+        'duration': timing.percentiles([row[0] * 1000 for row in parses if row[0] is not None]),
+        'stages': stages,
+        'pages': timing.percentiles([row[2] for row in rows if row[2] is not None]),
+        'text_length': timing.percentiles([row[3] for row in rows if row[3] is not None]),
+    })
+
+
+@staff_member_required
+def skill_search(request):
+    """JSON API finding resumes that mention all (mode=all) or any (mode=any) of the given skills"""
+    form = SkillSearchForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+    
+    from . import skill_index
+    
+    search = skill_index.search_skills(
+        form.cleaned_data['skills'],
+        match_all=form.cleaned_data['mode'] != 'any',
+        limit=form.cleaned_data['limit'] or 20
+    )
+    
+    # Add the resume title and owner to each hit
+    resumes = (Resume.objects.select_related('user')
+               .only('id', 'title', 'user__username')
+               .in_bulk([hit['resume_id'] for hit in search['results']]))
+    for hit in search['results']:
+        resume = resumes.get(hit['resume_id'])
+        hit['title'] = resume.title if resume else None
+        hit['username'] = resume.user.username if resume else None
+    
+    return JsonResponse(search)
+
+
 @login_required
-def dashboard(request):
+async def dashboard(request):
     """Dashboard view showing user's resumes and analyses"""
-    # Get user's resumes
-    resumes = Resume.objects.filter(user=request.user).order_by('-uploaded_at')
+    user = await request.auser()
+    user_resumes = Resume.objects.filter(user=user)
+    
+    # One query for the page, served by resume_user_uploaded_idx
+    resumes = user_resumes.for_dashboard()
+    page_size = getattr(settings, 'RESUME_DASHBOARD_PAGE_SIZE', 25)
+    cursor = request.GET.get('after')
+    resumes, next_cursor = await pagination.aget_page(resumes, cursor, 'uploaded_at', page_size)
     
-    # Count analyzed resumes
-    analyzed_resumes_count = Resume.objects.filter(user=request.user, analysis__isnull=False).count()
+    # Count all and analyzed resumes in a single aggregate
+    totals = await user_resumes.aaggregate(total=Count('id'), analyzed=Count('analysis'))
     
-    return render(request, 'resume_app/dashboard.html', {
+    return await arender(request, 'resume_app/dashboard.html', {
         'resumes': resumes,
-        'analyzed_resumes_count': analyzed_resumes_count
+        'is_first_page': pagination.decode_cursor(cursor) is None,
+        'next_cursor': next_cursor,
+        'resumes_count': totals['total'],
+        'analyzed_resumes_count': totals['analyzed']
     })